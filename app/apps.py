@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        import app.signals.system.auth_signals  # noqa: F401
+        import app.signals.system.permission_signals  # noqa: F401
+        import app.signals.system.settings_signals  # noqa: F401
+        import app.signals.system.version_signals  # noqa: F401
+
+        from app.services.emails.email_renderer import EmailRenderer
+        EmailRenderer.warm()
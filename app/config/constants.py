@@ -1 +1,13 @@
 EMAIL_DEFAULT = 'admin@mywebsite.com'
+
+PAGINATION_COUNT_CACHE_TTL = 60
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1000
+
+LIST_MAX_SIZE = 1000
+LIST_STREAM_CHUNK_SIZE = 2000
+
+BULK_MAX_SIZE = 1000
+
+PERMISSION_REVISION = 'auth.permission'
+GROUP_REVISION = 'auth.group'
+USER_REVISION = 'auth.user'
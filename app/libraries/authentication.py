@@ -0,0 +1,195 @@
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from app.libraries.cache_backends import is_process_local
+from app.libraries.permission_cache import PermissionCache, PermissionCatalog
+from app.libraries.tokens import PERMISSION_DIGEST_CLAIM, decode_permission_digest
+
+
+class TokenRevocation:
+    """
+    Short lived record of users whose access tokens must stop working before they
+    expire, e.g. when `UserDisabled` deactivates an account.
+
+    Revocations live in the shared cache for one access token lifetime. Each process
+    memoizes lookups for JWT_REVOCATION_CHECK_INTERVAL seconds, which bounds how long
+    a revoked token may still be accepted.
+
+    When JWT_REVOCATION_CACHE_ALIAS is process-local (see `is_process_local`, e.g.
+    the default locmem), the other processes would never see a revocation: every
+    check then reads `is_active` from the user row on the primary instead.
+    """
+    key_prefix = 'auth:revoked'
+    _local = {}
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.JWT_REVOCATION_CACHE_ALIAS]
+
+    @classmethod
+    def key(cls, user_id):
+        return '%s:%s' % (cls.key_prefix, user_id)
+
+    @classmethod
+    def is_shared(cls):
+        return not is_process_local(cls.get_cache())
+
+    @classmethod
+    def revoke(cls, user_ids):
+        """
+        Rejects every token issued to the given users up to now.
+        """
+        # Whole seconds like the `iat` claim, rounded up so the tokens issued earlier in
+        # the current second are rejected too.
+        revoked_at = int(time.time()) + 1
+        timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 60
+        cls.get_cache().set_many({cls.key(user_id): revoked_at for user_id in user_ids}, timeout)
+        for user_id in user_ids:
+            cls._local.pop(user_id, None)
+
+    @classmethod
+    def restore(cls, user_ids):
+        """
+        Drops the revocation of users enabled again, so the tokens they get from now on
+        are accepted even within the second of the revocation.
+        """
+        cls.get_cache().delete_many([cls.key(user_id) for user_id in user_ids])
+        for user_id in user_ids:
+            cls._local.pop(user_id, None)
+
+    @classmethod
+    def revoked_at(cls, user_id):
+        now = time.monotonic()
+        cached = cls._local.get(user_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        value = cls.get_cache().get(cls.key(user_id))
+        cls._local[user_id] = (value, now + settings.JWT_REVOCATION_CHECK_INTERVAL)
+        return value
+
+    @classmethod
+    def is_revoked(cls, user_id, issued_at):
+        if not cls.is_shared():
+            return not User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id, is_active=True).exists()
+
+        revoked_at = cls.revoked_at(user_id)
+        return revoked_at is not None and issued_at is not None and issued_at < revoked_at
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user built from the claims of a validated access token.
+
+    `id`, `username`, `is_active`, `is_staff` and `is_superuser` come from the token.
+    Permission checks use the token's permission digest when present and otherwise
+    `PermissionCache`, neither of which reads auth_user. Any other attribute, and
+    `save()`, `set_password()` and friends, load the user row the first time they are
+    used and are forwarded to it.
+    """
+
+    def __setattr__(self, name, value):
+        if name == 'token' or name.startswith('_'):
+            super().__setattr__(name, value)
+        else:
+            setattr(self.db_user, name, value)
+
+    def __getattr__(self, attr):
+        if attr == 'token' or attr.startswith('_'):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.db_user, attr)
+
+    def __str__(self):
+        return self.username
+
+    @cached_property
+    def db_user(self):
+        try:
+            return User.objects.get(**{api_settings.USER_ID_FIELD: self.id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @property
+    def groups(self):
+        return self.db_user.groups
+
+    @property
+    def user_permissions(self):
+        return self.db_user.user_permissions
+
+    def save(self, *args, **kwargs):
+        self.db_user.save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self.db_user.delete(*args, **kwargs)
+
+    def set_password(self, raw_password):
+        self.db_user.set_password(raw_password)
+
+    def check_password(self, raw_password):
+        return self.db_user.check_password(raw_password)
+
+    @cached_property
+    def _permissions(self):
+        digest = self.token.get(PERMISSION_DIGEST_CLAIM)
+        if digest is not None:
+            return {'user': set(), 'group': PermissionCatalog.names(decode_permission_digest(digest))}
+        return PermissionCache.get(self.id)
+
+    def get_user_permissions(self, obj=None):
+        if not self.is_active or obj is not None:
+            return set()
+        return set(self._permissions['user'])
+
+    def get_group_permissions(self, obj=None):
+        if not self.is_active or obj is not None:
+            return set()
+        return set(self._permissions['group'])
+
+    def get_all_permissions(self, obj=None):
+        return self.get_user_permissions(obj) | self.get_group_permissions(obj)
+
+    def has_perm(self, perm, obj=None):
+        if self.is_active and self.is_superuser:
+            return True
+        return perm in self.get_all_permissions(obj)
+
+    def has_perms(self, perm_list, obj=None):
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+    def has_module_perms(self, module):
+        if self.is_active and self.is_superuser:
+            return True
+        return any(perm.startswith(module + '.') for perm in self.get_all_permissions())
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication that builds `request.user` from the token claims instead of
+    selecting the user row on every request. See `ClaimsUser` and `TokenRevocation`.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        if not validated_token.get('is_active', True) or TokenRevocation.is_revoked(user_id, validated_token.get('iat')):
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return ClaimsUser(validated_token)
@@ -0,0 +1,241 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+_MISSING = object()
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class _LRUStore:
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+class LocalLRUCache(BaseCache):
+    """
+    Per-process cache bounded by the pickled size of its values (MAX_BYTES) as well
+    as by their number (MAX_ENTRIES), evicting the least recently used entries first.
+
+    Django's LocMemCache only counts entries and culls a third of them at random
+    once full, so one large value can hold a worker's memory hostage. Instances with
+    the same LOCATION share their entries, like LocMemCache.
+
+    Example:
+        CACHES = {'local': {
+            'BACKEND': 'app.libraries.cache_backends.LocalLRUCache',
+            'LOCATION': 'local',
+            'OPTIONS': {'MAX_BYTES': 64 * 1024 * 1024, 'MAX_ENTRIES': 100000},
+        }}
+    """
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        self.max_bytes = int(params.get('OPTIONS', {}).get('MAX_BYTES', 32 * 1024 * 1024))
+        with _stores_lock:
+            self._store = _stores.setdefault(name, _LRUStore())
+
+    def _get_live(self, key):
+        # Called with the lock held.
+        entry = self._store.entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.time():
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key):
+        entry = self._store.entries.pop(key, None)
+        if entry is not None:
+            self._store.size -= len(entry[0])
+
+    def _store_value(self, key, value, timeout):
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        if len(pickled) > self.max_bytes:
+            self._remove(key)
+            return False
+
+        self._remove(key)
+        self._store.entries[key] = (pickled, self.get_backend_timeout(timeout))
+        self._store.size += len(pickled)
+        while self._store.size > self.max_bytes or len(self._store.entries) > self._max_entries:
+            _, (evicted, _) = self._store.entries.popitem(last=False)
+            self._store.size -= len(evicted)
+            self._store.stats['evictions'] += 1
+        return True
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._store.lock:
+            entry = self._get_live(key)
+            if entry is None:
+                self._store.stats['misses'] += 1
+                return default
+            self._store.entries.move_to_end(key)
+            self._store.stats['hits'] += 1
+            pickled = entry[0]
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._store.lock:
+            self._store_value(key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._store.lock:
+            if self._get_live(key) is not None:
+                return False
+            return self._store_value(key, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._store.lock:
+            entry = self._get_live(key)
+            if entry is None:
+                return False
+            self._store.entries[key] = (entry[0], self.get_backend_timeout(timeout))
+            return True
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._store.lock:
+            entry = self._get_live(key)
+            if entry is None:
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(entry[0]) + delta
+            pickled = pickle.dumps(value, self.pickle_protocol)
+            self._store.size += len(pickled) - len(entry[0])
+            self._store.entries[key] = (pickled, entry[1])
+            self._store.entries.move_to_end(key)
+        return value
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._store.lock:
+            return self._get_live(key) is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._store.lock:
+            existed = key in self._store.entries
+            self._remove(key)
+            return existed
+
+    def clear(self):
+        with self._store.lock:
+            self._store.entries.clear()
+            self._store.size = 0
+
+    def stats(self):
+        with self._store.lock:
+            return dict(self._store.stats, entries=len(self._store.entries), bytes=self._store.size,
+                        max_entries=self._max_entries, max_bytes=self.max_bytes)
+
+
+class TwoLevelCache(BaseCache):
+    """
+    Read-through cache over a per-process LOCAL tier and a SHARED tier, both Django
+    cache aliases.
+
+    Reads try the local tier first and copy shared hits into it for at most
+    LOCAL_TIMEOUT seconds. Writes and deletes go to both tiers, counters (`incr`,
+    `decr`) only to the shared one. Other processes may therefore read a value up to
+    LOCAL_TIMEOUT seconds old: use it for data that tolerates it (counts, catalogs),
+    not for revocations or throttling.
+
+    Example:
+        CACHES = {'two_level': {
+            'BACKEND': 'app.libraries.cache_backends.TwoLevelCache',
+            'OPTIONS': {'LOCAL': 'local', 'SHARED': 'shared', 'LOCAL_TIMEOUT': 5},
+        }}
+    """
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.local_alias = options.get('LOCAL', 'local')
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+
+    @property
+    def local(self):
+        return caches[self.local_alias]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def get_local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.local.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                return default
+            self.local.set(key, value, self.local_timeout, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = self.local.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.shared.get_many(missing, version=version)
+            if shared:
+                self.local.set_many(shared, self.local_timeout, version=version)
+            found.update(shared)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self.local.set(key, value, self.get_local_timeout(timeout), version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.local.set(key, value, self.get_local_timeout(timeout), version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self.local.has_key(key, version=version) or self.shared.has_key(key, version=version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.delete(key, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+
+def is_process_local(cache):
+    """
+    Whether what `cache` stores is only seen by the current process (locmem, the
+    local LRU, the dummy cache), so it can not carry state between processes such as
+    revocations or blacklisted tokens. A `TwoLevelCache` is judged by its shared tier.
+    """
+    if isinstance(cache, TwoLevelCache):
+        return is_process_local(cache.shared)
+    return isinstance(cache, (LocMemCache, LocalLRUCache, DummyCache))
@@ -0,0 +1,101 @@
+import hashlib
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+from app.models.system.revision import Revision
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET (ETag / Last-Modified) for list and detail views.
+
+    Before the rows are fetched and serialized, the validators of the response are
+    computed with one aggregate query over the same filtered queryset: the number of
+    rows, the newest of `last_modified_fields` and the sum of `version_field`. A
+    request whose `If-None-Match` or `If-Modified-Since` still matches gets a 304
+    without a body. Otherwise the response carries the new `ETag` and
+    `Last-Modified`.
+
+    Tables without modification columns use `revision`, a `Revision` counter that
+    signals bump on every change of the table. Views that only set `revision` skip
+    the aggregate: list endpoints over large tables validate with one primary key
+    lookup instead of scanning every filtered row on each page request.
+
+    Deleting a row changes the ETag (through the count) but not necessarily
+    Last-Modified, so clients should prefer `If-None-Match`.
+
+    Responses are marked `Cache-Control: private, no-cache`, so clients revalidate
+    instead of guessing a freshness lifetime from `Last-Modified`. Requests with
+    `?expand=` are not conditional: the validators do not cover related rows.
+
+    Attributes:
+        last_modified_fields (tuple): Datetime fields (or lookups) whose maximum is the
+            Last-Modified of the response.
+        version_field (str): Row version field (or lookup) summed into the ETag.
+        revision (str): Name of the `Revision` counter of the table.
+
+    Example:
+        class GroupDetail(ConditionalGetMixin, generics.RetrieveAPIView):
+            last_modified_fields = ('updated_at',)
+    """
+    last_modified_fields = ()
+    version_field = None
+    revision = None
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_validators_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            # Detail view: the validators of the one row.
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset.order_by()
+
+    def get_validators(self):
+        """
+        Returns:
+            tuple: (etag, last_modified), or None when the response is not conditional.
+        """
+        if getattr(self, 'get_expand', None) and self.get_expand():
+            return None
+
+        state, modified = [], []
+        if self.last_modified_fields or self.version_field or not self.revision:
+            aggregates = {'count': Count('pk')}
+            for index, field in enumerate(self.last_modified_fields):
+                aggregates['modified_%d' % index] = Max(field)
+            if self.version_field:
+                aggregates['version'] = Sum(self.version_field)
+
+            values = self.get_validators_queryset().aggregate(**aggregates)
+            modified = [values['modified_%d' % index] for index in range(len(self.last_modified_fields))]
+            state = [values['count'], values.get('version')] + modified
+
+        if self.revision:
+            revision, updated_at = Revision.get(self.revision)
+            state.append(revision)
+            modified.append(updated_at)
+
+        modified = [value for value in modified if value is not None]
+        # The body also depends on the query string and on the renderer.
+        state += [self.request.get_full_path(), self.request.accepted_renderer.format]
+        etag = quote_etag(hashlib.md5(repr(state).encode(), usedforsecurity=False).hexdigest())
+        return etag, max(modified) if modified else None
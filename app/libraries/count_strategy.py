@@ -0,0 +1,162 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from app.libraries.stampede import fetch
+import app.config.constants as constants
+
+
+class ExactCount:
+    """
+    Runs a plain SELECT COUNT(*) over the filtered queryset.
+    """
+    name = 'exact'
+
+    def count(self, queryset, filters):
+        if not hasattr(queryset, 'query'):
+            return len(queryset), self.name
+        return queryset.count(), self.name
+
+
+class EstimatedCount:
+    """
+    Uses the PostgreSQL planner instead of counting rows.
+
+    Unfiltered querysets read `pg_class.reltuples`, filtered ones read the row estimate
+    from EXPLAIN. Small estimates are recounted exactly because the planner is least
+    accurate there and an exact count is cheap. Any other database falls back to an
+    exact count.
+    """
+    name = 'estimate'
+
+    def count(self, queryset, filters):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return ExactCount().count(queryset, filters)
+
+        if self._is_unfiltered(queryset):
+            estimate = self._table_estimate(connection, queryset.model._meta.db_table)
+        else:
+            estimate = self._plan_estimate(connection, queryset)
+
+        if estimate is None or estimate < constants.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+            return ExactCount().count(queryset, filters)
+
+        return estimate, self.name
+
+    @staticmethod
+    def _is_unfiltered(queryset):
+        query = queryset.query
+        return not query.where and not query.distinct and not query.combinator and query.low_mark == 0 and query.high_mark is None
+
+    @staticmethod
+    def _table_estimate(connection, db_table):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)', [db_table])
+            row = cursor.fetchone()
+
+        # reltuples is -1 (or 0 on old servers) until the table has been analyzed.
+        if row is None or row[0] is None or row[0] <= 0:
+            return None
+        return int(row[0])
+
+    @staticmethod
+    def _plan_estimate(connection, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCount:
+    """
+    Caches the exact count for a short TTL, keyed by the model and the normalized
+    filter set, so repeated page requests for the same listing count only once.
+
+    Counts are read through `stampede.fetch` from the PAGINATION_COUNT_CACHE_ALIAS
+    cache: popular listings are recounted shortly before they expire by one request,
+    instead of by every request arriving once they have.
+    """
+    name = 'cached'
+    key_prefix = 'pagination:count'
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.PAGINATION_COUNT_CACHE_ALIAS]
+
+    def count(self, queryset, filters):
+        value = fetch(self.get_cache(), self.cache_key(queryset, filters), queryset.count,
+                      constants.PAGINATION_COUNT_CACHE_TTL)
+        return value, self.name
+
+    def cache_key(self, queryset, filters):
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode('utf-8')).hexdigest()
+        return '%s:%s:%s' % (self.key_prefix, queryset.model._meta.label_lower, digest)
+
+
+COUNT_STRATEGIES = {
+    ExactCount.name: ExactCount,
+    EstimatedCount.name: EstimatedCount,
+    CachedCount.name: CachedCount,
+}
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Django paginator whose `count` is produced by a count strategy. The name of the
+    strategy that actually produced the value is available as `count_strategy`,
+    since a strategy may fall back to an exact count.
+
+    A planner estimate can be off either way, so with one the requested page is not
+    checked against the estimated number of pages: it is fetched with one extra row
+    and `count` corrected from what it holds, at least the rows seen so far and
+    exactly that on the last page. Only a page past the rows is an `EmptyPage`.
+    """
+
+    def __init__(self, object_list, per_page, strategy=None, filters=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.strategy = strategy or ExactCount()
+        self.filters = filters or {}
+        self.count_strategy = self.strategy.name
+
+    @cached_property
+    def count(self):
+        value, self.count_strategy = self.strategy.count(self.object_list, self.filters)
+        return value
+
+    @property
+    def estimated(self):
+        return self.count is not None and self.count_strategy == EstimatedCount.name
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.estimated or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if not self.estimated:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+
+        if len(rows) > self.per_page:
+            self.count = max(self.count, bottom + len(rows))
+        else:
+            self.count = bottom + len(rows)
+        self.__dict__.pop('num_pages', None)
+        return self._get_page(rows[:self.per_page], number, self)
@@ -1,15 +1,115 @@
+from functools import partial
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from app.libraries.keyset_pagination import KeysetPaginator, InvalidCursor
+from app.libraries.count_strategy import COUNT_STRATEGIES, CountStrategyPaginator
 
 class CustomPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination with an optional keyset (cursor) mode.
+
+    The default mode keeps the classic OFFSET/LIMIT behaviour with `page`, `num_pages`
+    and `count`. Requesting `?mode=cursor` (or sending a `cursor`) switches to keyset
+    pagination over the view's `cursor_ordering`, which never runs a COUNT(*) and
+    costs the same on every page no matter how deep it is.
+
+    In page mode `count` is produced by a count strategy: `exact`, `estimate` (PostgreSQL
+    planner statistics) or `cached` (exact count cached per filter set). The view's
+    `count_strategy` is the default and `?count=` overrides it per request. The
+    response reports the strategy that produced `count` and `num_pages`.
+
+    Example:
+        GET /users/pagination/?count=estimate
+        GET /users/pagination/?mode=cursor&page_size=50
+        GET /users/pagination/?cursor=eyJyIjowLCJwIjpbIjIwMjMtMTItMjZUMDE6MDM6MDBaIiw0Ml19
+    """
     page_size = 20
     page_size_query_param = 'page_size'
+    mode_query_param = 'mode'
+    cursor_query_param = 'cursor'
+    cursor_mode = 'cursor'
+    cursor_ordering = ('pk',)
+    invalid_cursor_message = 'Invalid cursor.'
+    count_query_param = 'count'
+    count_strategy = 'exact'
+
+    @property
+    def django_paginator_class(self):
+        return partial(CountStrategyPaginator, strategy=self.strategy, filters=self.get_count_filters(self.request))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor_page = None
+
+        if not self.is_cursor_mode(request):
+            self.strategy = self.get_count_strategy(request, view)
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        ordering = getattr(view, 'cursor_ordering', self.cursor_ordering)
+        paginator = KeysetPaginator(queryset, ordering, page_size)
+
+        try:
+            rows, next_cursor, previous_cursor = paginator.page(
+                request.query_params.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise NotFound(self.invalid_cursor_message)
+
+        self.cursor_page = {
+            'page_size': page_size,
+            'next': next_cursor,
+            'previous': previous_cursor,
+        }
+        return rows
+
+    def get_count_strategy(self, request, view):
+        name = request.query_params.get(self.count_query_param) or getattr(view, 'count_strategy', self.count_strategy)
+        if name not in COUNT_STRATEGIES:
+            raise ValidationError({self.count_query_param: 'Must be one of: %s.' % ', '.join(COUNT_STRATEGIES)})
+        return COUNT_STRATEGIES[name]()
+
+    def get_count_filters(self, request):
+        """
+        Returns the query parameters that affect the number of rows, normalized so the
+        same filter set always produces the same cache key.
+        """
+        ignored = {self.page_query_param, self.page_size_query_param, self.mode_query_param,
+                   self.cursor_query_param, self.count_query_param}
+        return {key: sorted(request.query_params.getlist(key))
+                for key in sorted(request.query_params) if key not in ignored}
+
+    def is_cursor_mode(self, request):
+        return (request.query_params.get(self.mode_query_param) == self.cursor_mode
+                or bool(request.query_params.get(self.cursor_query_param)))
 
     def get_paginated_response(self, data):
+        if self.cursor_page is not None:
+            return Response({
+                'results': data,
+                'page_size': self.cursor_page['page_size'],
+                'next': self.get_cursor_link(self.cursor_page['next']),
+                'previous': self.get_cursor_link(self.cursor_page['previous']),
+            })
+
         return Response({
             'results': data,
             'page': self.page.number,
             'page_size': self.get_page_size(self.request),
             'num_pages': self.page.paginator.num_pages,
             'count': self.page.paginator.count,
-        })
\ No newline at end of file
+            'count_strategy': self.page.paginator.count_strategy,
+        })
+
+    def get_cursor_link(self, cursor):
+        if cursor is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.mode_query_param, self.cursor_mode)
+        return replace_query_param(url, self.cursor_query_param, cursor)
@@ -0,0 +1,136 @@
+import random
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject
+from rest_framework.permissions import SAFE_METHODS
+
+_state = ContextVar('replica_routing', default=None)
+
+
+class ReplicaPin:
+    """
+    Keeps a client on the primary for REPLICA_PIN_SECONDS after it wrote, so it reads
+    its own writes while the replicas catch up: browsers through a cookie holding the
+    end of the window, API clients through a per-user key in REPLICA_PIN_CACHE_ALIAS.
+    """
+    key_prefix = 'db:primary'
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.REPLICA_PIN_CACHE_ALIAS]
+
+    @classmethod
+    def key(cls, user_id):
+        return '%s:%s' % (cls.key_prefix, user_id)
+
+    @staticmethod
+    def cookie_pinned(request):
+        try:
+            return float(request.COOKIES.get(settings.REPLICA_PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    @classmethod
+    def user_pinned(cls, user_id):
+        return cls.get_cache().get(cls.key(user_id)) is not None
+
+    @classmethod
+    def pin(cls, request, response):
+        seconds = settings.REPLICA_PIN_SECONDS
+        response.set_cookie(settings.REPLICA_PIN_COOKIE, '%d' % (time.time() + seconds), max_age=seconds,
+                            httponly=True, samesite='Lax')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            cls.get_cache().set(cls.key(user.pk), 1, seconds)
+
+
+class RoutingState:
+    """
+    Routing of the request being handled: the replica its reads go to and whether
+    they must go to the primary instead.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = random.choice(settings.DATABASE_REPLICAS)
+        self.pinned = request.method not in SAFE_METHODS or ReplicaPin.cookie_pinned(request)
+        self.user_checked = False
+        self.wrote = False
+
+    def is_pinned(self):
+        if not self.pinned and not self.user_checked:
+            # DRF sets the authenticated user on the request, the lazy session user is
+            # not evaluated here since loading it would route reads itself.
+            user = self.request.__dict__.get('user')
+            if user is not None and not isinstance(user, LazyObject) and user.is_authenticated:
+                self.user_checked = True
+                self.pinned = ReplicaPin.user_pinned(user.pk)
+        return self.pinned
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends the reads of safe requests (GET, HEAD, OPTIONS) to one of the
+    DATABASE_REPLICAS, picked per request, and everything else to the primary:
+    writes, reads of unsafe requests or following a write, reads inside a
+    transaction, reads outside a request (commands, workers) and reads of clients
+    pinned by `ReplicaPin`.
+
+    Replicas are never migrated, they follow the primary.
+
+    Example:
+        DATABASE_ROUTERS = ['app.libraries.db_router.PrimaryReplicaRouter']
+        DATABASE_REPLICAS = ['replica_1']
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or connections[DEFAULT_DB_ALIAS].in_atomic_block or state.is_pinned():
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # The rest of the request reads what it wrote too.
+            state.wrote = state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tracks the routing of each request for `PrimaryReplicaRouter` and pins the
+    client to the primary when the request wrote. Does nothing without replicas.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        state = RoutingState(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            ReplicaPin.pin(request, response)
+        return response
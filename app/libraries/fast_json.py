@@ -0,0 +1,104 @@
+import codecs
+import io
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_encoder = encoders.JSONEncoder(ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+
+# orjson encodes datetimes, dates, times and UUIDs itself and hands the other types
+# (lazy translation strings, decimals, timedeltas, querysets, ...) to DRF's encoder.
+default = _encoder.default
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+# orjson reads integers wider than 64 bits as (lossy) floats. They have at least 19
+# digits: bodies with such a run of digits, found by mapping every digit to "0" and
+# searching for 19 of them (both in C), are parsed by DRF's parser.
+_DIGITS = bytes.maketrans(b'123456789', b'000000000')
+_WIDE_INTEGER = b'0' * 19
+
+
+def may_hold_wide_integers(body):
+    return _WIDE_INTEGER in body.translate(_DIGITS)
+
+
+def dumps(data):
+    """
+    Encodes `data` to compact UTF-8 JSON bytes, with orjson when it is installed and
+    with the standard library (and DRF's encoder) otherwise.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which the standard library handles.
+            pass
+    return _encoder.encode(data).encode()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    `JSONRenderer` that encodes with orjson, several times faster than the standard
+    library on large lists, with the same output for compact UTF-8 responses except
+    for floats (see below).
+
+    Pretty printed responses (`Accept: application/json; indent=4`, the browsable
+    API), `UNICODE_JSON = False` and `STRICT_JSON = False` are rendered by DRF's
+    renderer, as is everything when orjson is not installed.
+
+    Floats (and decimals with `COERCE_DECIMAL_TO_STRING = False`) keep their value but
+    not DRF's spelling: orjson writes `1e16` for `1e+16` and `0.00001` for `1e-05`, and
+    NaN and infinities as `null` where DRF raises ValueError. No endpoint of this API
+    serializes floats; a view that does should use DRF's `JSONRenderer`.
+
+    Example:
+        REST_FRAMEWORK = {'DEFAULT_RENDERER_CLASSES': ['app.libraries.fast_json.FastJSONRenderer', ...]}
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent or self.ensure_ascii or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as DRF, so the output stays a strict JavaScript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    `JSONParser` that decodes UTF-8 bodies with orjson. Other encodings, bodies that
+    may hold integers wider than 64 bits (see `may_hold_wide_integers`) and every body when
+    orjson is not installed are parsed by DRF's parser.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if may_hold_wide_integers(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
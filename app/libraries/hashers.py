@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS iterations.
+
+    Keeps the "pbkdf2_sha256" algorithm name, so existing hashes verify and are
+    re-encoded with the configured iterations on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt with PASSWORD_SCRYPT_WORK_FACTOR (N), PASSWORD_SCRYPT_BLOCK_SIZE (r) and
+    PASSWORD_SCRYPT_PARALLELISM (p).
+    """
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self):
+        # OpenSSL refuses to use more than 32 MiB unless told otherwise, scrypt needs
+        # 128 * N * r bytes (plus 128 * r * p) for the configured parameters.
+        required = 128 * self.block_size * (self.work_factor + self.parallelism)
+        return max(required + 1024 * 1024, 32 * 1024 * 1024)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with PASSWORD_ARGON2_TIME_COST, PASSWORD_ARGON2_MEMORY_COST (KiB) and
+    PASSWORD_ARGON2_PARALLELISM. Requires the optional `argon2-cffi` package.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
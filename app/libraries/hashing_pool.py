@@ -0,0 +1,177 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingUnavailable(APIException):
+    """
+    Raised when the hashing pool is saturated. DRF's exception handler turns `wait`
+    into a Retry-After header.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('The server is busy, please retry later.')
+    default_code = 'hashing_unavailable'
+
+    def __init__(self, wait=None, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+def _check_password(password, encoded):
+    # Runs in the worker. The rehash Django asks for when the stored hash uses an old
+    # hasher or old cost parameters is computed here too.
+    rehashed = []
+    valid = hashers.check_password(password, encoded, setter=lambda raw: rehashed.append(hashers.make_password(raw)))
+    return valid, rehashed[0] if rehashed else None
+
+
+def _make_password(password):
+    return hashers.make_password(password)
+
+
+class HashingPool:
+    """
+    Bounded executor for the deliberately slow password hashing, so a burst of logins
+    can not occupy every request worker.
+
+    At most `workers` hashes run at once and at most `queue_size` more wait for a
+    worker. A caller that can not get a slot within `timeout` seconds gets
+    `HashingUnavailable` (503 with Retry-After) instead of queueing without bound.
+    Bulk hashing (`make_passwords`) holds at most `bulk_workers` slots at a time, half
+    of the workers by default, so logins keep the others.
+
+    Modes (PASSWORD_HASHING_POOL):
+        thread: worker threads. hashlib's PBKDF2 and scrypt and argon2-cffi release
+            the GIL, so threads hash in parallel without pickling or forking.
+        process: worker processes, for hashers that hold the GIL.
+        inline: hash in the calling thread without any bound (development, tests).
+
+    Example:
+        valid, rehashed = hashing_pool.check_password(password, user.password)
+        user.password = hashing_pool.make_password(password)
+    """
+
+    def __init__(self, mode=None, workers=None, queue_size=None, timeout=None, retry_after=None, bulk_workers=None):
+        self.mode = mode or settings.PASSWORD_HASHING_POOL
+        self.workers = workers or settings.PASSWORD_HASHING_WORKERS or os.cpu_count() or 1
+        self.queue_size = settings.PASSWORD_HASHING_QUEUE_SIZE if queue_size is None else queue_size
+        self.timeout = settings.PASSWORD_HASHING_QUEUE_TIMEOUT if timeout is None else timeout
+        self.retry_after = retry_after or settings.PASSWORD_HASHING_RETRY_AFTER
+        self.slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self.bulk_slots = threading.BoundedSemaphore(bulk_workers or max(1, self.workers // 2))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.mode == 'process':
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='hashing')
+        return self._executor
+
+    def submit(self, fn, *args):
+        """
+        Schedules `fn(*args)` on a worker and returns its future.
+
+        Raises:
+            HashingUnavailable: no slot was freed within `timeout` seconds.
+        """
+        if self.timeout > 0:
+            acquired = self.slots.acquire(timeout=self.timeout)
+        else:
+            acquired = self.slots.acquire(blocking=False)
+        if not acquired:
+            raise HashingUnavailable(wait=self.retry_after)
+
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(lambda f: self.slots.release())
+        return future
+
+    def run(self, fn, *args):
+        if self.mode == 'inline':
+            return fn(*args)
+        return self.submit(fn, *args).result()
+
+    def check_password(self, password, encoded):
+        """
+        Returns:
+            tuple: (valid, rehashed) where `rehashed` is the new encoded password when
+            the stored one has to be upgraded, otherwise None.
+        """
+        return self.run(_check_password, password, encoded)
+
+    def make_password(self, password):
+        return self.run(_make_password, password)
+
+    def make_passwords(self, passwords):
+        """
+        Hashes many passwords in parallel, with at most `bulk_workers` of them in
+        flight (across every bulk call), so a large batch shares the pool with
+        concurrent logins instead of monopolizing it.
+
+        When a job can not be submitted (`HashingUnavailable`) or fails, the pending
+        jobs are cancelled and the running ones drained before the error is raised,
+        so no slot stays held for a result nobody reads.
+        """
+        if self.mode == 'inline':
+            return [_make_password(password) for password in passwords]
+
+        futures = []
+        try:
+            for password in passwords:
+                self.bulk_slots.acquire()
+                try:
+                    future = self.submit(_make_password, password)
+                except BaseException:
+                    self.bulk_slots.release()
+                    raise
+                future.add_done_callback(lambda f: self.bulk_slots.release())
+                futures.append(future)
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+class LazyHashingPool:
+    """
+    Builds the shared `HashingPool` from settings on first use and rebuilds it when
+    the settings change (see `app.signals.system.settings_signals`).
+    """
+    _pool = None
+
+    def __getattr__(self, name):
+        if LazyHashingPool._pool is None:
+            LazyHashingPool._pool = HashingPool()
+        return getattr(LazyHashingPool._pool, name)
+
+    @staticmethod
+    def reset():
+        if LazyHashingPool._pool is not None:
+            LazyHashingPool._pool.shutdown(wait=False)
+            LazyHashingPool._pool = None
+
+
+hashing_pool = LazyHashingPool()
@@ -0,0 +1,122 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking past the last row that was returned instead of
+    skipping rows with OFFSET, so the cost of a page does not grow with its depth.
+
+    The ordering must be stable: every field in it has to be NOT NULL and the last
+    one has to be unique (usually the primary key), e.g. ('date_joined', 'id').
+
+    Cursors are opaque url-safe strings holding the ordering values of the boundary
+    row and the direction in which the next page has to be read.
+
+    Attributes:
+        queryset (QuerySet): The filtered queryset to paginate.
+        ordering (tuple): The field names that define the keyset.
+        page_size (int): The number of rows per page.
+    """
+
+    def __init__(self, queryset, ordering, page_size):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+        opts = queryset.model._meta
+        self.fields = [opts.pk if name == 'pk' else opts.get_field(name) for name in self.ordering]
+
+    def page(self, cursor=None):
+        """
+        Returns the rows of the page identified by `cursor` (the first page when it is
+        empty) together with the cursors of the next and previous pages.
+
+        Returns:
+            tuple: (rows, next_cursor, previous_cursor), cursors are None at the edges.
+
+        Raises:
+            InvalidCursor: If the cursor can not be decoded.
+        """
+        reverse, position = self.decode(cursor) if cursor else (False, None)
+
+        queryset = self.queryset.order_by(*[('-' if reverse else '') + name for name in self.ordering])
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+
+        if not rows:
+            return rows, None, None
+
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else position is not None
+
+        next_cursor = self.encode(False, self.position(rows[-1])) if has_next else None
+        previous_cursor = self.encode(True, self.position(rows[0])) if has_previous else None
+
+        return rows, next_cursor, previous_cursor
+
+    def position(self, row):
+        """
+        Returns the ordering values of a row, either a model instance or a dict
+        produced by `QuerySet.values()`.
+        """
+        if isinstance(row, dict):
+            return [row[name if name in row else field.attname] for name, field in zip(self.ordering, self.fields)]
+
+        return [getattr(row, field.attname) for field in self.fields]
+
+    def encode(self, reverse, position):
+        payload = json.dumps({'r': int(reverse), 'p': [self._dump(value) for value in position]},
+                             separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode((cursor + padding).encode('ascii')))
+            values = payload['p']
+            if len(values) != len(self.fields):
+                raise InvalidCursor()
+            position = [field.to_python(value) for field, value in zip(self.fields, values)]
+            return bool(payload['r']), position
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise InvalidCursor()
+
+    def _seek(self, position, reverse):
+        # (a, b, c) > (x, y, z)  ==  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        # The leading `a >= x` does not change the result but lets the planner use a
+        # range scan on the composite index instead of evaluating the whole OR.
+        lookup = 'lt' if reverse else 'gt'
+        condition = Q()
+        equal = {}
+        for name, value in zip(self.ordering, position):
+            condition |= Q(**equal, **{'%s__%s' % (name, lookup): value})
+            equal[name] = value
+
+        first = self.ordering[0]
+        return Q(**{'%s__%se' % (first, lookup): position[0]}) & condition
+
+    @staticmethod
+    def _dump(value):
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        if isinstance(value, (Decimal, UUID)):
+            return str(value)
+        return value
@@ -0,0 +1,166 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Permission, User
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from app.models.system.revision import Revision
+import app.config.constants as constants
+
+
+class PermissionCache:
+    """
+    Stores each user's resolved permissions ("app_label.codename" strings, split into
+    direct and group permissions) in the configured cache so permission checks do not
+    join auth_user_groups, auth_group_permissions and auth_permission on every request.
+
+    Entries are invalidated from the signals in `app.signals.system.permission_signals`
+    whenever a user's groups, a group's permissions or a user's direct permissions
+    change, and when a group or permission is deleted. The TTL is only a safety net.
+    """
+    key_prefix = 'auth:perms'
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.PERMISSION_CACHE_ALIAS]
+
+    @classmethod
+    def key(cls, user_id):
+        return '%s:%s' % (cls.key_prefix, user_id)
+
+    @classmethod
+    def get(cls, user_id):
+        """
+        Returns a dict with the `user` and `group` permission sets of a user, loading
+        and caching them when they are not cached yet.
+        """
+        cache = cls.get_cache()
+        key = cls.key(user_id)
+        cached = cache.get(key)
+
+        if cached is None:
+            cached = cls.load(user_id)
+            cache.set(key, cached, settings.PERMISSION_CACHE_TTL)
+
+        return {name: set(perms) for name, perms in cached.items()}
+
+    @staticmethod
+    def load(user_id):
+        # Read from the primary: a lagging replica would cache the permissions from
+        # before the change that invalidated them for the whole TTL.
+        permissions = Permission.objects.using(DEFAULT_DB_ALIAS)
+
+        def names(queryset):
+            return sorted('%s.%s' % (app_label, codename) for app_label, codename in
+                          queryset.values_list('content_type__app_label', 'codename'))
+
+        return {
+            'user': names(permissions.filter(user=user_id)),
+            'group': names(permissions.filter(group__user=user_id)),
+        }
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        """
+        Drops the cached permissions of the given users now and again once the current
+        transaction commits, so a concurrent request can not re-cache the old rows.
+        """
+        keys = [cls.key(user_id) for user_id in set(user_ids)]
+        if not keys:
+            return
+
+        cache = cls.get_cache()
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @classmethod
+    def invalidate_groups(cls, group_ids):
+        cls.invalidate(cls.group_members(group_ids))
+
+    @staticmethod
+    def group_members(group_ids):
+        return list(User.groups.through.objects.filter(group_id__in=list(group_ids))
+                    .values_list('user_id', flat=True).distinct())
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    `ModelBackend` that resolves permissions through `PermissionCache`.
+
+    Superusers, inactive users and object permissions keep the default behaviour.
+    """
+
+    def _uses_cache(self, user_obj, obj):
+        return obj is None and user_obj.is_active and not user_obj.is_anonymous and not user_obj.is_superuser
+
+    def _cached_permissions(self, user_obj):
+        if not hasattr(user_obj, '_cached_permissions'):
+            user_obj._cached_permissions = PermissionCache.get(user_obj.pk)
+        return user_obj._cached_permissions
+
+    def get_user_permissions(self, user_obj, obj=None):
+        if not self._uses_cache(user_obj, obj):
+            return super().get_user_permissions(user_obj, obj)
+        return self._cached_permissions(user_obj)['user']
+
+    def get_group_permissions(self, user_obj, obj=None):
+        if not self._uses_cache(user_obj, obj):
+            return super().get_group_permissions(user_obj, obj)
+        return self._cached_permissions(user_obj)['group']
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not self._uses_cache(user_obj, obj):
+            return super().get_all_permissions(user_obj, obj)
+
+        if not hasattr(user_obj, '_perm_cache'):
+            permissions = self._cached_permissions(user_obj)
+            user_obj._perm_cache = permissions['user'] | permissions['group']
+        return user_obj._perm_cache
+
+
+class PermissionCatalog:
+    """
+    Process-wide map of permission ids to "app_label.codename" names, used to expand
+    the compact permission digest carried by access tokens without querying the
+    permission tables.
+
+    An unknown id or name reloads the map only when the permission table changed
+    since it was loaded (its `Revision`), so a token listing a deleted permission
+    costs a primary key lookup per request instead of a read of the whole table.
+    """
+    _names = {}
+    _ids = {}
+    _revision = None
+
+    @classmethod
+    def names(cls, permission_ids):
+        if any(permission_id not in cls._names for permission_id in permission_ids):
+            cls.refresh()
+        return {cls._names[permission_id] for permission_id in permission_ids if permission_id in cls._names}
+
+    @classmethod
+    def ids(cls, names):
+        if any(name not in cls._ids for name in names):
+            cls.refresh()
+        return sorted(cls._ids[name] for name in names if name in cls._ids)
+
+    @staticmethod
+    def revision():
+        return Revision.get(constants.PERMISSION_REVISION, using=DEFAULT_DB_ALIAS)[0]
+
+    @classmethod
+    def refresh(cls):
+        revision = cls.revision()
+        if revision != cls._revision:
+            cls.reload(revision)
+
+    @classmethod
+    def reload(cls, revision=None):
+        # The revision is read before the table: a change committed in between leaves
+        # the map one revision behind, so the next unknown id reloads it again.
+        cls._revision = cls.revision() if revision is None else revision
+        cls._names = {
+            permission_id: '%s.%s' % (app_label, codename)
+            for permission_id, app_label, codename in
+            Permission.objects.using(DEFAULT_DB_ALIAS).values_list('id', 'content_type__app_label', 'codename')
+        }
+        cls._ids = {name: permission_id for permission_id, name in cls._names.items()}
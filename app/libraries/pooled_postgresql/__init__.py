@@ -0,0 +1,29 @@
+"""
+PostgreSQL backend that checks connections out of a per-process psycopg2 pool
+instead of opening one per request, see `base.DatabaseWrapper`.
+
+The pool registry lives here, so the metrics can be read without importing psycopg2.
+"""
+import threading
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def metrics():
+    """
+    Returns:
+        list: Counters of every pool of this process, with its alias and database.
+    """
+    with pools_lock:
+        return [pool.metrics() for pool in pools.values()]
+
+
+def close_pools(alias=None):
+    """
+    Closes the pooled connections of `alias` (every alias by default), e.g. before
+    the test database is dropped.
+    """
+    with pools_lock:
+        for key in [key for key, pool in pools.items() if alias is None or pool.alias == alias]:
+            pools.pop(key).closeall()
@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from functools import partial
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from psycopg2 import pool as psycopg2_pool
+from app.libraries.pooled_postgresql import close_pools, pools, pools_lock
+
+Database = base.Database
+
+
+class ConnectionPool(psycopg2_pool.ThreadedConnectionPool):
+    """
+    `ThreadedConnectionPool` whose connections are opened by Django's backend (so
+    they get its cursor factory, isolation level and JSON handling), with:
+
+    - a bounded checkout: callers wait up to `timeout` seconds for one of the
+      `max_size` connections instead of failing at once,
+    - an idle timeout: connections idle for more than `idle_timeout` seconds are
+      closed on checkout rather than handed out after the server or a proxy dropped
+      them,
+    - an optional `SELECT 1` health check on checkout,
+    - counters, see `metrics()`.
+
+    psycopg2 keeps at most `min_size` idle connections: they are opened with the
+    pool, the ones returned beyond that are closed.
+    """
+
+    def __init__(self, factory, alias, database, min_size=1, max_size=10, idle_timeout=300, timeout=5,
+                 health_checks=False):
+        self.factory = factory
+        self.alias = alias
+        self.database = database
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.health_checks = health_checks
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.returned_at = {}
+        self.stats_lock = threading.Lock()
+        self.stats = {'created': 0, 'checkouts': 0, 'waits': 0, 'wait_seconds': 0.0, 'timeouts': 0,
+                      'closed_idle': 0, 'closed_broken': 0}
+        super().__init__(min_size, max_size)
+
+    def count(self, name, value=1):
+        with self.stats_lock:
+            self.stats[name] += value
+
+    def _connect(self, key=None):
+        # Same bookkeeping as psycopg2's, with Django opening the connection.
+        connection = self.factory()
+        self.count('created')
+        if key is not None:
+            self._used[key] = connection
+            self._rused[id(connection)] = key
+        else:
+            # Opened idle with the pool (min_size), so the idle timeout applies to it.
+            self._pool.append(connection)
+            self.returned_at[id(connection)] = time.monotonic()
+        return connection
+
+    def usable(self, connection):
+        returned_at = self.returned_at.pop(id(connection), None)
+        if connection.closed:
+            self.count('closed_broken')
+            return False
+        if returned_at is None:
+            # Opened by psycopg2's getconn for this checkout, every idle connection has
+            # a returned_at.
+            return True
+        if self.idle_timeout and time.monotonic() - returned_at > self.idle_timeout:
+            self.count('closed_idle')
+            return False
+        if self.health_checks:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                if not connection.autocommit:
+                    connection.rollback()
+            except Database.Error:
+                self.count('closed_broken')
+                return False
+        return True
+
+    def getconn(self, key=None):
+        if not self.slots.acquire(blocking=False):
+            self.count('waits')
+            started = time.monotonic()
+            acquired = self.slots.acquire(timeout=self.timeout)
+            self.count('wait_seconds', time.monotonic() - started)
+            if not acquired:
+                self.count('timeouts')
+                raise Database.OperationalError(
+                    'No connection of the pool of %d was returned within %ss.' % (self.maxconn, self.timeout))
+
+        try:
+            while True:
+                connection = super().getconn()
+                if self.usable(connection):
+                    break
+                super().putconn(connection, close=True)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        self.count('checkouts')
+        return connection
+
+    def putconn(self, conn, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+            if not conn.closed:
+                self.returned_at[id(conn)] = time.monotonic()
+        finally:
+            self.slots.release()
+
+    def metrics(self):
+        with self._lock, self.stats_lock:
+            return dict(self.stats, alias=self.alias, database=self.database, in_use=len(self._used),
+                        idle=len(self._pool), min_size=self.minconn, max_size=self.maxconn,
+                        reused=self.stats['checkouts'] - self.stats['created'])
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Pooled connections to the test database would keep it from being dropped.
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend that takes its connections from a per-process `ConnectionPool`
+    and returns them to it when Django closes them. Pair it with `CONN_MAX_AGE = 0`,
+    so connections go back to the pool at the end of every request.
+
+    `CONN_HEALTH_CHECKS` enables the pool's health check on checkout.
+
+    Example:
+        DATABASES = {'default': {
+            'ENGINE': 'app.libraries.pooled_postgresql',
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {'pool': {'min_size': 2, 'max_size': 10, 'idle_timeout': 300, 'timeout': 5}},
+            ...
+        }}
+    """
+    creation_class = DatabaseCreation
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_pool(self, conn_params):
+        key = (os.getpid(), self.alias, repr(sorted(conn_params.items())))
+        with pools_lock:
+            pool = pools.get(key)
+            if pool is None:
+                options = self.settings_dict['OPTIONS'].get('pool', {})
+                pool = pools[key] = ConnectionPool(
+                    partial(super().get_new_connection, conn_params), self.alias, conn_params.get('dbname'),
+                    health_checks=self.settings_dict['CONN_HEALTH_CHECKS'], **options)
+        return pool
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.getconn()
+        # Set by super().get_new_connection() on the wrapper that opened the connection.
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED))
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                return self.pool.putconn(self.connection)
@@ -0,0 +1,184 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe, urlencode
+from rest_framework.response import Response
+from app.models.system.revision import Revision
+
+
+class LocalLRU:
+    """
+    Per-process LRU map bounded to `max_entries`, the least recently used entry is
+    evicted first.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ResponseCache:
+    """
+    Cache of the response data of read-mostly catalog endpoints (groups, permissions).
+
+    Keys embed the generation of every table the response reads (`Revision`
+    counters bumped by `app.signals.system.version_signals`), so a change is never
+    served stale and nothing has to be deleted: entries of older generations are
+    simply not requested again and age out of the LRU (and the shared TTL).
+
+    Tiers:
+        local: `LocalLRU` of RESPONSE_CACHE_MAX_ENTRIES entries per process.
+        shared: the RESPONSE_CACHE_ALIAS cache when set, shared by every process.
+
+    Hits and misses are counted per process, see `metrics()`.
+    """
+    key_prefix = 'response'
+    _local = None
+    _lock = threading.Lock()
+    _counters = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+    @classmethod
+    def get_local(cls):
+        if cls._local is None:
+            cls._local = LocalLRU(settings.RESPONSE_CACHE_MAX_ENTRIES)
+        return cls._local
+
+    @staticmethod
+    def get_shared():
+        return caches[settings.RESPONSE_CACHE_ALIAS] if settings.RESPONSE_CACHE_ALIAS else None
+
+    @classmethod
+    def key(cls, namespace, generations, request):
+        """
+        Key of a request: the endpoint, the generations, the query params in a
+        canonical order and the renderer format.
+        """
+        params = urlencode(sorted((name, sorted(values)) for name, values in request.query_params.lists()), doseq=True)
+        raw = '%s|%s|%s|%s' % (namespace, ','.join(map(str, generations)), params, request.accepted_renderer.format)
+        return '%s:%s' % (cls.key_prefix, hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+    @classmethod
+    def count(cls, name):
+        with cls._lock:
+            cls._counters[name] += 1
+
+    @classmethod
+    def get(cls, key):
+        """
+        Returns:
+            tuple: (entry, tier) with tier "local" or "shared", (None, None) on a miss.
+        """
+        entry = cls.get_local().get(key)
+        if entry is not None:
+            cls.count('local_hits')
+            return entry, 'local'
+
+        shared = cls.get_shared()
+        if shared is not None:
+            entry = shared.get(key)
+            if entry is not None:
+                cls.get_local().set(key, entry)
+                cls.count('shared_hits')
+                return entry, 'shared'
+
+        cls.count('misses')
+        return None, None
+
+    @classmethod
+    def set(cls, key, entry):
+        cls.get_local().set(key, entry)
+        shared = cls.get_shared()
+        if shared is not None:
+            shared.set(key, entry, settings.RESPONSE_CACHE_TTL)
+
+    @classmethod
+    def metrics(cls):
+        with cls._lock:
+            counters = dict(cls._counters)
+        requests = sum(counters.values())
+        hits = counters['local_hits'] + counters['shared_hits']
+        return dict(counters, requests=requests, hit_ratio=round(hits / requests, 4) if requests else None,
+                    local_entries=len(cls.get_local()), local_max_entries=cls.get_local().max_entries,
+                    shared_alias=settings.RESPONSE_CACHE_ALIAS or None)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._local = None
+            cls._counters = {name: 0 for name in cls._counters}
+
+
+class CachedResponseMixin:
+    """
+    Serves GET responses from `ResponseCache`.
+
+    The key covers the endpoint, the query params and the `Revision` counters in
+    `cache_revisions`, read with one query. Streamed responses (`?stream=`) are not
+    cached. Responses carry `X-Cache: HIT-LOCAL`, `HIT-SHARED` or `MISS`.
+
+    Placed before `ConditionalGetMixin`, the cached `ETag`/`Last-Modified` answer
+    conditional requests on a hit, without the validators query.
+
+    Only use it on endpoints whose response does not depend on the user.
+
+    Attributes:
+        cache_revisions (tuple): Names of the `Revision` counters of every table the
+            response reads.
+
+    Example:
+        class PermissionList(CachedResponseMixin, generics.ListAPIView):
+            cache_revisions = (constants.PERMISSION_REVISION,)
+    """
+    cache_revisions = ()
+
+    def get(self, request, *args, **kwargs):
+        if not settings.RESPONSE_CACHE_ENABLED or request.query_params.get('stream'):
+            return super().get(request, *args, **kwargs)
+
+        # The timestamp keeps a number reused after a rolled back bump from matching.
+        generations = {name: (value, updated_at.timestamp()) for name, value, updated_at in
+                       Revision.objects.filter(name__in=self.cache_revisions).values_list('name', 'value', 'updated_at')}
+        key = ResponseCache.key('%s:%s' % (request.resolver_match.view_name, kwargs),
+                                [generations.get(name) for name in self.cache_revisions], request)
+
+        entry, tier = ResponseCache.get(key)
+        if entry is not None:
+            headers = entry['headers']
+            response = get_conditional_response(request, etag=headers.get('ETag'),
+                                                last_modified=parse_http_date_safe(headers.get('Last-Modified')))
+            if response is not None:
+                for name in ('ETag', 'Cache-Control'):
+                    if name in headers:
+                        response[name] = headers[name]
+            else:
+                response = Response(entry['data'], status=entry['status'], headers=headers)
+            response['X-Cache'] = 'HIT-%s' % tier.upper()
+            return response
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            headers = {name: value for name, value in response.items() if name.lower() != 'content-type'}
+            ResponseCache.set(key, {'data': response.data, 'status': response.status_code, 'headers': headers})
+        response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,81 @@
+from django.db import connections
+from django.db.models import Case, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+from rest_framework.filters import BaseFilterBackend
+
+
+class RankedSearchFilter(BaseFilterBackend):
+    """
+    Free text search over the view's `search_fields` through the `?q=` parameter.
+
+    Every word of the query has to appear (case-insensitively) in at least one of the
+    fields and the results are ordered by relevance. On PostgreSQL the containment test
+    is served by the `pg_trgm` GIN indexes created in migration 0004 and relevance is
+    the trigram similarity. Other databases (SQLite in tests) use the same containment
+    test with a portable rank: exact match > prefix match > substring match.
+
+    Example:
+        GET /users/pagination/?q=john doe
+    """
+    search_param = 'q'
+    rank_annotation = 'search_rank'
+
+    def get_search_terms(self, request):
+        value = request.query_params.get(self.search_param, '')
+        return [term for term in value.replace(',', ' ').split() if term]
+
+    def filter_queryset(self, request, queryset, view):
+        fields = getattr(view, 'search_fields', None)
+        terms = self.get_search_terms(request)
+
+        if not fields or not terms:
+            return queryset
+
+        for term in terms:
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{'%s__icontains' % field: term})
+            queryset = queryset.filter(condition)
+
+        if connections[queryset.db].vendor == 'postgresql':
+            rank = self.trigram_rank(fields, terms)
+        else:
+            rank = self.portable_rank(fields, terms)
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering or ['pk']
+        return queryset.annotate(**{self.rank_annotation: rank}).order_by('-%s' % self.rank_annotation, *ordering)
+
+    def trigram_rank(self, fields, terms):
+        # Imported here because django.contrib.postgres requires psycopg at import time.
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return self._sum([self._greatest([TrigramSimilarity(field, term) for field in fields], FloatField())
+                          for term in terms])
+
+    def portable_rank(self, fields, terms):
+        scores = []
+        for term in terms:
+            scores.append(self._greatest([
+                Case(
+                    When(**{'%s__iexact' % field: term}, then=Value(3)),
+                    When(**{'%s__istartswith' % field: term}, then=Value(2)),
+                    When(**{'%s__icontains' % field: term}, then=Value(1)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                for field in fields
+            ], IntegerField()))
+        return self._sum(scores)
+
+    @staticmethod
+    def _greatest(expressions, output_field):
+        if len(expressions) == 1:
+            return expressions[0]
+        return Greatest(*expressions, output_field=output_field)
+
+    @staticmethod
+    def _sum(expressions):
+        total = expressions[0]
+        for expression in expressions[1:]:
+            total = total + expression
+        return total
@@ -0,0 +1,117 @@
+import math
+import random
+import threading
+import time
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key within a process: the first caller
+    runs the function, the others wait for it and get its result (or exception).
+
+    Example:
+        single_flight.do('pagination:count:auth.user', queryset.count)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+single_flight = SingleFlight()
+
+
+def _compute(cache, key, compute, timeout):
+    start = time.time()
+    value = compute()
+    now = time.time()
+    expires_at = now + timeout if timeout is not None else None
+    cache.set(key, (value, now - start, expires_at), timeout)
+    return value
+
+
+def _refresh(cache, key, compute, timeout, lock_timeout, wait):
+    lock_key = '%s:lock' % key
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            return _compute(cache, key, compute, timeout)
+        finally:
+            cache.delete(lock_key)
+
+    # Another process is computing the value, give it a moment before doing it too.
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    return _compute(cache, key, compute, timeout)
+
+
+def fetch(cache, key, compute, timeout, beta=1.0, lock_timeout=10, wait=1.0):
+    """
+    Returns the value cached under `key`, computing and caching it with `compute()`
+    for `timeout` seconds when it is missing, without letting a popular key expire
+    into a stampede of identical recomputations.
+
+    - Early refresh (XFetch): each read recomputes the value before it expires with a
+      probability that rises as expiry nears and with the time the last computation
+      took (`beta` > 1 favours earlier refreshes). Only the caller that wins the
+      `cache.add` lock refreshes, the others keep reading the current value.
+    - On a miss, concurrent callers of the process share one computation
+      (`single_flight`) and other processes wait up to `wait` seconds for the lock
+      holder's value before computing it themselves.
+
+    Entries are stored as (value, compute seconds, expiry timestamp), so a key must
+    only be read through `fetch`.
+
+    Example:
+        count = fetch(caches['two_level'], key, queryset.count, 60)
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires_at = entry
+        # log(1 - random()) is <= 0, so the check moves the current time forward.
+        if expires_at is None or time.time() - delta * beta * math.log(1.0 - random.random()) < expires_at:
+            return value
+
+        lock_key = '%s:lock' % key
+        if not cache.add(lock_key, 1, lock_timeout):
+            return value
+        try:
+            return _compute(cache, key, compute, timeout)
+        finally:
+            cache.delete(lock_key)
+
+    return single_flight.do(key, lambda: _refresh(cache, key, compute, timeout, lock_timeout, wait))
@@ -0,0 +1,100 @@
+from django.db import router
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from app.libraries.fast_json import dumps
+from app.libraries.keyset_pagination import KeysetPaginator, InvalidCursor
+import app.config.constants as constants
+
+
+class StreamingListMixin:
+    """
+    List behaviour for endpoints that may return whole tables.
+
+    `?stream=json` or `?stream=ndjson` iterates the queryset with a server-side cursor
+    and writes rows to a `StreamingHttpResponse` as they are serialized, so memory stays
+    flat regardless of the number of rows.
+
+    Without `stream` the response keeps its plain list shape but is capped to
+    `max_list_size` rows. When more rows exist the `Link` header carries a keyset
+    cursor (`rel="next"`) to continue from, using the view's `cursor_ordering`.
+
+    Attributes:
+        max_list_size (int): Hard cap of rows returned by a non-streaming request.
+        stream_chunk_size (int): Rows fetched per round trip and written per chunk.
+        cursor_ordering (tuple): Stable ordering used for cursors and streaming.
+    """
+    stream_query_param = 'stream'
+    cursor_query_param = 'cursor'
+    stream_content_types = {
+        'json': 'application/json',
+        'ndjson': 'application/x-ndjson',
+    }
+    max_list_size = constants.LIST_MAX_SIZE
+    stream_chunk_size = constants.LIST_STREAM_CHUNK_SIZE
+    cursor_ordering = ('pk',)
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        stream_format = request.query_params.get(self.stream_query_param)
+        if stream_format:
+            if stream_format not in self.stream_content_types:
+                raise ValidationError({self.stream_query_param: 'Must be one of: %s.' % ', '.join(self.stream_content_types)})
+            return self.stream_list(queryset, stream_format)
+
+        paginator = KeysetPaginator(queryset, self.cursor_ordering, self.max_list_size)
+        try:
+            rows, next_cursor, previous_cursor = paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise NotFound(self.invalid_cursor_message)
+
+        serializer = self.get_serializer(rows, many=True)
+        links = [
+            '<%s>; rel="%s"' % (replace_query_param(request.build_absolute_uri(), self.cursor_query_param, cursor), rel)
+            for rel, cursor in (('next', next_cursor), ('prev', previous_cursor)) if cursor
+        ]
+        headers = {'Link': ', '.join(links)} if links else None
+        return Response(serializer.data, headers=headers)
+
+    def stream_list(self, queryset, stream_format):
+        # The rows are read once the response is consumed, after the middlewares
+        # returned: bind the database (a replica for safe requests) while the request
+        # is still routed.
+        queryset = queryset.order_by(*self.cursor_ordering).using(router.db_for_read(queryset.model))
+        response = StreamingHttpResponse(
+            self.stream_rows(queryset, stream_format),
+            content_type=self.stream_content_types[stream_format],
+        )
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def stream_rows(self, queryset, stream_format):
+        # One serializer instance is reused for every row instead of one per row.
+        serializer = self.get_serializer()
+        separator = b'\n' if stream_format == 'ndjson' else b','
+        chunk = []
+        first = True
+
+        if stream_format == 'json':
+            yield b'['
+
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            row = dumps(serializer.to_representation(instance))
+            if stream_format == 'ndjson':
+                chunk.append(row + separator)
+            else:
+                chunk.append(row if first else separator + row)
+            first = False
+
+            if len(chunk) >= self.stream_chunk_size:
+                yield b''.join(chunk)
+                chunk = []
+
+        if chunk:
+            yield b''.join(chunk)
+
+        if stream_format == 'json':
+            yield b']'
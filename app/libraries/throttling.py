@@ -0,0 +1,183 @@
+import hashlib
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocalMemoryStorage:
+    """
+    Per-process sliding window counters. Used in tests and single process setups.
+    """
+    max_keys = 10000
+
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def hit(self, key, window, now):
+        index = int(now // window)
+        with self.lock:
+            if len(self.counters) >= self.max_keys:
+                self.prune(now)
+
+            stored_index, current, previous, _ = self.counters.get(key, (index, 0, 0, window))
+            if stored_index == index - 1:
+                current, previous = 0, current
+            elif stored_index != index:
+                current, previous = 0, 0
+
+            current += 1
+            self.counters[key] = (index, current, previous, window)
+        return current, previous
+
+    def prune(self, now):
+        # Counters older than the previous window no longer weigh on any decision.
+        self.counters = {key: value for key, value in self.counters.items() if value[0] >= int(now // value[3]) - 1}
+
+    def clear(self):
+        with self.lock:
+            self.counters = {}
+
+
+class CacheStorage:
+    """
+    Sliding window counters in a Django cache shared by every process (THROTTLE_CACHE_ALIAS).
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def hit(self, key, window, now):
+        index = int(now // window)
+        current_key = '%s:%d' % (key, index)
+        previous_key = '%s:%d' % (key, index - 1)
+
+        self.cache.add(current_key, 0, window * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Evicted between add() and incr().
+            self.cache.set(current_key, 1, window * 2)
+            current = 1
+
+        return current, self.cache.get(previous_key, 0)
+
+
+class ThrottleStorage:
+    """
+    Shared storage of the sliding window throttles, selected by THROTTLE_STORAGE
+    ("cache" or "local").
+    """
+    _storage = None
+
+    @classmethod
+    def get(cls):
+        if cls._storage is None:
+            if settings.THROTTLE_STORAGE == 'local':
+                cls._storage = LocalMemoryStorage()
+            else:
+                cls._storage = CacheStorage(settings.THROTTLE_CACHE_ALIAS)
+        return cls._storage
+
+    @classmethod
+    def reset(cls):
+        cls._storage = None
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Rate throttle over a sliding window approximated from two fixed windows: the
+    count of the current window plus the count of the previous one weighted by how
+    much of it still overlaps the sliding window.
+
+    Unlike DRF's SimpleRateThrottle, which keeps a list of timestamps per client,
+    every decision is one counter increment, so rejecting a request costs
+    microseconds and never reaches the view's password hashing or queries.
+
+    Subclasses set `scope` (a key of DEFAULT_THROTTLE_RATES) and `get_identifier`.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s:%(window)d'
+
+    def get_rate(self):
+        # Read on every request so DEFAULT_THROTTLE_RATES can be overridden.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_identifier(self, request, view):
+        raise NotImplementedError('.get_identifier() must be overridden')
+
+    def get_cache_key(self, request, view):
+        ident = self.get_identifier(request, view)
+        if not ident:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident, 'window': self.duration}
+
+    def allow_request(self, request, view):
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        current, previous = ThrottleStorage.get().hit(self.key, self.duration, self.now)
+        self.elapsed = self.now % self.duration
+        self.count = current + previous * (1 - self.elapsed / self.duration)
+
+        return self.count <= self.num_requests
+
+    def wait(self):
+        return self.duration - self.elapsed
+
+
+class IPThrottle(SlidingWindowThrottle):
+    def get_identifier(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    """
+    Throttles by the email address posted in `field`, across all client addresses,
+    or per client address when `per_client` is set. The address is hashed so the key
+    is short and does not store it in clear.
+    """
+    field = 'email'
+    per_client = False
+
+    def get_identifier(self, request, view):
+        email = request.data.get(self.field) if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        ident = email.strip().lower()
+        if self.per_client:
+            ident = '%s:%s' % (ident, self.get_ident(request))
+        return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+
+class LoginEmailThrottle(EmailThrottle):
+    """
+    Keyed on (email, client IP): a bucket shared by every client would let anyone
+    who knows an address lock its owner out of login.
+    """
+    scope = 'login_email'
+    per_client = True
+
+
+class PasswordResetIPThrottle(IPThrottle):
+    scope = 'password_reset_ip'
+
+
+class PasswordResetEmailThrottle(EmailThrottle):
+    scope = 'password_reset_email'
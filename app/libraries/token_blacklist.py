@@ -0,0 +1,192 @@
+import atexit
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from app.libraries.cache_backends import is_process_local
+
+
+class BloomFilter:
+    """
+    Fixed size bloom filter over strings. `in` never returns a false negative and
+    returns a false positive with roughly `error_rate` probability while the filter
+    holds at most `capacity` items.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(int(capacity), 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: k positions derived from two independent 64 bit hashes.
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenBlacklist:
+    """
+    Blacklist lookups for refresh token JTIs that stay O(1) as the blacklist grows.
+
+    1. A shared cache key per blacklisted JTI catches tokens blacklisted by any process
+       since the bloom filter was built.
+    2. A bloom filter of the non-expired blacklisted JTIs, built off-request by the
+       `rebuild_token_blacklist` command and published in the shared cache, answers
+       "not blacklisted" for every other token without touching the database. Each
+       process reloads it at most every TOKEN_BLACKLIST_BLOOM_REFRESH seconds.
+    3. Bloom filter hits (blacklisted tokens and rare false positives) are confirmed
+       against the database.
+
+    Every lookup goes to the database, as simplejwt's does, while the filter can not
+    be trusted: when TOKEN_BLACKLIST_CACHE_ALIAS is process-local (the JTI keys of
+    other processes are invisible) and when no filter was published within twice
+    TOKEN_BLACKLIST_BLOOM_REFRESH seconds. A JTI key evicted before the next rebuild
+    may still let a blacklisted token through until then.
+    """
+    key_prefix = 'auth:blacklisted'
+    bloom_key = 'auth:blacklisted-bloom'
+    _bloom = None
+    _built_at = None
+    _loaded_at = None
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.TOKEN_BLACKLIST_CACHE_ALIAS]
+
+    @classmethod
+    def key(cls, jti):
+        return '%s:%s' % (cls.key_prefix, jti)
+
+    @classmethod
+    def is_shared(cls):
+        return not is_process_local(cls.get_cache())
+
+    @staticmethod
+    def max_age():
+        return settings.TOKEN_BLACKLIST_BLOOM_REFRESH * 2
+
+    @classmethod
+    def build(cls):
+        blacklisted = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        # Headroom so tokens blacklisted before the next rebuild keep the error rate.
+        bloom = BloomFilter(blacklisted.count() * 2 + 1024, settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE)
+        for jti in blacklisted.values_list('token__jti', flat=True).iterator(chunk_size=5000):
+            bloom.add(jti)
+        return bloom
+
+    @classmethod
+    def publish(cls):
+        """
+        Builds the bloom filter and publishes it to every process through the shared
+        cache. Run by `rebuild_token_blacklist`, never on a request.
+        """
+        built_at = time.time()
+        bloom = cls.build()
+        cls.get_cache().set(cls.bloom_key, (built_at, bloom), cls.max_age())
+        cls._built_at, cls._bloom, cls._loaded_at = built_at, bloom, time.monotonic()
+        return bloom
+
+    @classmethod
+    def bloom(cls):
+        """
+        Returns the published bloom filter, or None when lookups must go to the
+        database.
+        """
+        if not cls.is_shared():
+            return None
+
+        now = time.monotonic()
+        if cls._loaded_at is None or now - cls._loaded_at > settings.TOKEN_BLACKLIST_BLOOM_REFRESH:
+            cls._built_at, cls._bloom = cls.get_cache().get(cls.bloom_key, (None, None))
+            cls._loaded_at = now
+
+        if cls._bloom is None or time.time() - cls._built_at > cls.max_age():
+            return None
+        return cls._bloom
+
+    @classmethod
+    def add(cls, jti, expires_at):
+        """
+        Publishes a JTI that has just been blacklisted in the database.
+        """
+        timeout = max(int((expires_at - timezone.now()).total_seconds()), 1)
+        cls.get_cache().set(cls.key(jti), True, timeout)
+        if cls._bloom is not None:
+            cls._bloom.add(jti)
+
+    @classmethod
+    def is_blacklisted(cls, jti):
+        if cls.get_cache().get(cls.key(jti)):
+            return True
+
+        bloom = cls.bloom()
+        if bloom is not None and jti not in bloom:
+            return False
+
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    @classmethod
+    def reset(cls):
+        cls._bloom = None
+        cls._built_at = None
+        cls._loaded_at = None
+
+
+class OutstandingTokenBuffer:
+    """
+    Collects the OutstandingToken rows of issued refresh tokens and inserts them with
+    one `bulk_create` when a token is added and JWT_OUTSTANDING_TOKEN_BATCH_SIZE rows
+    are pending or the oldest one waited JWT_OUTSTANDING_TOKEN_FLUSH_INTERVAL seconds,
+    and at exit. There is no timer: after the last login of a busy period the rows
+    stay buffered until the next login or the process exits.
+
+    Only used when JWT_OUTSTANDING_TOKEN_MODE is "deferred". Blacklist checks key on
+    the JTI and `blacklist()` creates a missing row, so a row that is still buffered,
+    or lost with a crashed process, only hides the token from listings and from
+    `prune_token_blacklist`.
+    """
+    _pending = []
+    _oldest = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def add(cls, outstanding_token):
+        with cls._lock:
+            if not cls._pending:
+                cls._oldest = time.monotonic()
+            cls._pending.append(outstanding_token)
+            due = (len(cls._pending) >= settings.JWT_OUTSTANDING_TOKEN_BATCH_SIZE or
+                   time.monotonic() - cls._oldest >= settings.JWT_OUTSTANDING_TOKEN_FLUSH_INTERVAL)
+
+        if due:
+            cls.flush()
+
+    @classmethod
+    def flush(cls):
+        with cls._lock:
+            pending, cls._pending, cls._oldest = cls._pending, [], None
+
+        if pending:
+            OutstandingToken.objects.bulk_create(pending, ignore_conflicts=True)
+        return len(pending)
+
+    @classmethod
+    def pending(cls):
+        return len(cls._pending)
+
+
+atexit.register(OutstandingTokenBuffer.flush)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from app.libraries.permission_cache import PermissionCache, PermissionCatalog
+from app.libraries.token_blacklist import OutstandingTokenBuffer, TokenBlacklist
+
+PERMISSION_DIGEST_CLAIM = 'perms'
+
+
+def encode_permission_digest(permission_ids):
+    """
+    Encodes permission ids as sorted base 36 numbers joined by dots, e.g. "1.2.a.1f".
+    """
+    def base36(number):
+        digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+        encoded = ''
+        while True:
+            number, remainder = divmod(number, 36)
+            encoded = digits[remainder] + encoded
+            if not number:
+                return encoded
+
+    return '.'.join(base36(permission_id) for permission_id in sorted(permission_ids))
+
+
+def decode_permission_digest(digest):
+    return [int(part, 36) for part in digest.split('.') if part]
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user claims needed by `StatelessJWTAuthentication`:
+    username, is_active, is_staff, is_superuser and, when JWT_PERMISSION_DIGEST is
+    enabled, a compact digest of the user's effective permissions.
+
+    Access tokens obtained from it copy those claims. Blacklist checks go through
+    `TokenBlacklist` instead of querying the blacklist tables on every refresh, and
+    with JWT_OUTSTANDING_TOKEN_MODE "deferred" the OutstandingToken row is inserted
+    in batches by `OutstandingTokenBuffer` instead of once per login.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        if settings.JWT_OUTSTANDING_TOKEN_MODE != 'deferred':
+            token = super().for_user(user)
+        else:
+            # Skips BlacklistMixin.for_user, which inserts the row right away.
+            token = super(BlacklistMixin, cls).for_user(user)
+            OutstandingTokenBuffer.add(OutstandingToken(
+                user_id=user.pk,
+                jti=token[api_settings.JTI_CLAIM],
+                token=str(token),
+                created_at=token.current_time,
+                expires_at=datetime_from_epoch(token['exp']),
+            ))
+
+        cls.set_user_claims(token, user)
+        return token
+
+    @staticmethod
+    def set_user_claims(token, user):
+        token['username'] = user.get_username()
+        token['is_active'] = user.is_active
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+
+        if settings.JWT_PERMISSION_DIGEST and not user.is_superuser:
+            permissions = PermissionCache.get(user.pk)
+            token[PERMISSION_DIGEST_CLAIM] = encode_permission_digest(
+                PermissionCatalog.ids(permissions['user'] | permissions['group']))
+
+    def check_blacklist(self):
+        if TokenBlacklist.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        TokenBlacklist.add(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload['exp']))
+        return blacklisted
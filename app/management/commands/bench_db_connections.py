@@ -0,0 +1,84 @@
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import load_backend
+from app.libraries import pooled_postgresql
+
+
+class Command(BaseCommand):
+    """
+    Measures requests per second against the default database with a new
+    connection per request (`CONN_MAX_AGE = 0`), persistent connections and, on
+    PostgreSQL, the pooled backend (`app.libraries.pooled_postgresql`).
+
+    Every simulated request goes through Django's request lifecycle for connections
+    (`close_if_unusable_or_obsolete` when it starts and finishes) and runs `--query`,
+    so the difference between the modes is the connection setup.
+
+    Example:
+        python manage.py bench_db_connections --requests 2000 --concurrency 8
+    """
+    help = 'Benchmark requests/second with new, persistent and pooled database connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per thread.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--query', default='SELECT 1')
+
+    def handle(self, *args, **options):
+        default = connections['default'].settings_dict
+        modes = [
+            ('new connection', dict(default, CONN_MAX_AGE=0)),
+            ('persistent', dict(default, CONN_MAX_AGE=60)),
+        ]
+        if connections['default'].vendor == 'postgresql':
+            pool_options = {'min_size': options['concurrency'], 'max_size': options['concurrency']}
+            modes.append(('pooled', dict(default, ENGINE='app.libraries.pooled_postgresql', CONN_MAX_AGE=0,
+                                         OPTIONS=dict(default['OPTIONS'], pool=pool_options))))
+        else:
+            self.stdout.write(self.style.WARNING('The pooled mode needs PostgreSQL, skipping it.'))
+
+        for label, settings_dict in modes:
+            alias = 'bench_%s' % label.replace(' ', '_')
+            elapsed, latencies = self.run(alias, settings_dict, options)
+            total = options['requests'] * options['concurrency']
+            latencies.sort()
+            self.stdout.write('%-16s %9.0f requests/s  p50 %6.2f ms  p99 %6.2f ms' % (
+                label, total / elapsed, latencies[len(latencies) // 2] * 1000,
+                latencies[int(len(latencies) * 0.99)] * 1000))
+
+            for pool in pooled_postgresql.metrics():
+                if pool['alias'] == alias:
+                    self.stdout.write('  created %(created)d, reused %(reused)d, waits %(waits)d' % pool)
+            pooled_postgresql.close_pools(alias)
+
+    def run(self, alias, settings_dict, options):
+        latencies = []
+        lock = threading.Lock()
+        ready = threading.Barrier(options['concurrency'] + 1)
+
+        def worker():
+            connection = load_backend(settings_dict['ENGINE']).DatabaseWrapper(dict(settings_dict), alias)
+            timings = []
+            ready.wait()
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                connection.close_if_unusable_or_obsolete()
+                with connection.cursor() as cursor:
+                    cursor.execute(options['query'])
+                    cursor.fetchall()
+                connection.close_if_unusable_or_obsolete()
+                timings.append(time.perf_counter() - started)
+            connection.close()
+            with lock:
+                latencies.extend(timings)
+
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        ready.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started, latencies
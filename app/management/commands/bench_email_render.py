@@ -0,0 +1,44 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from app.services.emails.email_renderer import EmailRenderer
+
+
+class Command(BaseCommand):
+    """
+    Compares the per message render time of `render_to_string` with `EmailRenderer`
+    for a bulk send of one email template.
+
+    Example:
+        python manage.py bench_email_render --count 5000 --template reset_password_email.html --locale es
+    """
+    help = 'Benchmark email template rendering per message.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000)
+        parser.add_argument('--template', default='reset_password_email.html')
+        parser.add_argument('--locale', default=None)
+
+    def handle(self, *args, **options):
+        count = options['count']
+        name = options['template']
+        users = [User(id=i, username='user%d' % i, email='user%d@example.com' % i) for i in range(count)]
+
+        def context(user):
+            return {'user': user, 'domain': 'example.com', 'uid': user.id, 'token': 'token-%d' % user.id}
+
+        results = [
+            ('render_to_string (html)', lambda user: render_to_string('%s/%s' % (EmailRenderer.directory, name), context(user))),
+            ('EmailRenderer (html)', lambda user: EmailRenderer.get_templates(name, options['locale'])[0].render(context(user))),
+            ('EmailRenderer (html + text)', lambda user: EmailRenderer.render(name, context(user), options['locale'])),
+        ]
+
+        EmailRenderer.render(name, context(users[0]), options['locale'])
+
+        for label, render in results:
+            started = time.perf_counter()
+            for user in users:
+                render(user)
+            elapsed = time.perf_counter() - started
+            self.stdout.write('%-28s %8.1f us/message  (%d messages in %.3fs)' % (label, elapsed / count * 1e6, count, elapsed))
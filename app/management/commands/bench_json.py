@@ -0,0 +1,59 @@
+import io
+import time
+from django.contrib.auth.models import Permission, User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from app.libraries.fast_json import FastJSONParser, FastJSONRenderer, orjson
+from app.serializers.system.permission_serializer import PermissionSerializer
+from app.serializers.system.user_serializer import UserSerializer
+
+
+class Command(BaseCommand):
+    """
+    Compares DRF's JSON renderer and parser with `FastJSONRenderer` and
+    `FastJSONParser` on `UserList` and `PermissionList` sized payloads built in
+    memory (no queries).
+
+    Example:
+        python manage.py bench_json --rows 50000 --repeat 5
+    """
+    help = 'Benchmark JSON rendering and parsing of large list payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        count, repeat = options['rows'], options['repeat']
+        now = timezone.now()
+        payloads = [
+            ('UserList', UserSerializer([
+                User(id=i, username='user%d' % i, email='user%d@example.com' % i, first_name='Fírst', last_name='Last',
+                     is_active=bool(i % 2), date_joined=now, last_login=now if i % 3 else None) for i in range(count)
+            ], many=True).data),
+            ('PermissionList', PermissionSerializer([
+                Permission(id=i, name='Can do %d' % i, codename='do_%d' % i) for i in range(count)
+            ], many=True).data),
+        ]
+
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed, the fast classes use the standard library.'))
+
+        for name, data in payloads:
+            body = JSONRenderer().render(data)
+            self.stdout.write('%s: %d rows, %.1f KiB' % (name, count, len(body) / 1024))
+            results = [
+                ('JSONRenderer', lambda: JSONRenderer().render(data)),
+                ('FastJSONRenderer', lambda: FastJSONRenderer().render(data)),
+                ('JSONParser', lambda: JSONParser().parse(io.BytesIO(body))),
+                ('FastJSONParser', lambda: FastJSONParser().parse(io.BytesIO(body))),
+            ]
+            for label, run in results:
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    run()
+                elapsed = (time.perf_counter() - started) / repeat
+                self.stdout.write('  %-18s %8.2f ms  %10.0f rows/s  %8.1f MiB/s' % (
+                    label, elapsed * 1000, count / elapsed, len(body) / elapsed / 1024 / 1024))
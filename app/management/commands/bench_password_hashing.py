@@ -0,0 +1,64 @@
+import math
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    """
+    Measures the time of one password check (the CPU cost of a login) and the
+    resulting logins per second per core for each hasher policy in
+    PASSWORD_HASHER_POLICIES, and suggests the cost parameter that meets
+    PASSWORD_HASHER_TARGET_MS on this machine.
+
+    Example:
+        python manage.py bench_password_hashing --policy scrypt argon2 --target-ms 100
+    """
+    help = 'Benchmark password hashing per policy and suggest cost parameters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', nargs='*', default=list(settings.PASSWORD_HASHER_POLICIES))
+        parser.add_argument('--target-ms', type=float, default=settings.PASSWORD_HASHER_TARGET_MS)
+        parser.add_argument('--duration', type=float, default=2, help='Seconds to spend on each policy.')
+
+    def handle(self, *args, **options):
+        for policy in options['policy']:
+            hasher = import_string(settings.PASSWORD_HASHER_POLICIES[policy])()
+
+            try:
+                encoded = hasher.encode('correct horse battery staple', hasher.salt())
+            except ValueError as e:
+                self.stdout.write('%-7s skipped: %s' % (policy, e))
+                continue
+
+            checks = 0
+            started = time.perf_counter()
+            while True:
+                hasher.verify('correct horse battery staple', encoded)
+                checks += 1
+                elapsed = time.perf_counter() - started
+                if elapsed >= options['duration']:
+                    break
+
+            ms = elapsed / checks * 1000
+            self.stdout.write('%-7s %8.1f ms/hash %8.1f logins/s/core  current %-28s suggested %s' % (
+                policy, ms, 1000 / ms, self.cost(policy, hasher), self.suggest(policy, hasher, ms, options['target_ms'])))
+
+    @staticmethod
+    def cost(policy, hasher):
+        if policy == 'pbkdf2':
+            return 'iterations=%d' % hasher.iterations
+        if policy == 'scrypt':
+            return 'work_factor=%d' % hasher.work_factor
+        return 'time_cost=%d memory_cost=%d' % (hasher.time_cost, hasher.memory_cost)
+
+    @staticmethod
+    def suggest(policy, hasher, ms, target_ms):
+        scale = target_ms / ms
+        if policy == 'pbkdf2':
+            return 'PASSWORD_PBKDF2_ITERATIONS=%d' % max(int(hasher.iterations * scale // 1000 * 1000), 1000)
+        if policy == 'scrypt':
+            # The work factor has to be a power of two.
+            return 'PASSWORD_SCRYPT_WORK_FACTOR=%d' % 2 ** max(int(math.log2(hasher.work_factor * scale)), 1)
+        return 'PASSWORD_ARGON2_TIME_COST=%d' % max(int(round(hasher.time_cost * scale)), 1)
@@ -0,0 +1,53 @@
+import time
+from django.contrib.auth.models import Permission, User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from app.libraries.fast_serializer import FastSerializer
+from app.models.system.group import GroupExtended
+from app.serializers.system.group_serializer import GroupSerializer
+from app.serializers.system.permission_serializer import PermissionSerializer
+from app.serializers.system.user_serializer import UserSerializer
+
+
+class Command(BaseCommand):
+    """
+    Compares the rows/second of the DRF serializers of the list endpoints with the
+    `FastSerializer` compiled from them, on rows built in memory (no queries).
+
+    Example:
+        python manage.py bench_serializers --rows 50000 --fields id,username,is_active
+    """
+    help = 'Benchmark list serialization: DRF serializers vs FastSerializer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--fields', default='', help='Comma separated sparse fieldset, as in ?fields=.')
+
+    def handle(self, *args, **options):
+        count = options['rows']
+        fields = [name for name in options['fields'].split(',') if name]
+        now = timezone.now()
+
+        samples = [
+            (UserSerializer, [User(id=i, username='user%d' % i, email='user%d@example.com' % i, first_name='First',
+                                   last_name='Last', is_active=bool(i % 2), date_joined=now, last_login=now if i % 3 else None)
+                              for i in range(count)]),
+            (GroupSerializer, [GroupExtended(id=i, name='group%d' % i, codename='group%d' % i, description='Description',
+                                             created_at=now, updated_at=now) for i in range(count)]),
+            (PermissionSerializer, [Permission(id=i, name='Can do %d' % i, codename='do_%d' % i) for i in range(count)]),
+        ]
+
+        for serializer_class, instances in samples:
+            context = {'fields': [name for name in fields if name in serializer_class.Meta.fields]}
+            fast = FastSerializer.compile(serializer_class(context=context))
+            rows = [{column: getattr(instance, column) for column in fast.columns} for instance in instances]
+
+            results = [
+                ('%s' % serializer_class.__name__, lambda: serializer_class(instances, many=True, context=context).data),
+                ('FastSerializer', lambda: fast.represent(rows)),
+            ]
+            for label, serialize in results:
+                started = time.perf_counter()
+                serialize()
+                elapsed = time.perf_counter() - started
+                self.stdout.write('%-22s %10.0f rows/s  (%d rows in %.3fs)' % (label, count / elapsed, count, elapsed))
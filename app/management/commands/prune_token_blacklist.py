@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    """
+    Deletes expired OutstandingToken rows and their BlacklistedToken rows in small
+    batches, so the tables stay proportional to the refresh token lifetime without
+    holding long locks.
+
+    Example:
+        python manage.py prune_token_blacklist --batch-size 5000 --sleep 0.1
+    """
+    help = 'Delete expired outstanding and blacklisted refresh tokens in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to wait between batches.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('pk')
+        total = 0
+
+        while True:
+            ids = list(expired.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                OutstandingToken.objects.filter(pk__in=ids).delete()
+
+            total += len(ids)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write('Deleted %d expired tokens.' % total)
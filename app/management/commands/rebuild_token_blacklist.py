@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from app.libraries.token_blacklist import TokenBlacklist
+
+
+class Command(BaseCommand):
+    """
+    Builds the bloom filter of the blacklisted refresh tokens and publishes it to
+    every process through TOKEN_BLACKLIST_CACHE_ALIAS, off the request path. Run it
+    every TOKEN_BLACKLIST_BLOOM_REFRESH seconds: until a filter is published, and
+    once it is older than twice that, blacklist checks read the database.
+
+    Example:
+        python manage.py rebuild_token_blacklist
+    """
+    help = 'Publish the bloom filter of blacklisted refresh tokens to the shared cache.'
+
+    def handle(self, *args, **options):
+        if not TokenBlacklist.is_shared():
+            self.stdout.write(self.style.WARNING(
+                'TOKEN_BLACKLIST_CACHE_ALIAS is process-local, blacklist checks read the database.'))
+            return
+
+        bloom = TokenBlacklist.publish()
+        self.stdout.write('Published a bloom filter of %d bytes.' % len(bloom.bits))
@@ -0,0 +1,36 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from app.services.emails.email_queue import EmailQueue
+
+
+class Command(BaseCommand):
+    """
+    Delivers the emails queued in the outbox in batches over one connection per batch.
+
+    Example:
+        python manage.py send_queued_emails            # drain the outbox and exit
+        python manage.py send_queued_emails --loop     # keep polling, for a worker process
+    """
+    help = 'Send the emails queued in the outbox.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new emails.')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to wait when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+
+        while True:
+            sent, failed = EmailQueue.send_pending(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+
+            if sent or failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write('Sent %d emails, %d failed.' % (total_sent, total_failed))
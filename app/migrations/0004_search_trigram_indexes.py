@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# Expression indexes matching the SQL Django emits for `icontains` on PostgreSQL,
+# UPPER("column"::text) LIKE UPPER(%s), so RankedSearchFilter never scans the table.
+TRIGRAM_INDEXES = [
+    ('auth_user_first_name_trgm', 'auth_user', 'first_name'),
+    ('auth_user_last_name_trgm', 'auth_user', 'last_name'),
+    ('auth_user_username_trgm', 'auth_user', 'username'),
+    ('auth_user_email_trgm', 'auth_user', 'email'),
+    ('auth_group_name_trgm', 'auth_group', 'name'),
+    ('auth_group_extended_description_trgm', 'auth_group_extended', 'description'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS %s ON %s USING gin ((UPPER(%s::text)) gin_trgm_ops)' % (
+                schema_editor.quote_name(name), schema_editor.quote_name(table), schema_editor.quote_name(column)))
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute('DROP INDEX CONCURRENTLY IF EXISTS %s' % schema_editor.quote_name(name))
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('app', '0003_groupextended_created_at_groupextended_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+# (name, table, columns) for the filters exposed by UserPagination, GroupPagination and
+# PermissionPagination and for the orderings used by keyset pagination.
+INDEXES = [
+    ('auth_user_email_idx', 'auth_user', ['email']),
+    ('auth_user_first_name_idx', 'auth_user', ['first_name']),
+    ('auth_user_last_name_first_name_idx', 'auth_user', ['last_name', 'first_name']),
+    ('auth_user_date_joined_id_idx', 'auth_user', ['date_joined', 'id']),
+    ('auth_user_is_active_date_joined_id_idx', 'auth_user', ['is_active', 'date_joined', 'id']),
+    ('auth_permission_name_idx', 'auth_permission', ['name']),
+    ('auth_group_extended_created_at_idx', 'auth_group_extended', ['created_at', 'group_ptr_id']),
+]
+
+# Inactive users are a small fraction of the table, a partial index keeps `is_active=False`
+# selective enough for the planner where a plain boolean index would be ignored.
+INACTIVE_INDEX = 'auth_user_inactive_date_joined_id_idx'
+
+# Case-insensitive email lookups (LoginSerializer uses `email__iexact`). The expression
+# has to match the SQL Django emits for `iexact` on each backend.
+EMAIL_UPPER_INDEX = 'auth_user_email_upper_idx'
+EMAIL_UPPER_EXPRESSIONS = {
+    'postgresql': 'UPPER("email"::text)',
+    'sqlite': '"email" COLLATE NOCASE',
+}
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    concurrently = 'CONCURRENTLY ' if vendor == 'postgresql' else ''
+    quote = schema_editor.quote_name
+
+    for name, table, columns in INDEXES:
+        schema_editor.execute('CREATE INDEX %sIF NOT EXISTS %s ON %s (%s)' % (
+            concurrently, quote(name), quote(table), ', '.join(quote(column) for column in columns)))
+
+    schema_editor.execute('CREATE INDEX %sIF NOT EXISTS %s ON %s (%s, %s) WHERE NOT %s' % (
+        concurrently, quote(INACTIVE_INDEX), quote('auth_user'), quote('date_joined'), quote('id'), quote('is_active')))
+
+    expression = EMAIL_UPPER_EXPRESSIONS.get(vendor)
+    if expression:
+        # PostgreSQL needs extra parentheses around an expression, SQLite rejects them around a collation.
+        if vendor == 'postgresql':
+            expression = '(%s)' % expression
+        schema_editor.execute('CREATE INDEX %sIF NOT EXISTS %s ON %s (%s)' % (
+            concurrently, quote(EMAIL_UPPER_INDEX), quote('auth_user'), expression))
+
+
+def drop_indexes(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name in [EMAIL_UPPER_INDEX, INACTIVE_INDEX] + [name for name, table, columns in INDEXES]:
+        schema_editor.execute('DROP INDEX %sIF EXISTS %s' % (concurrently, schema_editor.quote_name(name)))
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('app', '0004_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.2 on 2026-10-18 09:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def create_user_versions(apps, schema_editor):
+    # Every existing user starts at version 1.
+    User = apps.get_model('auth', 'User')
+    UserVersion = apps.get_model('app', 'UserVersion')
+    now = django.utils.timezone.now()
+    batch = []
+    for user_id in User.objects.using(schema_editor.connection.alias).values_list('pk', flat=True).iterator(chunk_size=2000):
+        batch.append(UserVersion(user_id=user_id, updated_at=now))
+        if len(batch) >= 2000:
+            UserVersion.objects.using(schema_editor.connection.alias).bulk_create(batch)
+            batch = []
+    UserVersion.objects.using(schema_editor.connection.alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('app', '0006_outboxemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Revision',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('value', models.PositiveBigIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'app_revision',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='version', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.PositiveBigIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'app_user_version',
+            },
+        ),
+        migrations.RunPython(create_user_versions, migrations.RunPython.noop),
+    ]
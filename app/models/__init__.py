@@ -0,0 +1,2 @@
+from app.models.system.group import GroupExtended
+from app.models.system.email_outbox import OutboxEmail
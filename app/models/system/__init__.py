@@ -0,0 +1,2 @@
+from app.models.system.user_version import UserVersion
+from app.models.system.revision import Revision
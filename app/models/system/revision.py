@@ -0,0 +1,31 @@
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class Revision(models.Model):
+    """
+    Revision counter of a whole table whose rows have no modification timestamp,
+    e.g. `auth_permission`. Bumped by signals on every change of the table.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'app_revision'
+
+    @classmethod
+    def bump(cls, name, using=None):
+        manager = cls.objects.db_manager(using)
+        now = timezone.now()
+        if not manager.filter(name=name).update(value=F('value') + 1, updated_at=now):
+            manager.bulk_create([cls(name=name, updated_at=now)], ignore_conflicts=True)
+
+    @classmethod
+    def get(cls, name, using=None):
+        """
+        Returns:
+            tuple: (value, updated_at), (0, None) when the table never changed.
+        """
+        return cls.objects.db_manager(using).filter(name=name).values_list('value', 'updated_at').first() or (0, None)
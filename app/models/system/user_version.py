@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+from app.models.system.revision import Revision
+import app.config.constants as constants
+
+
+class UserVersion(models.Model):
+    """
+    Row version of a user, for the conditional GETs of the user detail endpoint.
+
+    `auth_user` has no column that changes on every write, so this companion row is
+    bumped on `post_save` and by `touch()` after the bulk updates that send no
+    signals. `last_login`, which the login writes with a plain UPDATE, is read from
+    `auth_user` itself.
+
+    Both also bump the USER_REVISION generation of the whole table, which the user
+    lists validate against instead of aggregating every row. The login does not, so
+    a list revalidated after a login may still show the previous `last_login`.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='version')
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'app_user_version'
+
+    @classmethod
+    def created(cls, user_ids):
+        """
+        Creates the version rows of new users.
+        """
+        cls.objects.bulk_create([cls(user_id=user_id) for user_id in user_ids], ignore_conflicts=True)
+        Revision.bump(constants.USER_REVISION)
+
+    @classmethod
+    def touch(cls, user_ids):
+        """
+        Bumps the version of `user_ids`, creating the rows that do not exist yet.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+
+        now = timezone.now()
+        updated = cls.objects.filter(user_id__in=user_ids).update(version=F('version') + 1, updated_at=now)
+        if updated < len(user_ids):
+            missing = user_ids - set(cls.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+            cls.objects.bulk_create([cls(user_id=user_id, updated_at=now) for user_id in missing], ignore_conflicts=True)
+        Revision.bump(constants.USER_REVISION)
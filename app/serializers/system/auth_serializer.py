@@ -1,35 +1,84 @@
 from django.contrib.auth.models import User
-from django.contrib.auth.models import update_last_login
+from django.utils import timezone
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from app.libraries.hashing_pool import hashing_pool
+from app.libraries.tokens import ClaimsRefreshToken
 
 
 class LoginSerializer(serializers.Serializer):
+    """
+    Validates the credentials and returns a token pair.
+
+    A login costs one indexed SELECT of the columns it needs, the password check on
+    the hashing pool, and one UPDATE that sets last_login (and the upgraded password
+    hash, if any) without the full save() and its signals. The OutstandingToken row
+    is inserted by ClaimsRefreshToken.for_user, see JWT_OUTSTANDING_TOKEN_MODE.
+
+    The user table generation is not bumped: the ETags of the user lists do not cover
+    last_login, so logins neither contend on that row nor invalidate the lists.
+    """
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
+    login_fields = ('id', 'password', 'username', 'first_name', 'last_name', 'email',
+                    'is_active', 'is_staff', 'is_superuser')
+
     def validate(self, attrs):
-        user = User.objects.filter(email=attrs['email']).first()
-
-        if user and user.check_password(attrs['password']):
-            refresh = RefreshToken.for_user(user)
-
-            data = {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-                'user_data': {
-                    'first_name': user.first_name,
-                    'last_name': user.last_name,
-                    'email': user.email,
+        user = User.objects.only(*self.login_fields).filter(email__iexact=attrs['email']).first()
+
+        if user:
+            valid, rehashed = hashing_pool.check_password(attrs['password'], user.password)
+
+            if valid:
+                changes = {'last_login': timezone.now()}
+                if rehashed:
+                    changes['password'] = rehashed
+                User.objects.filter(pk=user.pk).update(**changes)
+                for field, value in changes.items():
+                    setattr(user, field, value)
+
+                refresh = ClaimsRefreshToken.for_user(user)
+
+                return {
+                    'refresh': str(refresh),
+                    'access': str(refresh.access_token),
+                    'user_data': {
+                        'first_name': user.first_name,
+                        'last_name': user.last_name,
+                        'email': user.email,
+                    }
                 }
-            }
-
-            update_last_login(None, user)
-            return data
 
         raise serializers.ValidationError('Invalid credentials')
 
 
+class RefreshTokenSerializer(TokenRefreshSerializer):
+    """
+    Refreshes an access token and re-reads the user claims (is_active, is_staff,
+    permission digest) from the database, so they are never older than one access
+    token lifetime even though refresh tokens live much longer.
+    """
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        access = AccessToken(data['access'], verify=False)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}).first()
+
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        ClaimsRefreshToken.set_user_claims(access, user)
+        access.set_iat()
+        data['access'] = str(access)
+        return data
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -38,11 +87,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ['username', 'email', 'password']
 
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password']
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data['email']),
+            password=hashing_pool.make_password(validated_data['password']),
         )
+        user.save()
         return user
 
 
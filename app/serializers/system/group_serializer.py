@@ -1,8 +1,92 @@
 from rest_framework import serializers
+from django.contrib.auth.models import Group, Permission
+from django.db.models import Q
 from app.models.system.group import GroupExtended
+from app.libraries.dynamic_fields import DynamicFieldsSerializerMixin
+from app.serializers.system.permission_serializer import PermissionSerializer
+import app.config.constants as constants
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'permissions': (PermissionSerializer, 'permissions'),
+    }
+
     class Meta:
         model = GroupExtended
         fields = ['id', 'name', 'description', 'codename', 'created_at', 'updated_at']
+
+
+class GroupSummarySerializer(serializers.ModelSerializer):
+    """
+    The id and name of a group, used when groups are nested in other resources.
+    """
+
+    class Meta:
+        model = Group
+        fields = ['id', 'name']
+
+
+class GroupPermissionsSerializer(serializers.Serializer):
+    """
+    Permissions to add to, remove from or replace on a group, given by id and/or by
+    codename ("app_label.codename", or a bare codename when it is unambiguous).
+
+    Every id and codename is resolved with one query. Unknown ones are reported per
+    index and nothing is applied.
+    """
+    MODES = ('add', 'remove', 'replace')
+
+    permissions = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list,
+                                        max_length=constants.BULK_MAX_SIZE)
+    codenames = serializers.ListField(child=serializers.CharField(max_length=255), required=False, default=list,
+                                      max_length=constants.BULK_MAX_SIZE)
+    mode = serializers.ChoiceField(choices=MODES, default='add')
+
+    def validate(self, attrs):
+        ids = attrs['permissions']
+        codenames = attrs['codenames']
+
+        if not ids and not codenames and attrs['mode'] != 'replace':
+            raise serializers.ValidationError('Provide `permissions` or `codenames`.')
+
+        bare = {codename.rpartition('.')[2] for codename in codenames}
+        rows = Permission.objects.filter(Q(pk__in=ids) | Q(codename__in=bare)).values_list(
+            'pk', 'codename', 'content_type__app_label') if ids or bare else []
+
+        known_ids = set()
+        by_name = {}
+        by_codename = {}
+        for pk, codename, app_label in rows:
+            known_ids.add(pk)
+            by_name['%s.%s' % (app_label, codename)] = pk
+            by_codename.setdefault(codename, set()).add(pk)
+
+        errors = {}
+        resolved = set()
+
+        for index, pk in enumerate(ids):
+            if pk in known_ids:
+                resolved.add(pk)
+            else:
+                errors.setdefault('permissions', {})[index] = ['Permission %d does not exist.' % pk]
+
+        for index, codename in enumerate(codenames):
+            if '.' in codename:
+                matches = {by_name[codename]} if codename in by_name else set()
+            else:
+                matches = by_codename.get(codename, set())
+
+            if len(matches) == 1:
+                resolved |= matches
+            elif matches:
+                errors.setdefault('codenames', {})[index] = [
+                    'Codename "%s" is ambiguous, use "app_label.codename".' % codename]
+            else:
+                errors.setdefault('codenames', {})[index] = ['Permission "%s" does not exist.' % codename]
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        attrs['permission_ids'] = resolved
+        return attrs
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.models import Permission
+from app.libraries.dynamic_fields import DynamicFieldsSerializerMixin
 
-class PermissionSerializer(serializers.ModelSerializer):
+class PermissionSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Permission
         fields = ['id', 'name', 'codename']
\ No newline at end of file
@@ -1,12 +1,25 @@
 from rest_framework import serializers
-from django.contrib.auth.models import User
+from rest_framework.settings import api_settings
+from django.contrib.auth.models import Group, User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db.models.functions import Upper
+from app.libraries.dynamic_fields import DynamicFieldsSerializerMixin
+from app.libraries.hashing_pool import hashing_pool
+from app.serializers.system.group_serializer import GroupSummarySerializer
+from app.serializers.system.permission_serializer import PermissionSerializer
+import app.config.constants as constants
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
     first_name = serializers.CharField(required=True)
     email = serializers.EmailField(required=True)
     password = serializers.CharField(required=True, write_only=True)
 
+    expandable_fields = {
+        'groups': (GroupSummarySerializer, 'groups'),
+        'permissions': (PermissionSerializer, 'user_permissions'),
+    }
+
     class Meta:
         model = User
         fields = ['id', 'first_name', 'last_name', 'password',
@@ -14,3 +27,157 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'password': {'write_only': True},
         }
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that validates every item, then runs `validate_items` once for the
+    checks that need the whole batch (uniqueness, existence), so they cost one query
+    per batch instead of one per item.
+
+    Errors are reported per item, in the shape of DRF's ListSerializer errors:
+    `[{}, {"username": ["..."]}, ...]`.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ['Expected a list of items.']})
+        if not data:
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ['This list may not be empty.']})
+        if len(data) > constants.BULK_MAX_SIZE:
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ensure this list has at most %d items.' % constants.BULK_MAX_SIZE]})
+
+        items = []
+        errors = []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append(None)
+                errors.append(exc.detail)
+
+        self.validate_items(items, errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def validate_items(self, items, errors):
+        pass
+
+    @staticmethod
+    def add_error(errors, index, field, message):
+        errors[index].setdefault(field, []).append(message)
+
+    @classmethod
+    def check_unique(cls, items, errors, field, existing, message):
+        """
+        Flags the items whose `field` repeats an earlier item or is in `existing`.
+        """
+        seen = set()
+        for index, item in enumerate(items):
+            if item is None:
+                continue
+            value = item[field].lower()
+            if value in seen or value in existing:
+                cls.add_error(errors, index, field, message)
+            seen.add(value)
+
+
+class UserBulkCreateListSerializer(BulkListSerializer):
+    def validate_items(self, items, errors):
+        valid = [item for item in items if item is not None]
+        usernames = {item['username'] for item in valid}
+        emails = {item['email'] for item in valid}
+
+        existing_usernames = {username.lower() for username in
+                              User.objects.filter(username__in=usernames).values_list('username', flat=True)}
+        # Served by the UPPER(email) index of migration 0005.
+        existing_emails = {email.lower() for email in
+                           User.objects.alias(email_upper=Upper('email'))
+                           .filter(email_upper__in=[email.upper() for email in emails])
+                           .values_list('email', flat=True)}
+
+        self.check_unique(items, errors, 'username', existing_usernames, 'A user with that username already exists.')
+        self.check_unique(items, errors, 'email', existing_emails, 'A user with that email already exists.')
+
+    def create(self, validated_data):
+        passwords = hashing_pool.make_passwords([item.pop('password') for item in validated_data])
+        users = [
+            User(
+                username=User.normalize_username(item['username']),
+                email=User.objects.normalize_email(item['email']),
+                password=password,
+                first_name=item.get('first_name', ''),
+                last_name=item.get('last_name', ''),
+                is_active=item.get('is_active', True),
+            )
+            for item, password in zip(validated_data, passwords)
+        ]
+        return User.objects.bulk_create(users)
+
+
+class UserBulkCreateSerializer(serializers.ModelSerializer):
+    """
+    One item of a bulk user creation. Username and email uniqueness is checked for
+    the whole batch by `UserBulkCreateListSerializer`.
+    """
+    first_name = serializers.CharField(required=True)
+    email = serializers.EmailField(required=True)
+    password = serializers.CharField(required=True, write_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'first_name', 'last_name', 'password', 'username', 'email', 'is_active', 'date_joined']
+        read_only_fields = ['id', 'date_joined']
+        extra_kwargs = {
+            'username': {'validators': [UnicodeUsernameValidator()]},
+        }
+        list_serializer_class = UserBulkCreateListSerializer
+
+
+class UserBulkStatusSerializer(serializers.Serializer):
+    """
+    Ids of the users to enable or disable, checked to exist with one query.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False,
+                                max_length=constants.BULK_MAX_SIZE)
+
+    def validate_ids(self, ids):
+        existing = set(User.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        missing = {index: ['User %d does not exist.' % user_id] for index, user_id in enumerate(ids) if user_id not in existing}
+        if missing:
+            raise serializers.ValidationError(missing)
+        return list(dict.fromkeys(ids))
+
+
+class UserGroupsListSerializer(BulkListSerializer):
+    def validate_items(self, items, errors):
+        valid = [item for item in items if item is not None]
+        user_ids = {item['user'] for item in valid}
+        group_ids = {group_id for item in valid for group_id in item['groups']}
+
+        existing_users = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+        existing_groups = set(Group.objects.filter(pk__in=group_ids).values_list('pk', flat=True))
+
+        for index, item in enumerate(items):
+            if item is None:
+                continue
+            if item['user'] not in existing_users:
+                self.add_error(errors, index, 'user', 'User %d does not exist.' % item['user'])
+            for group_id in item['groups']:
+                if group_id not in existing_groups:
+                    self.add_error(errors, index, 'groups', 'Group %d does not exist.' % group_id)
+
+
+class UserGroupsItemSerializer(serializers.Serializer):
+    """
+    One item of a bulk group assignment: a user and the ids of its groups.
+    """
+    user = serializers.IntegerField(min_value=1)
+    groups = serializers.ListField(child=serializers.IntegerField(min_value=1))
+
+    class Meta:
+        list_serializer_class = UserGroupsListSerializer
@@ -1,10 +1,8 @@
-from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.sites.shortcuts import get_current_site
-from django.utils.http import urlsafe_base64_encode
-from django.template.loader import render_to_string
-from django.utils.encoding import force_bytes
-from app.config.constants as constants
+from app.services.emails.email_queue import EmailQueue
+from app.services.emails.email_renderer import EmailRenderer
+import app.config.constants as constants
 
 class ResetPasswordEmail:
     @staticmethod
@@ -15,11 +13,11 @@ class ResetPasswordEmail:
 
         mail_subject = 'Reset your password'
 
-        message = render_to_string('emails/reset_password_email.html', {
+        html, text = EmailRenderer.render('reset_password_email.html', {
             'user': user,
             'domain': current_site.domain,
             'uid': user.id,
             'token': token,
         })
 
-        send_mail(mail_subject, message, constants.EMAIL_DEFAULT, [user.email])
+        return EmailQueue.enqueue(mail_subject, text, constants.EMAIL_DEFAULT, [user.email], html_body=html)
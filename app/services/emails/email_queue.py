@@ -0,0 +1,109 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+from app.helpers.log_helper import log_helper
+from app.models.system.email_outbox import OutboxEmail
+
+
+class EmailQueue:
+    """
+    Durable outbox for transactional emails.
+
+    Request handlers call `enqueue`, which is a single INSERT, and the
+    `send_queued_emails` management command delivers due emails in batches over one
+    reused connection of the configured EMAIL_BACKEND, retrying failures with
+    exponential backoff.
+    """
+
+    @staticmethod
+    def enqueue(subject, body, from_email, to, html_body=''):
+        return OutboxEmail.objects.create(
+            subject=subject,
+            body=body,
+            html_body=html_body,
+            from_email=from_email,
+            to=list(to),
+        )
+
+    @classmethod
+    def claim(cls, batch_size):
+        """
+        Returns up to `batch_size` due emails and leases them to this worker for
+        EMAIL_OUTBOX_LEASE seconds, so concurrent workers skip them and a crashed
+        worker's batch is picked up again once the lease expires.
+        """
+        now = timezone.now()
+        using = router.db_for_write(OutboxEmail)
+        with transaction.atomic(using=using):
+            due = OutboxEmail.objects.using(using).filter(status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now).order_by('next_attempt_at', 'pk')
+            if connections[using].features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+
+            emails = list(due[:batch_size])
+            OutboxEmail.objects.using(using).filter(pk__in=[email.pk for email in emails]).update(
+                next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE))
+
+        return emails
+
+    @classmethod
+    def send_pending(cls, batch_size=100):
+        """
+        Sends one batch of due emails.
+
+        Returns:
+            tuple: (sent, failed) number of emails.
+        """
+        emails = cls.claim(batch_size)
+        if not emails:
+            return 0, 0
+
+        sent = []
+        failed = []
+        mail_connection = get_connection()
+
+        try:
+            mail_connection.open()
+            for email in emails:
+                try:
+                    mail_connection.send_messages([cls.build_message(email, mail_connection)])
+                    sent.append(email.pk)
+                except Exception as e:
+                    failed.append((email, e))
+        except Exception as e:
+            failed = [(email, e) for email in emails if email.pk not in sent]
+        finally:
+            mail_connection.close()
+
+        OutboxEmail.objects.filter(pk__in=sent).update(
+            status=OutboxEmail.STATUS_SENT, sent_at=timezone.now(), attempts=F('attempts') + 1, last_error='')
+
+        for email, error in failed:
+            cls.retry_later(email, error)
+
+        return len(sent), len(failed)
+
+    @staticmethod
+    def build_message(email, mail_connection):
+        message = EmailMultiAlternatives(email.subject, email.body, email.from_email, email.to, connection=mail_connection)
+        if email.html_body:
+            message.attach_alternative(email.html_body, 'text/html')
+        return message
+
+    @staticmethod
+    def retry_later(email, error):
+        attempts = email.attempts + 1
+        log_helper.warning('Email {} failed on attempt {}: {}', email.pk, attempts, error)
+
+        if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            status = OutboxEmail.STATUS_FAILED
+            next_attempt_at = email.next_attempt_at
+        else:
+            status = OutboxEmail.STATUS_PENDING
+            delay = min(settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), settings.EMAIL_OUTBOX_MAX_RETRY_DELAY)
+            next_attempt_at = timezone.now() + timedelta(seconds=delay)
+
+        OutboxEmail.objects.filter(pk=email.pk).update(
+            status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error)[:1000])
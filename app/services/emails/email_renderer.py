@@ -0,0 +1,154 @@
+import html as html_lib
+import os
+import re
+from django.conf import settings
+from django.template import TemplateDoesNotExist, engines
+from django.utils import translation
+
+HEAD_RE = re.compile(r'<(head|style|script)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+LINK_RE = re.compile(r'<a\b[^>]*href="([^"]*)"[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+BREAK_RE = re.compile(r'<br\s*/?>|</(?:p|div|li|tr|h\d)>', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]*>')
+
+
+class EmailRenderer:
+    """
+    Renders the email templates under `emails/` into an HTML body and a plain-text
+    alternative.
+
+    Compiled templates are kept per (template, locale) in process memory, so sending
+    an email only renders an already parsed template: the loaders, the filesystem and
+    the locale fallback are only hit the first time, or never when `warm()` has run at
+    startup (see `AppConfig.ready`).
+
+    A locale variant lives next to the base template, e.g. `emails/es/<name>.html`
+    overrides `emails/<name>.html` for "es" and "es-mx". Locale directories match
+    case-insensitively, `emails/pt-BR/` serves "pt-br". The text alternative is the
+    `.txt` template with the same name when one exists and otherwise derived from the
+    HTML.
+
+    Example:
+        html, text = EmailRenderer.render('reset_password_email.html', {'user': user}, locale='es')
+    """
+    directory = 'emails'
+    _templates = {}
+    _locale_directories = None
+
+    @staticmethod
+    def get_engine():
+        return engines['django']
+
+    @staticmethod
+    def get_locale(locale=None):
+        return (locale or translation.get_language() or settings.LANGUAGE_CODE).lower()
+
+    @classmethod
+    def candidates(cls, name, locale):
+        directories = cls.locale_directories()
+        language = locale.split('-')[0]
+        names = ['%s/%s/%s' % (cls.directory, directories.get(locale, locale), name)]
+        if language != locale:
+            names.append('%s/%s/%s' % (cls.directory, directories.get(language, language), name))
+        names.append('%s/%s' % (cls.directory, name))
+        return names
+
+    @classmethod
+    def load(cls, name, locale):
+        engine = cls.get_engine()
+        for template_name in cls.candidates(name, locale):
+            try:
+                return engine.get_template(template_name)
+            except TemplateDoesNotExist:
+                continue
+        return None
+
+    @classmethod
+    def get_templates(cls, name, locale=None):
+        """
+        Returns the compiled (html, text) templates of `name` for `locale`. `text` is
+        None when there is no `.txt` variant.
+        """
+        locale = cls.get_locale(locale)
+        key = (name, locale)
+        templates = cls._templates.get(key)
+
+        if templates is None:
+            html = cls.load(name, locale)
+            if html is None:
+                raise TemplateDoesNotExist('%s/%s' % (cls.directory, name))
+
+            text = cls.load('%s.txt' % os.path.splitext(name)[0], locale)
+            templates = cls._templates[key] = (html, text)
+
+        return templates
+
+    @classmethod
+    def render(cls, name, context, locale=None):
+        """
+        Returns:
+            tuple: (html, text) bodies of the email.
+        """
+        html_template, text_template = cls.get_templates(name, locale)
+        html = html_template.render(context)
+
+        if text_template is not None:
+            text = text_template.render(context)
+        else:
+            text = cls.html_to_text(html)
+
+        return html, text
+
+    @staticmethod
+    def html_to_text(html):
+        html = BREAK_RE.sub('\n', LINK_RE.sub(r'\2: \1', HEAD_RE.sub('', html)))
+        lines = (' '.join(line.split()) for line in html_lib.unescape(TAG_RE.sub('', html)).splitlines())
+        return '\n'.join(line for line in lines if line)
+
+    @classmethod
+    def template_dirs(cls):
+        for directory in cls.get_engine().template_dirs:
+            path = os.path.join(directory, cls.directory)
+            if os.path.isdir(path):
+                yield path
+
+    @classmethod
+    def template_names(cls):
+        """
+        Names of the `.html` templates directly under `emails/`.
+        """
+        return sorted({name for path in cls.template_dirs() for name in os.listdir(path) if name.endswith('.html')})
+
+    @classmethod
+    def locale_directories(cls):
+        """
+        Maps the lowercased locales to their directories under `emails/` as named on
+        disk, e.g. "pt-br" to "pt-BR".
+        """
+        if cls._locale_directories is None:
+            cls._locale_directories = {
+                name.lower(): name for path in cls.template_dirs() for name in os.listdir(path)
+                if os.path.isdir(os.path.join(path, name)) and not name.startswith('_')
+            }
+        return cls._locale_directories
+
+    @classmethod
+    def locales(cls):
+        """
+        LANGUAGE_CODE plus every locale that has its own directory under `emails/`.
+        """
+        return sorted({settings.LANGUAGE_CODE.lower(), *cls.locale_directories()})
+
+    @classmethod
+    def warm(cls, locales=None):
+        """
+        Compiles every email template for the given locales, by default `locales()`.
+        Other locales fall back to a compiled variant the first time they are used.
+        """
+        for name in cls.template_names():
+            for locale in locales or cls.locales():
+                cls.get_templates(name, locale)
+
+    @classmethod
+    def reset(cls):
+        cls._templates = {}
+        cls._locale_directories = None
@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from app.libraries.authentication import TokenRevocation
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    """
+    Access tokens carry `is_active`, so disabling a user (UserDisabled) has to revoke
+    the tokens already issued to it, and enabling it again lifts the revocation.
+    """
+    if not instance.is_active:
+        TokenRevocation.revoke([instance.pk])
+    elif not created:
+        TokenRevocation.restore([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    TokenRevocation.revoke([instance.pk])
@@ -0,0 +1,76 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.dispatch import receiver
+from app.libraries.permission_cache import PermissionCache
+
+# `pre_clear` is the only moment the rows about to be cleared can still be read, the
+# affected users are kept on the instance and invalidated once the clear is done.
+AFFECTED_USERS_ATTR = '_permission_cache_affected_users'
+
+
+def _invalidate(instance, action, affected_users):
+    if action == 'pre_clear':
+        setattr(instance, AFFECTED_USERS_ATTR, affected_users())
+    elif action == 'post_clear':
+        PermissionCache.invalidate(getattr(instance, AFFECTED_USERS_ATTR, []))
+    elif action in ('post_add', 'post_remove'):
+        PermissionCache.invalidate(affected_users())
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    user.groups.add/remove/set/clear() or group.user_set.add/remove/set/clear().
+    """
+    if not reverse:
+        _invalidate(instance, action, lambda: [instance.pk])
+    elif action == 'pre_clear':
+        _invalidate(instance, action, lambda: PermissionCache.group_members([instance.pk]))
+    else:
+        _invalidate(instance, action, lambda: pk_set or [])
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    user.user_permissions.add/remove/set/clear() or permission.user_set.add/remove/set/clear().
+    """
+    if not reverse:
+        _invalidate(instance, action, lambda: [instance.pk])
+    elif action == 'pre_clear':
+        _invalidate(instance, action, lambda: list(instance.user_set.values_list('pk', flat=True)))
+    else:
+        _invalidate(instance, action, lambda: pk_set or [])
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    group.permissions.add/remove/set/clear() or permission.group_set.add/remove/set/clear().
+    """
+    if not reverse:
+        _invalidate(instance, action, lambda: PermissionCache.group_members([instance.pk]))
+    elif action == 'pre_clear':
+        _invalidate(instance, action, lambda: PermissionCache.group_members(instance.group_set.values_list('pk', flat=True)))
+    else:
+        _invalidate(instance, action, lambda: PermissionCache.group_members(pk_set or []))
+
+
+@receiver(pre_delete)
+def group_or_permission_deleting(sender, instance, **kwargs):
+    """
+    Deleting a group (GroupExtended included) or a permission removes through rows
+    without m2m_changed, so the members are collected before the rows disappear.
+    """
+    if isinstance(instance, Group):
+        setattr(instance, AFFECTED_USERS_ATTR, PermissionCache.group_members([instance.pk]))
+    elif isinstance(instance, Permission):
+        users = set(instance.user_set.values_list('pk', flat=True))
+        users.update(PermissionCache.group_members(instance.group_set.values_list('pk', flat=True)))
+        setattr(instance, AFFECTED_USERS_ATTR, users)
+
+
+@receiver(post_delete)
+def group_or_permission_deleted(sender, instance, **kwargs):
+    if isinstance(instance, (Group, Permission)):
+        PermissionCache.invalidate(getattr(instance, AFFECTED_USERS_ATTR, []))
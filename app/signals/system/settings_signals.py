@@ -0,0 +1,36 @@
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from app.libraries.hashing_pool import hashing_pool
+from app.libraries.response_cache import ResponseCache
+from app.libraries.throttling import ThrottleStorage
+from app.services.emails.email_renderer import EmailRenderer
+
+
+@receiver(setting_changed)
+def reset_email_templates(sender, setting, **kwargs):
+    """
+    Drops the compiled email templates when the template settings change (tests).
+    """
+    if setting in ('TEMPLATES', 'LANGUAGES', 'LANGUAGE_CODE'):
+        EmailRenderer.reset()
+
+
+@receiver(setting_changed)
+def reset_hashing_pool(sender, setting, **kwargs):
+    """
+    Rebuilds the shared hashing pool when its settings change (tests).
+    """
+    if setting.startswith('PASSWORD_HASHING_'):
+        hashing_pool.reset()
+
+
+@receiver(setting_changed)
+def reset_throttle_storage(sender, setting, **kwargs):
+    if setting in ('THROTTLE_STORAGE', 'THROTTLE_CACHE_ALIAS'):
+        ThrottleStorage.reset()
+
+
+@receiver(setting_changed)
+def reset_response_cache(sender, setting, **kwargs):
+    if setting.startswith('RESPONSE_CACHE_'):
+        ResponseCache.reset()
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from app.models.system.revision import Revision
+from app.models.system.user_version import UserVersion
+import app.config.constants as constants
+
+
+@receiver(post_save, sender=User)
+def user_version_saved(sender, instance, created, raw, **kwargs):
+    """
+    Bumps the user's row version and the user table generation, which the
+    conditional GETs of the user endpoints read. Bulk writes call `UserVersion`
+    themselves.
+    """
+    if created:
+        UserVersion.created([instance.pk])
+    else:
+        UserVersion.touch([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, **kwargs):
+    Revision.bump(constants.USER_REVISION)
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def permission_changed(sender, **kwargs):
+    Revision.bump(constants.PERMISSION_REVISION)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def group_changed(sender, instance, **kwargs):
+    # Group and GroupExtended, which share the generation of the group catalog.
+    if isinstance(instance, Group):
+        Revision.bump(constants.GROUP_REVISION)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        Revision.bump(constants.GROUP_REVISION)
+
+
+@receiver(post_migrate)
+def permissions_migrated(sender, using, apps=None, **kwargs):
+    """
+    `migrate` creates permissions with `bulk_create`, which sends no post_save.
+    """
+    try:
+        apps.get_model('app', 'Revision')
+    except (AttributeError, LookupError):
+        # The table does not exist at the migrated state.
+        return
+    Revision.bump(constants.PERMISSION_REVISION, using=using)
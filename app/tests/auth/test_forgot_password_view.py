@@ -1,4 +1,5 @@
 from django.core import mail
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
@@ -11,15 +12,29 @@ class PasswordResetTest(APITestCase):
     def test_password_reset_email_sent(self):
         response = self.client.post(self.url, {'email': 'test@example.com'})
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        call_command('send_queued_emails', verbosity=0)
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].to, ['test@example.com'])
 
     def test_password_reset_email_user_not_exist(self):
         response = self.client.post(self.url, {'email': 'nonexistent@example.com'})
-        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.status_code, 200)
+        call_command('send_queued_emails', verbosity=0)
         self.assertEqual(len(mail.outbox), 0)
 
     def test_password_reset_email_user_is_inactive(self):
-        response = self.client.post(self.url, {'email': 'nonexistent@example.com'})
-        self.assertEqual(response.status_code, 400)
+        User.objects.create_user(username='inactive', email='inactive@example.com', is_active=False)
+        response = self.client.post(self.url, {'email': 'inactive@example.com'})
+        self.assertEqual(response.status_code, 200)
+        call_command('send_queued_emails', verbosity=0)
         self.assertEqual(len(mail.outbox), 0)
+
+    def test_known_and_unknown_emails_get_identical_responses(self):
+        known = self.client.post(self.url, {'email': 'test@example.com'})
+        unknown = self.client.post(self.url, {'email': 'nonexistent@example.com'})
+        self.assertEqual((known.status_code, known.content), (unknown.status_code, unknown.content))
+        self.assertEqual(known.json(), {'detail': 'Password reset email sent.'})
+
+    def test_invalid_email_is_rejected(self):
+        self.assertEqual(self.client.post(self.url, {'email': 'not-an-email'}).status_code, 400)
@@ -0,0 +1,126 @@
+import threading
+from unittest import mock
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.libraries.hashing_pool import HashingPool, HashingUnavailable
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=2000)
+class HashingPoolTests(TestCase):
+    def pool(self, **kwargs):
+        pool = HashingPool(**kwargs)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_thread_pool_hashes_and_checks(self):
+        pool = self.pool(mode='thread', workers=2)
+        encoded = pool.make_password('s3cret')
+
+        self.assertTrue(check_password('s3cret', encoded))
+        self.assertEqual(pool.check_password('s3cret', encoded), (True, None))
+        self.assertEqual(pool.check_password('wrong', encoded), (False, None))
+
+    def test_process_pool_hashes_and_checks(self):
+        pool = self.pool(mode='process', workers=1)
+        encoded = pool.make_password('s3cret')
+        self.assertEqual(pool.check_password('s3cret', encoded), (True, None))
+
+    def test_check_returns_upgraded_hash(self):
+        pool = self.pool(mode='thread', workers=1)
+        encoded = pool.make_password('s3cret')
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=3000):
+            valid, rehashed = pool.check_password('s3cret', encoded)
+
+        self.assertTrue(valid)
+        self.assertTrue(rehashed.startswith('pbkdf2_sha256$3000$'))
+
+    def test_saturated_pool_raises(self):
+        pool = self.pool(mode='thread', workers=1, queue_size=1, timeout=0.01, retry_after=3)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        pool.submit(release.wait)
+        pool.submit(release.wait)
+
+        with self.assertRaises(HashingUnavailable) as raised:
+            pool.make_password('s3cret')
+        self.assertEqual(raised.exception.wait, 3)
+
+        release.set()
+        self.assertTrue(check_password('s3cret', pool.make_password('s3cret')))
+
+    def test_bulk_hashing_leaves_workers_to_logins(self):
+        pool = self.pool(mode='thread', workers=4, queue_size=0, timeout=0.01)
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def make_password(password):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            # A login submitted meanwhile gets one of the free slots.
+            self.assertFalse(pool.check_password('x', encoded)[0])
+            with lock:
+                running[0] -= 1
+            return password
+
+        encoded = pool.make_password('s3cret')
+        with mock.patch('app.libraries.hashing_pool._make_password', make_password):
+            self.assertEqual(pool.make_passwords(['a', 'b', 'c', 'd', 'e']), ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(peak[0], 2)
+
+    def test_bulk_hashing_releases_slots_on_failure(self):
+        pool = self.pool(mode='thread', workers=2, queue_size=0, timeout=0.01, bulk_workers=2)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        pool.submit(release.wait)
+
+        started = threading.Event()
+
+        def make_password(password):
+            started.set()
+            release.wait()
+            return password
+
+        # The first job takes the last slot, the second one can not be submitted.
+        threading.Timer(0.2, release.set).start()
+        with mock.patch('app.libraries.hashing_pool._make_password', make_password), \
+                self.assertRaises(HashingUnavailable):
+            pool.make_passwords(['a', 'b', 'c'])
+
+        # Every slot was given back once the running jobs were drained.
+        self.assertTrue(started.is_set())
+        for _ in range(2):
+            self.assertTrue(pool.slots.acquire(timeout=1))
+        for _ in range(2):
+            self.assertTrue(pool.bulk_slots.acquire(timeout=1))
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=2000)
+class HashingPoolViewTests(APITestCase):
+    def test_saturated_login_returns_503_with_retry_after(self):
+        User.objects.create_user(username='john', email='john@example.com', password='s3cret-Passw0rd')
+
+        with mock.patch.object(HashingPool, 'submit', side_effect=HashingUnavailable(wait=2)):
+            response = self.client.post(reverse('login_token'), {'email': 'john@example.com', 'password': 's3cret-Passw0rd'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '2')
+
+    def test_register_and_reset_password_hash_through_the_pool(self):
+        response = self.client.post(reverse('register_user'), {'username': 'jane', 'email': 'jane@example.com', 'password': 'first-Passw0rd'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        user = User.objects.get(username='jane')
+        self.assertTrue(user.check_password('first-Passw0rd'))
+
+        self.client.force_authenticate(user)
+        response = self.client.post(reverse('reset_password'), {'password': 'second-Passw0rd', 'confirm_password': 'second-Passw0rd'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('second-Passw0rd'))
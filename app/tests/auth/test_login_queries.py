@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from app.libraries.token_blacklist import OutstandingTokenBuffer
+from app.libraries.tokens import ClaimsRefreshToken
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=2000)
+class LoginQueryTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='john', email='john@example.com', password='s3cret-Passw0rd')
+        self.url = reverse('login_token')
+        self.addCleanup(OutstandingTokenBuffer.flush)
+
+    def login(self, password='s3cret-Passw0rd'):
+        return self.client.post(self.url, {'email': 'JOHN@example.com', 'password': password}, format='json')
+
+    def test_login_queries(self):
+        # SELECT the user, UPDATE last_login, INSERT the outstanding token.
+        with self.assertNumQueries(3):
+            response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user_data']['email'], 'john@example.com')
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        self.assertEqual(OutstandingToken.objects.filter(user=self.user).count(), 1)
+
+    def test_failed_login_queries(self):
+        with self.assertNumQueries(1):
+            response = self.login('wrong')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+
+    def test_rehash_is_saved_with_last_login(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=3000), self.assertNumQueries(3):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$3000$'))
+        self.assertIsNotNone(self.user.last_login)
+
+    @override_settings(JWT_OUTSTANDING_TOKEN_MODE='deferred', JWT_OUTSTANDING_TOKEN_BATCH_SIZE=2,
+                       JWT_OUTSTANDING_TOKEN_FLUSH_INTERVAL=3600)
+    def test_deferred_outstanding_tokens(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+        self.assertEqual(OutstandingTokenBuffer.pending(), 1)
+
+        # The second login fills the batch and inserts both rows at once.
+        with self.assertNumQueries(3):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(OutstandingTokenBuffer.pending(), 0)
+        self.assertEqual(OutstandingToken.objects.filter(user=self.user).count(), 2)
+
+    @override_settings(JWT_OUTSTANDING_TOKEN_MODE='deferred', JWT_OUTSTANDING_TOKEN_FLUSH_INTERVAL=3600)
+    def test_buffered_token_can_be_blacklisted(self):
+        refresh = self.login().data['refresh']
+        response = self.client.post(reverse('refresh_token'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        token = ClaimsRefreshToken(refresh)
+        token.blacklist()
+        OutstandingTokenBuffer.flush()
+
+        response = self.client.post(reverse('refresh_token'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(OutstandingToken.objects.filter(jti=token['jti']).count(), 1)
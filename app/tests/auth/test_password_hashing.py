@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+def hashers(policy):
+    preferred = settings.PASSWORD_HASHER_POLICIES[policy]
+    return [preferred] + [hasher for hasher in settings.PASSWORD_HASHERS if hasher != preferred]
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=2000, PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10, PASSWORD_HASHERS=hashers('pbkdf2'))
+class PasswordHashingTests(APITestCase):
+    def login(self, password='s3cret-Passw0rd'):
+        return self.client.post(reverse('login_token'), {'email': 'john@example.com', 'password': password}, format='json')
+
+    def create_user(self):
+        return User.objects.create_user(username='john', email='john@example.com', password='s3cret-Passw0rd')
+
+    def test_cost_parameters_come_from_settings(self):
+        user = self.create_user()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+        with override_settings(PASSWORD_HASHERS=hashers('scrypt')):
+            self.assertTrue(make_password('password').startswith('scrypt$1024$'))
+
+    def test_login_upgrades_cost_parameters(self):
+        user = self.create_user()
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=3000):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$3000$'))
+
+    def test_login_upgrades_to_policy_hasher(self):
+        user = self.create_user()
+
+        with override_settings(PASSWORD_HASHERS=hashers('scrypt')):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        user.refresh_from_db()
+        self.assertEqual(identify_hasher(user.password).algorithm, 'scrypt')
+        self.assertEqual(get_hasher('scrypt').decode(user.password)['work_factor'], 2 ** 10)
+
+    def test_failed_login_keeps_stored_hash(self):
+        user = self.create_user()
+        password = user.password
+
+        with override_settings(PASSWORD_HASHERS=hashers('scrypt')):
+            self.assertEqual(self.login('wrong').status_code, status.HTTP_400_BAD_REQUEST)
+
+        user.refresh_from_db()
+        self.assertEqual(user.password, password)
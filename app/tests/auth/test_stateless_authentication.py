@@ -0,0 +1,156 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from django.contrib.auth.models import Permission, User
+from app.libraries.authentication import ClaimsUser, StatelessJWTAuthentication, TokenRevocation
+from app.libraries.permission_cache import PermissionCatalog
+from app.libraries.tokens import ClaimsRefreshToken
+from app.models.system.group import GroupExtended
+
+
+class StatelessAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        TokenRevocation._local.clear()
+        # As with a shared revocation cache (redis), the tests' locmem is process-local.
+        shared = mock.patch.object(TokenRevocation, 'is_shared', return_value=True)
+        shared.start()
+        self.addCleanup(shared.stop)
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpassword')
+        group = GroupExtended.objects.create(name='Editors', codename='editors', description='Editors')
+        group.permissions.add(Permission.objects.get(codename='add_user'))
+        self.user.groups.add(group)
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION='Bearer %s' % token)
+        return StatelessJWTAuthentication().authenticate(request)
+
+    def test_authenticate_without_user_query(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+
+        with self.assertNumQueries(0):
+            user, token = self.authenticate(access)
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertEqual(user.id, self.user.id)
+            self.assertEqual(user.username, 'testuser')
+            self.assertTrue(user.is_active)
+            self.assertTrue(user.is_authenticated)
+            self.assertFalse(user.is_staff)
+
+    def test_non_claim_attributes_load_the_row_once(self):
+        user, token = self.authenticate(ClaimsRefreshToken.for_user(self.user).access_token)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'test@example.com')
+            self.assertIsNotNone(user.date_joined)
+
+    def test_writes_are_forwarded_to_the_row(self):
+        user, token = self.authenticate(ClaimsRefreshToken.for_user(self.user).access_token)
+        user.first_name = 'Changed'
+        user.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Changed')
+
+    def test_permissions_from_cache(self):
+        user, token = self.authenticate(ClaimsRefreshToken.for_user(self.user).access_token)
+        self.assertTrue(user.has_perm('auth.add_user'))
+        self.assertFalse(user.has_perm('auth.delete_user'))
+
+    @override_settings(JWT_PERMISSION_DIGEST=True)
+    def test_permission_digest(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        self.assertIn('perms', access)
+
+        user, token = self.authenticate(access)
+        cache.clear()
+        self.assertTrue(user.has_perm('auth.add_user'))
+        self.assertFalse(user.has_perm('auth.delete_user'))
+
+    def test_unknown_permission_ids_do_not_reload_the_catalog(self):
+        permission = Permission.objects.get(codename='add_user')
+        PermissionCatalog.reload()
+
+        # A deleted permission: one revision lookup, no reload of the table.
+        with self.assertNumQueries(1):
+            self.assertEqual(PermissionCatalog.names([permission.id, 0]), {'auth.add_user'})
+
+        permission.codename = 'create_user'
+        permission.save()
+        with self.assertNumQueries(2):
+            self.assertEqual(PermissionCatalog.ids(['auth.create_user']), [permission.id])
+
+    def test_disabled_user_is_rejected(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        self.authenticate(access)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(access)
+
+    def test_revocation_is_checked_within_interval(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        self.authenticate(access)
+
+        # Another process revoked the user, this one notices once the interval expires.
+        TokenRevocation.get_cache().set(TokenRevocation.key(self.user.id), access['iat'] + 1)
+        self.authenticate(access)
+
+        with mock.patch('app.libraries.authentication.time.monotonic', return_value=10 ** 9):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(access)
+
+    def test_revocations_are_whole_seconds(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        TokenRevocation.revoke([self.user.id])
+        self.assertIsInstance(TokenRevocation.revoked_at(self.user.id), int)
+        # Issued within the second of the revocation, before it.
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(access)
+
+    def test_enabling_a_user_lifts_the_revocation(self):
+        self.user.is_active = False
+        self.user.save()
+        self.user.is_active = True
+        self.user.save()
+        # Issued within the second of the revocation, after it.
+        self.authenticate(ClaimsRefreshToken.for_user(self.user).access_token)
+
+    def test_process_local_revocations_check_the_user_row(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        with mock.patch.object(TokenRevocation, 'is_shared', return_value=False):
+            with self.assertNumQueries(1):
+                self.authenticate(access)
+
+            # Disabled by another process: nothing was revoked in this one.
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(access)
+
+    def test_refresh_updates_claims(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+
+        response = self.client.post(reverse('refresh_token'), {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user, token = self.authenticate(response.data['access'])
+        self.assertTrue(user.is_staff)
+
+    def test_refresh_rejects_inactive_user(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        response = self.client.post(reverse('refresh_token'), {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_api_request_with_token(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        response = self.client.get(reverse('user-detail', args=[self.user.id]), HTTP_AUTHORIZATION='Bearer %s' % access)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
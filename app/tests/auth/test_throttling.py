@@ -0,0 +1,119 @@
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from app.libraries.hashing_pool import HashingPool
+from app.libraries.throttling import CacheStorage, LocalMemoryStorage, LoginIPThrottle, ThrottleStorage
+
+
+def rates(**overrides):
+    return dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=dict(
+        settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **overrides))
+
+
+class SlidingWindowStorageTests(SimpleTestCase):
+    def test_local_memory_counters_roll_over(self):
+        storage = LocalMemoryStorage()
+        self.assertEqual(storage.hit('key', 60, 10), (1, 0))
+        self.assertEqual(storage.hit('key', 60, 20), (2, 0))
+        self.assertEqual(storage.hit('key', 60, 70), (1, 2))
+        self.assertEqual(storage.hit('key', 60, 200), (1, 0))
+
+    def test_local_memory_prunes_stale_counters(self):
+        storage = LocalMemoryStorage()
+        storage.max_keys = 2
+        storage.hit('old', 60, 0)
+        storage.hit('recent', 60, 100)
+        storage.hit('new', 60, 130)
+        self.assertEqual(set(storage.counters), {'recent', 'new'})
+
+    def test_cache_counters_roll_over(self):
+        cache.clear()
+        storage = CacheStorage('default')
+        self.assertEqual(storage.hit('key', 60, 10), (1, 0))
+        self.assertEqual(storage.hit('key', 60, 20), (2, 0))
+        self.assertEqual(storage.hit('key', 60, 70), (1, 2))
+
+
+@override_settings(THROTTLE_STORAGE='local', REST_FRAMEWORK=rates(login_ip='2/min'))
+class SlidingWindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        ThrottleStorage.reset()
+
+    def allow(self, now):
+        throttle = LoginIPThrottle()
+        throttle.timer = lambda: now
+        request = APIRequestFactory().post('/', REMOTE_ADDR='10.0.0.1')
+        return throttle.allow_request(request, None), throttle.wait()
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        self.assertEqual(self.allow(0), (True, 60))
+        self.assertEqual(self.allow(30), (True, 30))
+        self.assertEqual(self.allow(45), (False, 15))
+
+        # Half of the previous window (3 hits) still overlaps: 1 + 1.5 > 2.
+        self.assertFalse(self.allow(90)[0])
+        # A quarter of it overlaps: 2 + 0.75 > 2, but the next window starts clean.
+        self.assertFalse(self.allow(105)[0])
+        self.assertEqual(self.allow(185), (True, 55))
+
+
+@override_settings(THROTTLE_STORAGE='local', PASSWORD_PBKDF2_ITERATIONS=2000,
+                   REST_FRAMEWORK=rates(login_ip='5/min', login_email='2/min', password_reset_email='1/hour'))
+class AuthThrottleTests(APITestCase):
+    def setUp(self):
+        ThrottleStorage.reset()
+        User.objects.create_user(username='john', email='john@example.com', password='s3cret-Passw0rd')
+
+    def login(self, email, address='10.0.0.1', password='wrong'):
+        return self.client.post(reverse('login_token'), {'email': email, 'password': password}, format='json', REMOTE_ADDR=address)
+
+    def test_login_is_throttled_per_email_before_checking_the_password(self):
+        self.assertEqual(self.login('john@example.com').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.login('John@Example.com').status_code, status.HTTP_400_BAD_REQUEST)
+
+        with mock.patch.object(HashingPool, 'check_password') as check_password, self.assertNumQueries(0):
+            response = self.login('john@example.com')
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        check_password.assert_not_called()
+
+        self.assertEqual(self.login('jane@example.com').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_clients_failures_do_not_lock_the_owner_out(self):
+        for address in ('10.0.0.2', '10.0.0.2', '10.0.0.3', '10.0.0.3'):
+            self.login('john@example.com', address)
+        self.assertEqual(self.login('john@example.com', '10.0.0.2').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.login('john@example.com', password='s3cret-Passw0rd')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_is_throttled_per_ip(self):
+        for i in range(5):
+            self.assertEqual(self.login('user%d@example.com' % i).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self.login('other@example.com').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login('other@example.com', '10.0.0.2').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_spoofed_forwarded_for_does_not_reset_the_ip_bucket(self):
+        for i in range(5):
+            response = self.client.post(reverse('login_token'), {'email': 'user%d@example.com' % i, 'password': 'wrong'},
+                                        format='json', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='192.0.2.%d' % i)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(reverse('login_token'), {'email': 'other@example.com', 'password': 'wrong'},
+                                    format='json', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='192.0.2.99')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_forgot_password_is_throttled_per_email(self):
+        url = reverse('forgot_password')
+        self.assertEqual(self.client.post(url, {'email': 'john@example.com'}).status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.post(url, {'email': 'john@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
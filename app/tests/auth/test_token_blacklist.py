@@ -0,0 +1,109 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from django.contrib.auth.models import User
+from app.libraries.token_blacklist import BloomFilter, TokenBlacklist
+from app.libraries.tokens import ClaimsRefreshToken
+
+
+class BloomFilterTests(APITestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add('jti-%d' % i)
+
+        self.assertTrue(all('jti-%d' % i in bloom for i in range(1000)))
+        false_positives = sum('other-%d' % i in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TokenBlacklistTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        TokenBlacklist.reset()
+        self.addCleanup(TokenBlacklist.reset)
+        # As with a shared blacklist cache (redis), the tests' locmem is process-local.
+        shared = mock.patch.object(TokenBlacklist, 'is_shared', return_value=True)
+        shared.start()
+        self.addCleanup(shared.stop)
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+
+    def test_valid_token_lookup_skips_database(self):
+        refresh = str(ClaimsRefreshToken.for_user(self.user))
+        call_command('rebuild_token_blacklist', stdout=StringIO())
+        TokenBlacklist.reset()
+
+        with self.assertNumQueries(0):
+            ClaimsRefreshToken(refresh)
+
+    def test_blacklisted_token_is_rejected(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        TokenBlacklist.publish()
+        refresh.blacklist()
+
+        with self.assertRaises(TokenError):
+            ClaimsRefreshToken(str(refresh))
+
+    def test_blacklisted_by_another_process(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        TokenBlacklist.publish()
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=refresh['jti']))
+
+        # Not visible until the shared cache knows about it or the bloom filter is rebuilt.
+        ClaimsRefreshToken(str(refresh))
+        TokenBlacklist.publish()
+        with self.assertRaises(TokenError):
+            ClaimsRefreshToken(str(refresh))
+
+    def test_lookups_read_the_database_without_a_fresh_filter(self):
+        refresh = str(ClaimsRefreshToken.for_user(self.user))
+        # Nothing published: no bloom filter is built on the request.
+        with self.assertNumQueries(1):
+            ClaimsRefreshToken(refresh)
+
+        TokenBlacklist.publish()
+        TokenBlacklist.reset()
+        with mock.patch('app.libraries.token_blacklist.time.time', return_value=10 ** 10):
+            with self.assertNumQueries(1):
+                ClaimsRefreshToken(refresh)
+
+    def test_process_local_cache_reads_the_database(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        TokenBlacklist.publish()
+
+        with mock.patch.object(TokenBlacklist, 'is_shared', return_value=False):
+            # Blacklisted by another process, whose cache entry this one can not see.
+            BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=refresh['jti']))
+            with self.assertRaises(TokenError):
+                ClaimsRefreshToken(str(refresh))
+
+    def test_logout_blacklists_refresh_token(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(reverse('logout'), {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(reverse('refresh_token'), {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_prune_expired_tokens(self):
+        expired = ClaimsRefreshToken.for_user(self.user)
+        ClaimsRefreshToken.for_user(self.user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired['jti']).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        out = StringIO()
+        call_command('prune_token_blacklist', batch_size=1, stdout=out)
+
+        self.assertIn('Deleted 1 expired tokens.', out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
@@ -0,0 +1,89 @@
+import importlib.util
+import threading
+import time
+import unittest
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+HAS_PSYCOPG2 = importlib.util.find_spec('psycopg2') is not None
+
+
+class FakeConnection:
+    """
+    The part of a psycopg2 connection the pool uses.
+    """
+
+    def __init__(self):
+        from psycopg2 import extensions
+        self.closed = 0
+        self.autocommit = True
+        self.info = type('Info', (), {'transaction_status': extensions.TRANSACTION_STATUS_IDLE})()
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        pass
+
+
+@unittest.skipUnless(HAS_PSYCOPG2, 'psycopg2 is not installed')
+class ConnectionPoolTests(SimpleTestCase):
+    def make_pool(self, **options):
+        from app.libraries.pooled_postgresql.base import ConnectionPool
+        return ConnectionPool(FakeConnection, 'default', 'app', **options)
+
+    def test_returned_connections_are_reused(self):
+        pool = self.make_pool(min_size=1, max_size=2)
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual((pool.metrics()['created'], pool.metrics()['reused']), (1, 1))
+
+    def test_checkout_waits_for_a_free_connection(self):
+        pool = self.make_pool(min_size=1, max_size=1, timeout=1)
+        connection = pool.getconn()
+        threading.Timer(0.05, pool.putconn, [connection]).start()
+        self.assertIs(pool.getconn(), connection)
+        self.assertEqual(pool.metrics()['waits'], 1)
+
+    def test_checkout_times_out(self):
+        from psycopg2 import OperationalError
+        pool = self.make_pool(min_size=1, max_size=1, timeout=0.05)
+        pool.getconn()
+        with self.assertRaises(OperationalError):
+            pool.getconn()
+        self.assertEqual(pool.metrics()['timeouts'], 1)
+
+    def test_idle_and_closed_connections_are_replaced(self):
+        pool = self.make_pool(min_size=1, max_size=1, idle_timeout=0.01)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        time.sleep(0.02)
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+
+        replacement.closed = 1
+        pool.putconn(replacement)
+        self.assertFalse(pool.getconn().closed)
+        self.assertEqual(pool.metrics()['closed_idle'], 1)
+
+    def test_connections_opened_with_the_pool_expire(self):
+        pool = self.make_pool(min_size=1, max_size=1, idle_timeout=0.01)
+        time.sleep(0.02)
+        pool.getconn()
+        self.assertEqual((pool.metrics()['created'], pool.metrics()['closed_idle']), (2, 1))
+
+
+class DatabasePoolMetricsTests(APITestCase):
+    def test_staff_only(self):
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', is_staff=True))
+        response = self.client.get(reverse('database-pool-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'pools': []})
+
+        self.client.force_authenticate(user=User.objects.create_user(username='john'))
+        self.assertEqual(self.client.get(reverse('database-pool-metrics')).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from app.libraries.db_router import ReplicaPin, ReplicaRoutingMiddleware
+from app.libraries.permission_cache import PermissionCache, PermissionCatalog
+
+# A second connection to the test database, configured like the replicas DB_REPLICAS
+# adds. Registered on import since the test runner sets up the databases of the
+# collected tests before running them.
+if 'replica_1' not in connections:
+    connections.settings['replica_1'] = dict(
+        connections.settings['default'], TEST=dict(connections.settings['default']['TEST'], MIRROR='default'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaReadTests(TransactionTestCase):
+    """
+    Requests against a `replica_1` alias mirroring the test database, so the queries
+    routed to the replica run for real. Not a `TestCase`: reads inside its
+    transaction would all go to the primary.
+    """
+    databases = {'default', 'replica_1'}
+
+    def setUp(self):
+        ReplicaPin.get_cache().clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica_1']) as replica:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, primary, replica
+
+    def test_safe_requests_read_from_the_replica(self):
+        response, primary, replica = self.get(reverse('user-detail', args=[self.user.pk]))
+        self.assertEqual(response.data['username'], 'testuser')
+        self.assertEqual(len(primary), 0)
+        self.assertGreater(len(replica), 0)
+
+    def test_streamed_exports_read_from_the_replica(self):
+        with CaptureQueriesContext(connections['replica_1']) as replica:
+            response = self.client.get(reverse('user-list'), {'stream': 'ndjson'})
+            rows = b''.join(response.streaming_content).splitlines()
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(any('auth_user' in query['sql'] for query in replica))
+
+    def test_reads_after_a_write_use_the_primary(self):
+        user = User.objects.create_user(username='existinguser', password='existingpassword')
+        response = self.client.put(reverse('user-disabled', args=[user.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('db_primary', response.cookies)
+
+        # The client sends the cookie back and reads its write from the primary.
+        response, primary, replica = self.get(reverse('user-detail', args=[user.pk]))
+        self.assertFalse(response.data['is_active'])
+        self.assertGreater(len(primary), 0)
+        self.assertEqual(len(replica), 0)
+
+    def test_permissions_are_cached_from_the_primary(self):
+        def get_response(request):
+            PermissionCache.load(self.user.pk)
+            PermissionCatalog.reload()
+            return HttpResponse()
+
+        with CaptureQueriesContext(connections['replica_1']) as replica:
+            ReplicaRoutingMiddleware(get_response)(RequestFactory().get('/'))
+        self.assertEqual(len(replica), 0)
@@ -0,0 +1,84 @@
+import time
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from app.libraries.db_router import ReplicaPin, ReplicaRoutingMiddleware
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    """
+    Routing decisions only, no query runs against the replicas.
+    """
+
+    def setUp(self):
+        ReplicaPin.get_cache().clear()
+        self.factory = RequestFactory()
+
+    def handle(self, request, view=None):
+        """
+        Runs `view` (by default: one read) through the middleware and returns the
+        response and the databases the reads were routed to.
+        """
+        reads = []
+
+        def get_response(request):
+            if view is not None:
+                view(request)
+            reads.append(router.db_for_read(User))
+            return HttpResponse()
+
+        return ReplicaRoutingMiddleware(get_response)(request), reads
+
+    def test_reads_of_safe_requests_go_to_a_replica(self):
+        _, reads = self.handle(self.factory.get('/'))
+        self.assertIn(reads[0], REPLICAS)
+
+    def test_unsafe_requests_and_writes_use_the_primary(self):
+        _, reads = self.handle(self.factory.post('/'))
+        self.assertEqual(reads, ['default'])
+        self.assertEqual(router.db_for_write(User), 'default')
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(router.db_for_read(User), 'default')
+
+    def test_writes_pin_the_client(self):
+        user = User(pk=7, username='john')
+
+        def view(request):
+            request.user = user
+            router.db_for_write(User)
+
+        response, reads = self.handle(self.factory.get('/'), view)
+        self.assertEqual(reads, ['default'])
+        self.assertIn('db_primary', response.cookies)
+        self.assertTrue(ReplicaPin.user_pinned(user.pk))
+
+        # The browser sends the cookie back.
+        request = self.factory.get('/')
+        request.COOKIES['db_primary'] = response.cookies['db_primary'].value
+        self.assertEqual(self.handle(request)[1], ['default'])
+
+        # An API client authenticated as the same user.
+        def authenticate(request):
+            request.user = user
+        self.assertEqual(self.handle(self.factory.get('/'), authenticate)[1], ['default'])
+
+    def test_pins_expire(self):
+        request = self.factory.get('/')
+        request.COOKIES['db_primary'] = '%d' % (time.time() - 1)
+        request.user = AnonymousUser()
+        self.assertIn(self.handle(request)[1][0], REPLICAS)
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(router.allow_migrate('replica_1', 'app'))
+        self.assertTrue(router.allow_migrate('default', 'app'))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        response, reads = self.handle(self.factory.get('/'), lambda request: router.db_for_write(User))
+        self.assertEqual(reads, ['default'])
+        self.assertNotIn('db_primary', response.cookies)
@@ -0,0 +1,68 @@
+from io import StringIO
+from unittest import mock
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from app.models.system.email_outbox import OutboxEmail
+from app.services.emails.email_queue import EmailQueue
+
+
+class EmailQueueTests(TestCase):
+    def enqueue(self, count):
+        for i in range(count):
+            EmailQueue.enqueue('Subject %d' % i, 'Body %d' % i, 'admin@mywebsite.com', ['user%d@example.com' % i])
+
+    def test_enqueue_does_not_send(self):
+        self.enqueue(1)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.STATUS_PENDING)
+
+    def test_batch_is_sent_over_one_connection(self):
+        self.enqueue(5)
+
+        with mock.patch.object(EmailBackend, 'open', autospec=True, side_effect=EmailBackend.open) as opened:
+            sent, failed = EmailQueue.send_pending(batch_size=10)
+
+        self.assertEqual((sent, failed), (5, 0))
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(OutboxEmail.objects.filter(status=OutboxEmail.STATUS_SENT, attempts=1).count(), 5)
+
+    def test_command_drains_in_batches(self):
+        self.enqueue(5)
+        out = StringIO()
+        call_command('send_queued_emails', batch_size=2, stdout=out)
+        self.assertIn('Sent 5 emails, 0 failed.', out.getvalue())
+        self.assertEqual(len(mail.outbox), 5)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60)
+    def test_failures_are_retried_with_backoff(self):
+        self.enqueue(2)
+        first, second = OutboxEmail.objects.order_by('pk')
+        original_send = EmailBackend.send_messages
+
+        def flaky_send(backend, messages):
+            if messages[0].subject == first.subject:
+                raise ConnectionError('SMTP unavailable')
+            return original_send(backend, messages)
+
+        with mock.patch.object(EmailBackend, 'send_messages', autospec=True, side_effect=flaky_send):
+            self.assertEqual(EmailQueue.send_pending(), (1, 1))
+
+            first.refresh_from_db()
+            self.assertEqual(first.status, OutboxEmail.STATUS_PENDING)
+            self.assertEqual(first.attempts, 1)
+            self.assertIn('SMTP unavailable', first.last_error)
+            self.assertGreater(first.next_attempt_at, timezone.now())
+
+            # Not due yet.
+            self.assertEqual(EmailQueue.send_pending(), (0, 0))
+
+            OutboxEmail.objects.filter(pk=first.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(EmailQueue.send_pending(), (0, 1))
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, OutboxEmail.STATUS_FAILED)
+        self.assertEqual(first.attempts, 2)
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from app.services.emails.email_renderer import EmailRenderer
+
+
+class EmailRendererTests(TestCase):
+    context = {'user': User(id=7, username='john'), 'domain': 'example.com', 'uid': 7, 'token': 'abc-123'}
+
+    def setUp(self):
+        EmailRenderer.reset()
+        self.addCleanup(EmailRenderer.reset)
+
+    def test_renders_html_and_text_alternative(self):
+        html, text = EmailRenderer.render('reset_password_email.html', self.context)
+
+        self.assertIn('<a href="https://example.com/reset-password/7/abc-123">', html)
+        self.assertNotIn('<', text)
+        self.assertNotIn('font-family', text)
+        self.assertIn('Hola john,', text)
+        self.assertIn('https://example.com/reset-password/7/abc-123', text)
+
+    def test_templates_are_compiled_once_per_locale(self):
+        first = EmailRenderer.get_templates('reset_password_email.html', 'en-us')
+        self.assertIs(EmailRenderer.get_templates('reset_password_email.html', 'en-us'), first)
+        self.assertIsNot(EmailRenderer.get_templates('reset_password_email.html', 'es'), first)
+
+    def test_warm_compiles_every_email_template(self):
+        EmailRenderer.warm(['en-us'])
+        self.assertEqual(set(EmailRenderer._templates), {
+            ('forgot_password_email.html', 'en-us'),
+            ('reset_password_email.html', 'en-us'),
+        })
+
+    def test_locale_variant_and_text_template(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'emails', 'es'))
+            with open(os.path.join(directory, 'emails', 'es', 'reset_password_email.html'), 'w') as f:
+                f.write('<p>Hola {{ user.username }}</p>')
+            with open(os.path.join(directory, 'emails', 'es', 'reset_password_email.txt'), 'w') as f:
+                f.write('Hola {{ user.username }} ({{ token }})')
+
+            templates = [dict(settings.TEMPLATES[0], DIRS=[directory])]
+            with override_settings(TEMPLATES=templates):
+                self.assertEqual(EmailRenderer.render('reset_password_email.html', self.context, 'es-mx'),
+                                 ('<p>Hola john</p>', 'Hola john (abc-123)'))
+
+                html, _ = EmailRenderer.render('reset_password_email.html', self.context, 'en')
+                self.assertIn('<!DOCTYPE html>', html)
+
+    def test_locales_include_variant_directories(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'emails', 'pt-BR'))
+            templates = [dict(settings.TEMPLATES[0], DIRS=[directory])]
+            with override_settings(TEMPLATES=templates):
+                self.assertEqual(EmailRenderer.locales(), ['en-us', 'pt-br'])
+
+    def test_mixed_case_locale_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'emails', 'pt-BR'))
+            with open(os.path.join(directory, 'emails', 'pt-BR', 'reset_password_email.html'), 'w') as f:
+                f.write('<p>Olá {{ user.username }}</p>')
+
+            templates = [dict(settings.TEMPLATES[0], DIRS=[directory])]
+            with override_settings(TEMPLATES=templates):
+                html, text = EmailRenderer.render('reset_password_email.html', self.context, 'pt-BR')
+                self.assertEqual((html, text), ('<p>Olá john</p>', 'Olá john'))
+                self.assertIs(EmailRenderer.get_templates('reset_password_email.html', 'pt-br'),
+                              EmailRenderer.get_templates('reset_password_email.html', 'pt-BR'))
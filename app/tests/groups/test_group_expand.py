@@ -0,0 +1,49 @@
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.models.system.group import GroupExtended
+
+
+# Query counts of the uncached path, see test_response_cache for the cached one.
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class GroupExpandTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=User.objects.create_user(username='admin'))
+        self.permissions = list(Permission.objects.order_by('pk')[:2])
+
+    def add_groups(self, count):
+        start = GroupExtended.objects.count()
+        for i in range(start, start + count):
+            group = GroupExtended.objects.create(name='group%03d' % i, codename='group%03d' % i, description='')
+            group.permissions.add(*self.permissions)
+
+    def queries(self, params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('group-pagination'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(captured), response
+
+    def test_pagination_query_count_is_constant(self):
+        params = {'expand': 'permissions', 'page_size': 100, 'count': 'exact'}
+        self.add_groups(3)
+        small, response = self.queries(params)
+        self.assertEqual(response.data['results'][0]['permissions'],
+                         [{'id': p.pk, 'name': p.name, 'codename': p.codename} for p in self.permissions])
+
+        self.add_groups(40)
+        large, response = self.queries(params)
+        self.assertEqual(len(response.data['results']), 43)
+
+        # count, page, permissions prefetch.
+        self.assertEqual(small, 3)
+        self.assertEqual(large, small)
+
+    def test_unknown_relation_is_rejected(self):
+        response = self.client.get(reverse('group-pagination'), {'expand': 'users'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.libraries.permission_cache import PermissionCache
+from app.models.system.group import GroupExtended
+
+
+class GroupPermissionsViewTests(APITestCase):
+    def setUp(self):
+        self.group = GroupExtended.objects.create(name='editors', codename='editors', description='')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+        self.member.groups.add(self.group)
+        self.client.force_authenticate(user=self.member)
+        self.url = reverse('group-permissions', args=[self.group.pk])
+        self.ids = list(Permission.objects.order_by('pk').values_list('pk', flat=True))
+
+    def post(self, data):
+        return self.client.post(self.url, data, format='json')
+
+    def test_add_by_id_and_codename(self):
+        view_user = Permission.objects.get(codename='view_user', content_type__app_label='auth')
+        response = self.post({'permissions': self.ids[:2], 'codenames': ['auth.view_user']})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = sorted(self.ids[:2] + [view_user.pk])
+        self.assertEqual(response.data, {'added': expected, 'removed': [], 'permissions': expected})
+        self.assertEqual(sorted(self.group.permissions.values_list('pk', flat=True)), expected)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data, {'permissions': expected})
+
+    def test_query_count_does_not_grow_with_the_number_of_permissions(self):
+        def queries(ids):
+            self.group.permissions.clear()
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(self.post({'permissions': ids}).status_code, status.HTTP_200_OK)
+            return len(captured)
+
+        self.assertEqual(queries(self.ids[:2]), queries(self.ids[:30]))
+        self.assertEqual(self.group.permissions.count(), 30)
+
+    def test_invalid_ids_apply_nothing(self):
+        response = self.post({'permissions': [self.ids[0], 999999, self.ids[1]], 'codenames': ['auth.nope', 'view_user']})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data['permissions']), [1])
+        self.assertEqual(list(response.data['codenames']), [0])
+        self.assertFalse(self.group.permissions.exists())
+
+    def test_remove_and_replace(self):
+        self.group.permissions.add(*self.ids[:3])
+
+        response = self.post({'permissions': [self.ids[0], self.ids[5]], 'mode': 'remove'})
+        self.assertEqual(response.data['removed'], [self.ids[0]])
+        self.assertEqual(response.data['permissions'], self.ids[1:3])
+
+        response = self.post({'permissions': [self.ids[2], self.ids[4]], 'mode': 'replace'})
+        self.assertEqual(response.data, {'added': [self.ids[4]], 'removed': [self.ids[1]], 'permissions': [self.ids[2], self.ids[4]]})
+
+        response = self.post({'mode': 'replace'})
+        self.assertEqual(response.data['permissions'], [])
+        self.assertFalse(self.group.permissions.exists())
+
+    def test_changes_invalidate_member_permission_cache(self):
+        PermissionCache.get(self.member.pk)
+        self.post({'codenames': ['auth.view_user']})
+        self.assertEqual(PermissionCache.get(self.member.pk)['group'], {'auth.view_user'})
+
+    def test_unknown_group(self):
+        response = self.client.post(reverse('group-permissions', args=[999999]), {'permissions': self.ids[:1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,26 @@
+from django.test import TestCase
+from app.models.system.group import GroupExtended
+from app.tests.query_plan import QueryPlanTestMixin
+from app.views.system.groups_view import GroupPagination
+
+SEED_SIZE = 3000
+
+
+class GroupQueryPlanTests(QueryPlanTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(SEED_SIZE):
+            GroupExtended.objects.create(name='group%05d' % i, codename='group%05d' % i, description='Group %d' % i)
+        cls.analyze('auth_group', 'auth_group_extended')
+
+    def test_filterset_combinations_use_indexes(self):
+        values = {'name': 'group00042'}
+        self.assertEqual(set(values), set(GroupPagination.filterset_fields))
+
+        for filters in self.filter_combinations(values):
+            with self.subTest(filters=filters):
+                self.assertNoSequentialScan(GroupExtended.objects.filter(**filters)[:20], 'auth_group')
+
+    def test_keyset_ordering_uses_index(self):
+        queryset = GroupExtended.objects.order_by(*GroupPagination.cursor_ordering)
+        self.assertNoSequentialScan(queryset[:20], 'auth_group_extended')
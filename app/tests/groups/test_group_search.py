@@ -0,0 +1,24 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from app.models.system.group import GroupExtended
+
+
+class GroupSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        GroupExtended.objects.create(name='Admins', codename='admins', description='Full access to the site')
+        GroupExtended.objects.create(name='Editors', codename='editors', description='Can edit admin content')
+        GroupExtended.objects.create(name='Readers', codename='readers', description='Read only')
+        self.url = reverse('group-pagination')
+        self.client.force_authenticate(user=self.user)
+
+    def test_search_name_and_description(self):
+        response = self.client.get(self.url, {'q': 'admin'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in response.data['results']], ['Admins', 'Editors'])
+
+    def test_search_without_matches(self):
+        response = self.client.get(self.url, {'q': 'nothing'})
+        self.assertEqual(response.data['results'], [])
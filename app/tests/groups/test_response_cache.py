@@ -0,0 +1,101 @@
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.libraries.response_cache import ResponseCache
+from app.models.system.group import GroupExtended
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        ResponseCache.reset()
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.group = GroupExtended.objects.create(name='Editors', codename='editors', description='Edit content')
+        self.url = reverse('group-pagination')
+
+    def get(self, url, params=None, **headers):
+        response = self.client.get(url, params, **headers)
+        self.assertIn(response.status_code, (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED))
+        return response
+
+    def test_hit_after_miss(self):
+        first = self.get(self.url, {'page_size': 5, 'name': 'Editors'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        # Only the generations are read, the params are normalized.
+        with self.assertNumQueries(1):
+            second = self.get(self.url, {'name': 'Editors', 'page_size': 5})
+        self.assertEqual(second['X-Cache'], 'HIT-LOCAL')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_conditional_request_on_a_hit(self):
+        etag = self.get(self.url)['ETag']
+        response = self.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['X-Cache'], 'HIT-LOCAL')
+
+    def test_group_changes_bump_the_generation(self):
+        self.get(self.url)
+        self.group.name = 'Writers'
+        self.group.save()
+        response = self.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['name'], 'Writers')
+
+        self.get(self.url, {'expand': 'permissions'})
+        self.group.permissions.add(Permission.objects.first())
+        response = self.get(self.url, {'expand': 'permissions'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()['results'][0]['permissions']), 1)
+
+        self.group.delete()
+        self.assertEqual(self.get(self.url).json()['results'], [])
+
+    def test_permission_changes_bump_the_generation(self):
+        url = reverse('permission-list')
+        count = len(self.get(url).json())
+        self.assertEqual(self.get(url)['X-Cache'], 'HIT-LOCAL')
+
+        Permission.objects.create(name='Can export users', codename='export_user',
+                                  content_type=ContentType.objects.get_for_model(User))
+        response = self.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()), count + 1)
+
+    def test_streams_are_not_cached(self):
+        response = self.get(reverse('permission-list'), {'stream': 'ndjson'})
+        self.assertNotIn('X-Cache', response)
+
+    @override_settings(RESPONSE_CACHE_MAX_ENTRIES=2)
+    def test_local_tier_is_bounded(self):
+        for page_size in (1, 2, 3):
+            self.get(self.url, {'page_size': page_size})
+        self.assertEqual(self.get(self.url, {'page_size': 1})['X-Cache'], 'MISS')
+        self.assertEqual(self.get(self.url, {'page_size': 3})['X-Cache'], 'HIT-LOCAL')
+
+    @override_settings(RESPONSE_CACHE_ALIAS='default')
+    def test_shared_tier(self):
+        first = self.get(self.url)
+        ResponseCache.get_local().entries.clear()
+
+        response = self.get(self.url)
+        self.assertEqual(response['X-Cache'], 'HIT-SHARED')
+        self.assertEqual(response.json(), first.json())
+        self.assertEqual(self.get(self.url)['X-Cache'], 'HIT-LOCAL')
+
+    def test_metrics(self):
+        self.get(self.url)
+        self.get(self.url)
+        response = self.client.get(reverse('response-cache-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['misses'], response.data['local_hits'], response.data['hit_ratio']), (1, 1, 0.5))
+        self.assertIn('evictions', response.data['caches']['local'])
+
+        self.client.force_authenticate(user=User.objects.create_user(username='john', email='john@example.com'))
+        self.assertEqual(self.client.get(reverse('response-cache-metrics')).status_code, status.HTTP_403_FORBIDDEN)
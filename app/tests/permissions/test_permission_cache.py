@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth.models import Permission, User
+from app.models.system.group import GroupExtended
+
+
+class PermissionCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.group = GroupExtended.objects.create(name='Editors', codename='editors', description='Editors')
+        self.add_user = Permission.objects.get(codename='add_user')
+        self.change_user = Permission.objects.get(codename='change_user')
+        self.group.permissions.add(self.add_user)
+        self.user.groups.add(self.group)
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_permissions_are_cached_across_requests(self):
+        self.assertTrue(self.fresh_user().has_perm('auth.add_user'))
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm('auth.add_user'))
+            self.assertFalse(user.has_perm('auth.change_user'))
+            self.assertEqual(user.get_group_permissions(), {'auth.add_user'})
+
+    def test_group_permission_changes_invalidate_members(self):
+        self.assertFalse(self.fresh_user().has_perm('auth.change_user'))
+
+        self.group.permissions.add(self.change_user)
+        self.assertTrue(self.fresh_user().has_perm('auth.change_user'))
+
+        self.group.permissions.clear()
+        self.assertFalse(self.fresh_user().has_perm('auth.add_user'))
+
+    def test_reverse_permission_changes_invalidate_members(self):
+        self.fresh_user().has_perm('auth.add_user')
+
+        self.change_user.group_set.add(self.group)
+        self.assertTrue(self.fresh_user().has_perm('auth.change_user'))
+
+    def test_user_group_changes_invalidate_user(self):
+        self.assertTrue(self.fresh_user().has_perm('auth.add_user'))
+
+        self.user.groups.set([])
+        self.assertFalse(self.fresh_user().has_perm('auth.add_user'))
+
+        self.group.user_set.add(self.user)
+        self.assertTrue(self.fresh_user().has_perm('auth.add_user'))
+
+        self.group.user_set.clear()
+        self.assertFalse(self.fresh_user().has_perm('auth.add_user'))
+
+    def test_direct_permission_changes_invalidate_user(self):
+        self.assertFalse(self.fresh_user().has_perm('auth.change_user'))
+
+        self.user.user_permissions.add(self.change_user)
+        self.assertEqual(self.fresh_user().get_user_permissions(), {'auth.change_user'})
+
+    def test_group_delete_invalidates_members(self):
+        self.assertTrue(self.fresh_user().has_perm('auth.add_user'))
+
+        self.group.delete()
+        self.assertFalse(self.fresh_user().has_perm('auth.add_user'))
+
+    def test_permission_delete_invalidates_holders(self):
+        self.assertTrue(self.fresh_user().has_perm('auth.add_user'))
+
+        self.add_user.delete()
+        self.assertFalse(self.fresh_user().has_perm('auth.add_user'))
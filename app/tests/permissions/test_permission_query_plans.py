@@ -0,0 +1,26 @@
+from django.test import TestCase
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from app.tests.query_plan import QueryPlanTestMixin
+from app.views.system.permissions_view import PermissionPagination
+
+SEED_SIZE = 5000
+
+
+class PermissionQueryPlanTests(QueryPlanTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        content_type = ContentType.objects.get_for_model(Permission)
+        Permission.objects.bulk_create([
+            Permission(name='Can do thing %05d' % i, codename='do_thing_%05d' % i, content_type=content_type)
+            for i in range(SEED_SIZE)
+        ], batch_size=1000)
+        cls.analyze('auth_permission')
+
+    def test_filterset_combinations_use_indexes(self):
+        values = {'name': 'Can do thing 00042'}
+        self.assertEqual(set(values), set(PermissionPagination.filterset_fields))
+
+        for filters in self.filter_combinations(values):
+            with self.subTest(filters=filters):
+                self.assertNoSequentialScan(Permission.objects.filter(**filters)[:20], 'auth_permission')
@@ -0,0 +1,44 @@
+import re
+from itertools import combinations
+from django.db import connections
+
+SEQUENTIAL_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on "?(?P<table>\w+)"?'),
+    'sqlite': re.compile(r'\bSCAN "?(?P<table>\w+)"?\s*$', re.MULTILINE),
+}
+
+
+class QueryPlanTestMixin:
+    """
+    Assertions over the query plans of querysets, meant to be used on a seeded table
+    large enough for the planner to prefer an index when a usable one exists.
+    """
+
+    @staticmethod
+    def analyze(*tables, using='default'):
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute('ANALYZE %s' % connection.ops.quote_name(table))
+
+    @staticmethod
+    def filter_combinations(filters):
+        """
+        Yields every non empty combination of the given {lookup: value} filters.
+        """
+        items = sorted(filters.items())
+        for size in range(1, len(items) + 1):
+            for combination in combinations(items, size):
+                yield dict(combination)
+
+    def sequential_scans(self, queryset):
+        plan = queryset.explain()
+        pattern = SEQUENTIAL_SCAN_PATTERNS.get(connections[queryset.db].vendor)
+        if pattern is None:
+            self.skipTest('No sequential scan pattern for %s.' % connections[queryset.db].vendor)
+        return plan, [match.group('table') for match in pattern.finditer(plan)]
+
+    def assertNoSequentialScan(self, queryset, table):
+        plan, tables = self.sequential_scans(queryset)
+        if table in tables:
+            self.fail('Sequential scan on %s for:\n%s\n\nPlan:\n%s' % (table, queryset.query, plan))
@@ -0,0 +1,123 @@
+import threading
+import time
+from unittest import mock
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from app.libraries.cache_backends import LocalLRUCache, TwoLevelCache
+from app.libraries.stampede import SingleFlight, fetch
+
+
+class LocalLRUCacheTests(SimpleTestCase):
+    def make_cache(self, **options):
+        return LocalLRUCache('test-lru-%s' % id(self), {'OPTIONS': options})
+
+    def test_evicts_least_recently_used_entries_past_max_bytes(self):
+        cache = self.make_cache(MAX_BYTES=600, MAX_ENTRIES=100)
+        for index in range(3):
+            cache.set('key%d' % index, 'x' * 150)
+        cache.get('key0')
+        cache.set('key3', 'x' * 150)
+
+        self.assertIsNone(cache.get('key1'))
+        self.assertEqual(cache.get('key0'), 'x' * 150)
+        self.assertLessEqual(cache.stats()['bytes'], 600)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_values_larger_than_the_cache_are_not_stored(self):
+        cache = self.make_cache(MAX_BYTES=100)
+        cache.set('big', 'x' * 200)
+        self.assertIsNone(cache.get('big'))
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+    def test_expiry_add_and_incr(self):
+        cache = self.make_cache()
+        cache.set('gone', 1, 0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('gone'))
+
+        self.assertTrue(cache.add('counter', 1))
+        self.assertFalse(cache.add('counter', 5))
+        self.assertEqual(cache.incr('counter', 2), 3)
+        self.assertEqual(cache.get('counter'), 3)
+
+
+class TwoLevelCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = caches['two_level']
+        self.cache.clear()
+        self.local, self.shared = caches['local'], caches['shared']
+
+    def test_shared_hits_are_copied_to_the_local_tier(self):
+        self.shared.set('key', 'value')
+        self.assertIsNone(self.local.get('key'))
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.local.get('key'), 'value')
+
+    def test_writes_and_deletes_reach_both_tiers(self):
+        self.cache.set('key', 'value')
+        self.assertEqual((self.local.get('key'), self.shared.get('key')), ('value', 'value'))
+
+        self.cache.delete('key')
+        self.assertEqual((self.local.get('key'), self.shared.get('key')), (None, None))
+
+    def test_counters_live_in_the_shared_tier(self):
+        self.cache.set('counter', 1)
+        self.assertEqual(self.cache.incr('counter'), 2)
+        self.assertIsNone(self.local.get('counter'))
+        self.assertEqual(self.cache.get('counter'), 2)
+
+    def test_local_timeout_is_capped(self):
+        self.assertIsInstance(self.cache, TwoLevelCache)
+        self.assertEqual(self.cache.get_local_timeout(3600), self.cache.local_timeout)
+        self.assertEqual(self.cache.get_local_timeout(1), min(1, self.cache.local_timeout))
+
+
+class StampedeTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = caches['two_level']
+        self.cache.clear()
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return 42
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fetch(self.cache, 'key', compute, 60)))
+                   for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_fresh_values_are_not_recomputed(self):
+        self.assertEqual(fetch(self.cache, 'key', lambda: 1, 60), 1)
+        self.assertEqual(fetch(self.cache, 'key', lambda: 2, 60), 1)
+
+    def test_values_near_expiry_are_refreshed_early(self):
+        self.cache.set('key', (1, 1.0, time.time() + 1), 60)
+        # random() close to 1: the refresh is due well before the expiry.
+        with mock.patch('app.libraries.stampede.random.random', return_value=0.999):
+            self.assertEqual(fetch(self.cache, 'key', lambda: 2, 60), 2)
+
+    def test_stale_value_is_served_while_another_caller_refreshes(self):
+        self.cache.set('key', (1, 1.0, time.time() + 1), 60)
+        self.cache.add('key:lock', 1, 10)
+        with mock.patch('app.libraries.stampede.random.random', return_value=0.999):
+            self.assertEqual(fetch(self.cache, 'key', lambda: 2, 60), 1)
+
+    def test_single_flight_shares_exceptions(self):
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('key', mock.Mock(side_effect=ValueError))
+        self.assertEqual(flight.do('key', lambda: 1), 1)
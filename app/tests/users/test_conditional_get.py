@@ -0,0 +1,142 @@
+import datetime
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.libraries.count_strategy import CachedCount
+from app.models.system.group import GroupExtended
+from app.models.system.user_version import UserVersion
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', email='admin@example.com', first_name='Admin')
+        self.client.force_authenticate(user=self.user)
+        self.group = GroupExtended.objects.create(name='Editors', codename='editors', description='Edit content')
+
+    def assert_revalidates(self, url, params=None, queries=1):
+        """
+        Returns the ETag after checking a matching If-None-Match gets an empty 304
+        from the validators query alone (the generations, for cached catalogs).
+        """
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('no-cache', response['Cache-Control'])
+        etag = response['ETag']
+
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        return etag
+
+    def assert_changed(self, url, etag, params=None):
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_user_detail(self):
+        url = reverse('user-detail', args=[self.user.pk])
+        etag = self.assert_revalidates(url)
+
+        self.user.first_name = 'Changed'
+        self.user.save()
+        self.assert_changed(url, etag)
+
+    def test_user_last_login_and_bulk_updates(self):
+        url = reverse('user-pagination')
+        detail = reverse('user-detail', args=[self.user.pk])
+        self.user.set_password('s3cret-Passw0rd')
+        self.user.save()
+        etag = self.assert_revalidates(url)
+        detail_etag = self.assert_revalidates(detail)
+
+        # The login writes last_login with a plain UPDATE: the detail changes, the lists
+        # do not cover last_login and keep revalidating.
+        response = self.client.post(reverse('login_token'), {'email': self.user.email, 'password': 's3cret-Passw0rd'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_changed(detail, detail_etag)
+        self.assertEqual(self.assert_revalidates(url), etag)
+
+        self.client.put(reverse('user-bulk-disabled'), {'ids': [self.user.pk]}, format='json')
+        self.assert_changed(url, etag)
+
+    def test_user_list_rows_added_and_removed(self):
+        url = reverse('user-list')
+        etag = self.assert_revalidates(url, {'fields': 'id,username'})
+
+        other = User.objects.create_user(username='other', email='other@example.com')
+        self.assert_changed(url, etag, {'fields': 'id,username'})
+
+        etag = self.assert_revalidates(url, {'fields': 'id,username'})
+        other.delete()
+        self.assert_changed(url, etag, {'fields': 'id,username'})
+
+    def test_user_lists_revalidate_without_reading_the_user_table(self):
+        for name in ('user-pagination', 'user-list'):
+            with CaptureQueriesContext(connection) as queries:
+                self.assert_revalidates(reverse(name), {'is_active': True})
+            # The 304 costs one primary key lookup of the generation, whatever the size of auth_user.
+            validators = queries.captured_queries[-1]['sql']
+            self.assertIn('app_revision', validators)
+            self.assertNotIn('auth_user', validators)
+
+    def test_user_pagination_queries(self):
+        CachedCount.get_cache().clear()
+        User.objects.bulk_create([User(username='user%d' % i, email='user%d@example.com' % i) for i in range(30)])
+        # The generation and the page, the count comes from the cache after the first request.
+        self.client.get(reverse('user-pagination'), {'page': 1})
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('user-pagination'), {'page': 2})
+        self.assertEqual(len(response.data['results']), 11)
+
+    def test_query_string_is_part_of_the_etag(self):
+        url = reverse('user-pagination')
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url, {'fields': 'id'})['ETag'])
+
+    def test_if_modified_since(self):
+        url = reverse('user-detail', args=[self.user.pk])
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(last_modified, http_date(UserVersion.objects.get(user=self.user).updated_at.timestamp()))
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        UserVersion.objects.filter(user=self.user).update(updated_at=timezone.now() + datetime.timedelta(seconds=5))
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_expand_is_not_conditional(self):
+        response = self.client.get(reverse('user-pagination'), {'expand': 'groups'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
+
+    def test_missing_object_is_not_found(self):
+        response = self.client.get(reverse('user-detail', args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+    def test_groups(self):
+        detail = reverse('group-detail', args=[self.group.pk])
+        pagination = reverse('group-pagination')
+        etags = [self.assert_revalidates(detail), self.assert_revalidates(pagination)]
+
+        self.group.description = 'Changed'
+        self.group.save()
+        self.assert_changed(detail, etags[0])
+        self.assert_changed(pagination, etags[1])
+
+    def test_permissions(self):
+        pagination = reverse('permission-pagination')
+        detail = reverse('permission-detail', args=[Permission.objects.order_by('pk').first().pk])
+        etags = [self.assert_revalidates(pagination), self.assert_revalidates(detail)]
+
+        Permission.objects.create(name='Can export users', codename='export_user',
+                                  content_type=ContentType.objects.get_for_model(User))
+        self.assert_changed(pagination, etags[0])
+        self.assert_changed(detail, etags[1])
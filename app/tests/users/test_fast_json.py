@@ -0,0 +1,96 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from app.libraries import fast_json
+from app.libraries.fast_json import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    data = {
+        'aware': datetime.datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'offset': datetime.datetime(2024, 5, 1, 10, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+        'naive': datetime.datetime(2024, 5, 1, 10, 30),
+        'date': datetime.date(2024, 5, 1),
+        'time': datetime.time(10, 30),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'lazy': _('The server is busy, please retry later.'),
+        'decimal': decimal.Decimal('1.5'),
+        'duration': datetime.timedelta(minutes=1),
+        'text': 'ñandú\u2028\u2029"quoted"',
+        'nested': [{'id': 1, 'active': True, 'none': None}],
+        1: 'integer key',
+    }
+
+    def test_matches_drf_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indented_output_matches_drf_renderer(self):
+        media_type = 'application/json; indent=4'
+        self.assertEqual(FastJSONRenderer().render(self.data, media_type), JSONRenderer().render(self.data, media_type))
+
+    def test_fallback_without_orjson(self):
+        with mock.patch.object(fast_json, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+            self.assertEqual(json.loads(fast_json.dumps(self.data)), json.loads(JSONRenderer().render(self.data)))
+
+    def test_wide_integers_fall_back(self):
+        self.assertEqual(FastJSONRenderer().render({'big': 2 ** 70}), b'{"big":%d}' % 2 ** 70)
+
+    def test_floats_keep_their_value(self):
+        # orjson spells some floats differently from DRF, see FastJSONRenderer.
+        data = {'floats': [1e16, -1.5e-05, 0.00001, 1e-7, 1e100, 0.1 + 0.2, 1.0]}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+        self.assertEqual(FastJSONRenderer().render({'value': float('nan')}), b'{"value":null}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body, encoding='utf-8'):
+        return FastJSONParser().parse(io.BytesIO(body), parser_context={'encoding': encoding})
+
+    def test_matches_drf_parser(self):
+        body = '{"email": "ñandú@example.com", "ids": [1, 2], "active": true, "none": null}'.encode()
+        self.assertEqual(self.parse(body), JSONParser().parse(io.BytesIO(body)))
+
+    def test_wide_integers_match_drf_parser(self):
+        for body in (b'{"big": 18446744073709551616}', b'[-9223372036854775809, 1.5, 1e16]',
+                     b'{"id": 123456789012345678901234567890}'):
+            self.assertEqual(self.parse(body), JSONParser().parse(io.BytesIO(body)))
+        self.assertEqual(self.parse(b'{"big": 18446744073709551616}'), {'big': 2 ** 64})
+
+    def test_invalid_body_is_a_parse_error(self):
+        for body in (b'{"email": ', b'NaN', b'\xff'):
+            with self.assertRaises(ParseError):
+                self.parse(body)
+
+    def test_other_encodings_use_drf_parser(self):
+        self.assertEqual(self.parse('{"name": "ñ"}'.encode('latin-1'), 'latin-1'), {'name': 'ñ'})
+
+
+class FastJSONViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', email='admin@example.com', first_name='Ádmin')
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_and_stream_use_the_fast_renderer(self):
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(json.loads(response.content)[0]['first_name'], 'Ádmin')
+
+        response = self.client.get(reverse('user-list'), {'stream': 'json'})
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), json.loads(self.client.get(reverse('user-list')).content))
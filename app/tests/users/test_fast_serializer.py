@@ -0,0 +1,99 @@
+import datetime
+import json
+from django.contrib.auth.models import Permission, User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+from app.libraries.fast_serializer import FastSerializer
+from app.models.system.group import GroupExtended
+from app.serializers.system.group_serializer import GroupSerializer
+from app.serializers.system.permission_serializer import PermissionSerializer
+from app.serializers.system.user_serializer import UserSerializer
+
+
+class FastSerializerParityTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='john', email='john@example.com', first_name='John', last_name='')
+        User.objects.create_user(username='jane', email='jane@example.com', first_name='Jane', is_staff=True,
+                                 last_login=timezone.now() - datetime.timedelta(days=3, microseconds=17))
+        User.objects.create_user(username='old', email='old@example.com', first_name='Old', is_active=False,
+                                 last_login=datetime.datetime(2020, 1, 1, 12, 30, tzinfo=datetime.timezone.utc))
+        GroupExtended.objects.create(name='Editors', codename='editors', description='Edit content')
+        GroupExtended.objects.create(name='Viewers', codename='viewers', description='')
+
+    def assert_parity(self, serializer_class, queryset, context=None):
+        fast = FastSerializer.compile(serializer_class(context=context or {}))
+        self.assertIsNotNone(fast)
+        expected = serializer_class(queryset.order_by('pk'), many=True, context=context or {}).data
+        self.assertEqual(fast.represent(queryset.order_by('pk').values(*fast.columns)), expected)
+
+    def test_user_parity(self):
+        self.assert_parity(UserSerializer, User.objects.all())
+
+    def test_group_parity(self):
+        self.assert_parity(GroupSerializer, GroupExtended.objects.all())
+
+    def test_permission_parity(self):
+        self.assert_parity(PermissionSerializer, Permission.objects.all())
+
+    def test_parity_in_another_timezone(self):
+        with timezone.override('America/New_York'):
+            self.assert_parity(UserSerializer, User.objects.all())
+            self.assert_parity(GroupSerializer, GroupExtended.objects.all())
+
+    def test_sparse_fields_parity(self):
+        self.assert_parity(UserSerializer, User.objects.all(), context={'fields': ['username', 'last_login']})
+
+    def test_password_is_not_a_column(self):
+        fast = FastSerializer.compile(UserSerializer())
+        self.assertNotIn('password', fast.columns)
+
+    def test_unsupported_fields_are_not_compiled(self):
+        class UpperField(serializers.CharField):
+            def to_representation(self, value):
+                return value.upper()
+
+        class UpperSerializer(serializers.ModelSerializer):
+            username = UpperField()
+
+            class Meta:
+                model = User
+                fields = ['id', 'username']
+
+        class MethodSerializer(serializers.ModelSerializer):
+            full_name = serializers.SerializerMethodField()
+
+            class Meta:
+                model = User
+                fields = ['id', 'full_name']
+
+        self.assertIsNone(FastSerializer.compile(UpperSerializer()))
+        self.assertIsNone(FastSerializer.compile(MethodSerializer()))
+
+
+class FastSerializerViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', email='admin@example.com', first_name='Admin')
+        self.client.force_authenticate(user=self.user)
+        User.objects.create_user(username='john', email='john@example.com', first_name='John', last_login=timezone.now())
+
+    def test_list_endpoints_match_the_serializers(self):
+        users = UserSerializer(User.objects.order_by('date_joined', 'id'), many=True).data
+
+        response = self.client.get(reverse('user-pagination'), {'mode': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'], users)
+
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.json(), users)
+
+        response = self.client.get(reverse('user-list'), {'stream': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows, users)
+
+    def test_expand_uses_the_serializers(self):
+        response = self.client.get(reverse('user-pagination'), {'expand': 'groups'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['groups'], [])
@@ -0,0 +1,111 @@
+from django.contrib.auth.models import Group, User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.libraries.authentication import TokenRevocation
+from app.models.system.user_version import UserVersion
+from app.libraries.permission_cache import PermissionCache
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=2000)
+class UserBulkViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', email='admin@example.com', password='s3cret-Passw0rd')
+        self.client.force_authenticate(user=self.user)
+
+    def item(self, name, **kwargs):
+        return dict({'username': name, 'email': '%s@example.com' % name, 'first_name': name.title(),
+                     'password': 'p4ss-%s' % name}, **kwargs)
+
+    def test_bulk_create(self):
+        items = [self.item('user%d' % i) for i in range(20)]
+
+        # Uniqueness of usernames and of emails (one query each), one INSERT of the users,
+        # one of their row versions and the bump of the user table generation inside a
+        # transaction (a savepoint in tests).
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse('user-bulk-create'), items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 20)
+        self.assertNotIn('password', response.data[0])
+
+        user = User.objects.get(username='user7')
+        self.assertEqual(user.email, 'user7@example.com')
+        self.assertTrue(user.check_password('p4ss-user7'))
+
+    def test_bulk_create_reports_errors_per_item(self):
+        items = [
+            self.item('fresh'),
+            self.item('admin', email='other@example.com'),
+            self.item('dup'),
+            self.item('dup2', email='DUP@example.com'),
+            self.item('noemail', email='not-an-email'),
+        ]
+        response = self.client.post(reverse('user-bulk-create'), items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('username', response.data[1])
+        self.assertEqual(response.data[2], {})
+        self.assertIn('email', response.data[3])
+        self.assertIn('email', response.data[4])
+        self.assertFalse(User.objects.filter(username='fresh').exists())
+
+    def test_bulk_create_rejects_non_lists(self):
+        response = self.client.post(reverse('user-bulk-create'), self.item('single'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_disable_and_enable(self):
+        users = [User.objects.create_user(username='u%d' % i, email='u%d@example.com' % i) for i in range(5)]
+        ids = [user.pk for user in users]
+
+        # The ids check, the UPDATE of the users, the UPDATE of their row versions and the
+        # bump of the user table generation.
+        with self.assertNumQueries(4):
+            response = self.client.put(reverse('user-bulk-disabled'), {'ids': ids}, format='json')
+
+        self.assertEqual(response.data, {'updated': 5})
+        self.assertEqual(set(UserVersion.objects.filter(user_id__in=ids).values_list('version', flat=True)), {2})
+        self.assertFalse(User.objects.filter(pk__in=ids, is_active=True).exists())
+        self.assertTrue(TokenRevocation.is_revoked(ids[0], 0))
+
+        response = self.client.put(reverse('user-bulk-enabled'), {'ids': ids}, format='json')
+        self.assertEqual(response.data, {'updated': 5})
+        self.assertEqual(User.objects.filter(pk__in=ids, is_active=True).count(), 5)
+
+    def test_bulk_status_reports_unknown_ids(self):
+        response = self.client.put(reverse('user-bulk-disabled'), {'ids': [self.user.pk, 999999]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data['ids']), [1])
+        self.assertTrue(User.objects.get(pk=self.user.pk).is_active)
+
+    def test_bulk_groups(self):
+        staff, editors, viewers = [Group.objects.create(name=name) for name in ('staff', 'editors', 'viewers')]
+        other = User.objects.create_user(username='other', email='other@example.com')
+        self.user.groups.add(viewers)
+        PermissionCache.get(self.user.pk)
+
+        items = [{'user': self.user.pk, 'groups': [staff.pk, editors.pk]}, {'user': other.pk, 'groups': [staff.pk]}]
+        response = self.client.put(reverse('user-bulk-groups'), items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'added': 3, 'removed': 0})
+        self.assertEqual(set(self.user.groups.values_list('name', flat=True)), {'staff', 'editors', 'viewers'})
+        self.assertIsNone(PermissionCache.get_cache().get(PermissionCache.key(self.user.pk)))
+
+        response = self.client.put(reverse('user-bulk-groups') + '?mode=set', items[:1], format='json')
+        self.assertEqual(response.data, {'added': 0, 'removed': 1})
+        self.assertEqual(set(self.user.groups.values_list('name', flat=True)), {'staff', 'editors'})
+
+    def test_bulk_groups_reports_unknown_ids(self):
+        staff = Group.objects.create(name='staff')
+        items = [{'user': self.user.pk, 'groups': [staff.pk]}, {'user': 999999, 'groups': [staff.pk, 999999]}]
+        response = self.client.put(reverse('user-bulk-groups'), items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(set(response.data[1]), {'user', 'groups'})
+        self.assertFalse(self.user.groups.exists())
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class UserExpandTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', email='admin@example.com')
+        self.client.force_authenticate(user=self.user)
+        self.groups = [Group.objects.create(name='group%d' % i) for i in range(3)]
+        self.permissions = list(Permission.objects.order_by('pk')[:3])
+
+    def add_users(self, count):
+        users = User.objects.bulk_create([
+            User(username='user%03d' % i, email='user%03d@example.com' % i) for i in range(User.objects.count(), User.objects.count() + count)
+        ])
+        for user in users:
+            user.groups.add(*self.groups[:2])
+            user.user_permissions.add(self.permissions[0])
+
+    def queries(self, url, params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(captured), response
+
+    def test_expand_groups_and_permissions(self):
+        self.add_users(1)
+        response = self.client.get(reverse('user-pagination'), {'expand': 'groups,permissions', 'username': 'user001'})
+
+        row = response.data['results'][0]
+        self.assertEqual(row['groups'], [{'id': group.pk, 'name': group.name} for group in self.groups[:2]])
+        self.assertEqual(row['permissions'], [{'id': self.permissions[0].pk, 'name': self.permissions[0].name,
+                                               'codename': self.permissions[0].codename}])
+
+    def test_without_expand_relations_are_not_serialized(self):
+        response = self.client.get(reverse('user-pagination'))
+        self.assertNotIn('groups', response.data['results'][0])
+
+    def test_unknown_relation_is_rejected(self):
+        response = self.client.get(reverse('user-pagination'), {'expand': 'groups,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pagination_query_count_is_constant(self):
+        url = reverse('user-pagination')
+        params = {'expand': 'groups,permissions', 'page_size': 100, 'count': 'exact'}
+
+        self.add_users(5)
+        small, response = self.queries(url, params)
+        self.assertEqual(len(response.data['results']), 6)
+
+        self.add_users(95)
+        large, response = self.queries(url, params)
+        self.assertEqual(len(response.data['results']), 100)
+
+        # count, page, groups prefetch, permissions prefetch.
+        self.assertEqual(small, 4)
+        self.assertEqual(large, small)
+
+    def test_list_and_stream_query_count_is_constant(self):
+        url = reverse('user-list')
+        self.add_users(5)
+        small, _ = self.queries(url, {'expand': 'groups'})
+        self.add_users(50)
+        large, response = self.queries(url, {'expand': 'groups'})
+        self.assertEqual(large, small)
+        self.assertEqual(len(response.data[-1]['groups']), 2)
+
+        response = self.client.get(url, {'expand': 'groups', 'stream': 'ndjson'})
+        with CaptureQueriesContext(connection) as captured:
+            body = b''.join(response.streaming_content)
+        self.assertEqual(len(body.splitlines()), 56)
+        self.assertEqual(len(captured), 2)
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.models.system.group import GroupExtended
+
+
+class UserFieldsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', email='admin@example.com', password='password')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('user-pagination')
+
+    def selected_sql(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        select = [query['sql'] for query in context.captured_queries if 'FROM "auth_user"' in query['sql'] and 'COUNT' not in query['sql']]
+        return response, select[0]
+
+    def test_fields_narrow_the_response_and_the_columns(self):
+        response, sql = self.selected_sql(self.url, {'fields': 'id,username,is_active'})
+        self.assertEqual(list(response.data['results'][0]), ['id', 'username', 'is_active'])
+        self.assertNotIn('"first_name"', sql)
+        self.assertNotIn('"email"', sql)
+
+    def test_password_is_never_selected(self):
+        for url in (self.url, reverse('user-list'), reverse('user-detail', args=[self.user.pk])):
+            _, sql = self.selected_sql(url, {})
+            self.assertNotIn('"password"', sql)
+
+    def test_fields_with_cursor_mode(self):
+        User.objects.create_user(username='john', email='john@example.com', password='password')
+        response = self.client.get(self.url, {'fields': 'username', 'mode': 'cursor', 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'username': 'admin'}])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'], [{'username': 'john'}])
+
+    def test_expanded_relations_are_kept(self):
+        response = self.client.get(self.url, {'fields': 'id', 'expand': 'groups'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['id', 'groups'])
+
+    def test_unknown_and_write_only_fields_are_rejected(self):
+        for fields in ('id,unknown', 'password'):
+            response = self.client.get(self.url, {'fields': fields})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('fields', response.data)
+
+
+class GroupAndPermissionFieldsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', email='admin@example.com', password='password')
+        self.client.force_authenticate(user=self.user)
+        GroupExtended.objects.create(name='Editors', codename='editors', description='Edit content')
+
+    def test_group_fields(self):
+        response = self.client.get(reverse('group-pagination'), {'fields': 'id,name', 'mode': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['id', 'name'])
+
+    def test_permission_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('permission-pagination'), {'fields': 'codename'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['codename'])
+        select = [query['sql'] for query in context.captured_queries if 'FROM "auth_permission"' in query['sql'] and 'COUNT' not in query['sql']]
+        self.assertNotIn('"name"', select[0])
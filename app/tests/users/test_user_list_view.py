@@ -0,0 +1,53 @@
+import json
+from unittest import mock
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from app.views.system.user_view import UserList
+
+
+class UserListTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        User.objects.bulk_create([User(username='user%02d' % i, email='user%02d@example.com' % i) for i in range(14)])
+        self.url = reverse('user-list')
+        self.client.force_authenticate(user=self.user)
+
+    def test_stream_json_array(self):
+        response = self.client.get(self.url, {'stream': 'json'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 15)
+        self.assertNotIn('password', rows[0])
+
+    def test_stream_ndjson(self):
+        with mock.patch.object(UserList, 'stream_chunk_size', 4):
+            response = self.client.get(self.url, {'stream': 'ndjson', 'is_active': True})
+            chunks = list(response.streaming_content)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(chunks).splitlines()]
+        self.assertEqual([row['username'] for row in rows],
+                         list(User.objects.order_by('date_joined', 'id').values_list('username', flat=True)))
+
+    def test_unknown_stream_format(self):
+        response = self.client.get(self.url, {'stream': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_is_capped_with_cursor_link(self):
+        with mock.patch.object(UserList, 'max_list_size', 10):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data), 10)
+            self.assertIn('rel="next"', response['Link'])
+
+            next_url = response['Link'].split(';')[0].strip('<>')
+            rest = self.client.get(next_url)
+        self.assertEqual(len(rest.data), 5)
+        self.assertNotIn('rel="next"', rest['Link'])
+
+    def test_list_under_cap_has_no_link(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 15)
+        self.assertFalse(response.has_header('Link'))
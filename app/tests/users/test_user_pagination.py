@@ -0,0 +1,119 @@
+from datetime import timedelta
+from unittest import mock
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from app.libraries.count_strategy import CachedCount, EstimatedCount
+
+
+class UserPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        joined = timezone.now() - timedelta(days=30)
+        # Several users share the same date_joined so the id tie-breaker is exercised.
+        User.objects.bulk_create([
+            User(username='user%02d' % i, email='user%02d@example.com' % i, date_joined=joined + timedelta(days=i // 3))
+            for i in range(24)
+        ])
+        self.url = reverse('user-pagination')
+        self.client.force_authenticate(user=self.user)
+
+    def test_page_mode_keeps_envelope(self):
+        response = self.client.get(self.url, {'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(response.data['num_pages'], 3)
+        self.assertEqual(response.data['page'], 1)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_cursor_mode_walks_every_row_once(self):
+        expected = list(User.objects.order_by('date_joined', 'id').values_list('id', flat=True))
+        seen = []
+        response = self.client.get(self.url, {'mode': 'cursor', 'page_size': 10})
+
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            self.assertEqual(response.data['page_size'], 10)
+            seen.extend(row['id'] for row in response.data['results'])
+            if response.data['next'] is None:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(seen, expected)
+
+    def test_cursor_mode_previous_page(self):
+        first = self.client.get(self.url, {'mode': 'cursor', 'page_size': 10})
+        self.assertIsNone(first.data['previous'])
+
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']],
+        )
+
+    def test_cursor_mode_applies_filters(self):
+        User.objects.filter(username__in=['user00', 'user01']).update(is_active=False)
+        response = self.client.get(self.url, {'mode': 'cursor', 'is_active': False})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['username'] for row in response.data['results']],
+            ['user00', 'user01'],
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_count_strategy_is_reported(self):
+        response = self.client.get(self.url, {'count': 'exact'})
+        self.assertEqual(response.data['count_strategy'], 'exact')
+        self.assertEqual(response.data['count'], 25)
+
+    def test_estimate_falls_back_to_exact_for_small_tables(self):
+        response = self.client.get(self.url, {'count': 'estimate'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count_strategy'], 'exact')
+        self.assertEqual(response.data['count'], 25)
+
+    def test_pages_past_a_low_estimate_are_served(self):
+        with mock.patch.object(EstimatedCount, 'count', return_value=(5, 'estimate')):
+            first = self.client.get(self.url, {'count': 'estimate', 'page_size': 10})
+            last = self.client.get(self.url, {'count': 'estimate', 'page_size': 10, 'page': 3})
+
+        self.assertEqual((first.data['count'], first.data['num_pages']), (11, 2))
+        self.assertEqual(last.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(last.data['results']), 5)
+        self.assertEqual((last.data['count'], last.data['num_pages'], last.data['count_strategy']), (25, 3, 'estimate'))
+
+    def test_high_estimate_is_corrected_on_the_last_page(self):
+        with mock.patch.object(EstimatedCount, 'count', return_value=(100, 'estimate')):
+            last = self.client.get(self.url, {'count': 'estimate', 'page_size': 10, 'page': 3})
+            past = self.client.get(self.url, {'count': 'estimate', 'page_size': 10, 'page': 5})
+
+        self.assertEqual((last.data['count'], last.data['num_pages']), (25, 3))
+        self.assertEqual(past.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cached_count_is_reused_per_filter_set(self):
+        CachedCount.get_cache().clear()
+        first = self.client.get(self.url, {'is_active': True, 'page': 1})
+        self.assertEqual(first.data['count_strategy'], 'cached')
+        self.assertEqual(first.data['count'], 25)
+
+        User.objects.create_user(username='lateuser')
+        # The conditional GET validators and the page, the count comes from the cache.
+        with self.assertNumQueries(2):
+            second = self.client.get(self.url, {'page': 2, 'is_active': True})
+        self.assertEqual(second.data['count'], 25)
+
+        other_filters = self.client.get(self.url, {'is_active': False})
+        self.assertEqual(other_filters.data['count'], 0)
+
+    def test_unknown_count_strategy(self):
+        response = self.client.get(self.url, {'count': 'guess'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth.models import User
+from app.tests.query_plan import QueryPlanTestMixin
+from app.views.system.user_view import UserPagination
+
+SEED_SIZE = 5000
+
+
+class UserQueryPlanTests(QueryPlanTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        joined = timezone.now() - timedelta(days=365)
+        User.objects.bulk_create([
+            User(
+                username='user%05d' % i,
+                email='user%05d@example.com' % i,
+                first_name='First%04d' % (i % 2000),
+                last_name='Last%04d' % (i % 1500),
+                is_active=i % 100 != 0,
+                date_joined=joined + timedelta(minutes=i),
+            )
+            for i in range(SEED_SIZE)
+        ], batch_size=1000)
+        cls.analyze('auth_user')
+
+    def test_filterset_combinations_use_indexes(self):
+        # is_active=True matches almost every row, a scan is the right plan for it,
+        # so combinations are checked with the selective value.
+        values = {
+            'first_name': 'First0042',
+            'last_name': 'Last0042',
+            'username': 'user00042',
+            'email': 'user00042@example.com',
+            'is_active': False,
+        }
+        self.assertEqual(set(values), set(UserPagination.filterset_fields))
+
+        for filters in self.filter_combinations(values):
+            with self.subTest(filters=filters):
+                self.assertNoSequentialScan(User.objects.filter(**filters)[:20], 'auth_user')
+
+    def test_login_lookup_is_case_insensitive_and_indexed(self):
+        queryset = User.objects.filter(email__iexact='USER00042@EXAMPLE.COM')
+        self.assertEqual(queryset.get().username, 'user00042')
+        self.assertNoSequentialScan(queryset, 'auth_user')
+
+    def test_keyset_ordering_uses_index(self):
+        queryset = User.objects.filter(date_joined__gte=timezone.now() - timedelta(days=1)).order_by('date_joined', 'id')
+        self.assertNoSequentialScan(queryset[:20], 'auth_user')
@@ -0,0 +1,33 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+
+
+class UserSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        User.objects.create_user(username='jdoe', first_name='John', last_name='Doe', email='john@example.com')
+        User.objects.create_user(username='johnny', first_name='Johnny', last_name='Walker', email='jw@example.com')
+        User.objects.create_user(username='mary', first_name='Mary', last_name='Johnson', email='mary@example.com')
+        self.url = reverse('user-pagination')
+        self.client.force_authenticate(user=self.user)
+
+    def test_search_orders_by_relevance(self):
+        response = self.client.get(self.url, {'q': 'john', 'count': 'exact'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        # Exact first name match, then prefix match, then substring match.
+        self.assertEqual([row['username'] for row in response.data['results']], ['jdoe', 'johnny', 'mary'])
+
+    def test_every_term_must_match(self):
+        response = self.client.get(self.url, {'q': 'john doe', 'count': 'exact'})
+        self.assertEqual([row['username'] for row in response.data['results']], ['jdoe'])
+
+    def test_search_is_case_insensitive_and_combines_with_filters(self):
+        response = self.client.get(self.url, {'q': 'EXAMPLE.COM', 'first_name': 'Mary', 'count': 'exact'})
+        self.assertEqual([row['username'] for row in response.data['results']], ['mary'])
+
+    def test_empty_query_returns_everything(self):
+        response = self.client.get(self.url, {'q': ' ', 'count': 'exact'})
+        self.assertEqual(response.data['count'], 4)
@@ -1,20 +1,21 @@
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from app.libraries.hashing_pool import hashing_pool
+from app.libraries.throttling import LoginEmailThrottle, LoginIPThrottle, PasswordResetEmailThrottle, PasswordResetIPThrottle
+from app.libraries.tokens import ClaimsRefreshToken
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.forms import PasswordResetForm
-from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.urls import reverse
 from django.shortcuts import get_object_or_404
-from app.serializers.system.auth_serializer import LoginSerializer, ResetPasswordSerializer, RegisterSerializer
+from app.serializers.system.auth_serializer import LoginSerializer, ResetPasswordSerializer, RegisterSerializer, RefreshTokenSerializer
 from app.serializers.system.user_serializer import UserSerializer
-from app.services.emails.auth import forgot_password_email
+from app.services.emails.auth.forgot_password_email import ForgotPasswordEmail
 
 
 class LoginView(TokenObtainPairView):
@@ -23,11 +24,28 @@ class LoginView(TokenObtainPairView):
 
     Inherits from TokenObtainPairView which is a built-in view provided by the rest_framework_simplejwt library.
     Uses the LoginSerializer for validating user credentials and generating tokens.
+    Attempts are throttled per client IP and per email from each client IP before the
+    credentials are checked.
 
     Attributes:
         serializer_class (class): The serializer class to be used for validating user credentials.
+        throttle_classes (tuple): Sliding window throttles applied before the serializer runs.
     """
     serializer_class = LoginSerializer
+    throttle_classes = (LoginIPThrottle, LoginEmailThrottle)
+
+
+class RefreshTokenView(TokenRefreshView):
+    """
+    View for exchanging a refresh token for a new access token.
+
+    Uses the RefreshTokenSerializer so the claims read by StatelessJWTAuthentication are
+    refreshed from the database together with the access token.
+
+    Attributes:
+        serializer_class (class): The serializer class used to validate the refresh token.
+    """
+    serializer_class = RefreshTokenSerializer
 
 
 class LogoutView(APIView):
@@ -43,7 +61,7 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
+            token = ClaimsRefreshToken(refresh_token)
             token.blacklist()
 
             return Response(status=status.HTTP_204_NO_CONTENT)
@@ -56,6 +74,9 @@ class ForgotPasswordView(APIView):
     View for handling the forgot password functionality,
     Handle the POST request for resetting the password.
 
+    Every valid email gets the same 200 response, reset emails are only queued for
+    the active users it belongs to.
+
     Args:
         request (HttpRequest): The HTTP request object.
 
@@ -63,19 +84,17 @@ class ForgotPasswordView(APIView):
         Response: The HTTP response object.
     """
 
+    throttle_classes = (PasswordResetIPThrottle, PasswordResetEmailThrottle)
+
     def post(self, request):
 
         form = PasswordResetForm(request.data)
 
         if form.is_valid():
-            user = form.get_user()
-            token = default_token_generator.make_token(user)
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            reset_url = request.build_absolute_uri(
-                reverse('password_reset_confirm', kwargs={
-                        'uidb64': uid, 'token': token})
-            )
-            forgot_password_email.send_email(user.email, reset_url)
+            # Same response whether the email belongs to an active user or not, so the
+            # endpoint does not tell which emails have accounts.
+            for user in form.get_users(form.cleaned_data['email']):
+                ForgotPasswordEmail.send_email(user, request)
             return Response({'detail': 'Password reset email sent.'}, status=status.HTTP_200_OK)
 
         return Response(form.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -93,13 +112,14 @@ class ResetPasswordView(APIView):
     - Response: The HTTP response object.
     """
 
+    permission_classes = (IsAuthenticated,)
+
     def post(self, request):
 
         serializer = ResetPasswordSerializer(data=request.data)
         if serializer.is_valid():
             user = request.user
-            user.password = make_password(
-                serializer.validated_data['password'])
+            user.password = hashing_pool.make_password(serializer.validated_data['password'])
             user.save()
             return Response({'message': 'Password updated successfully'}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
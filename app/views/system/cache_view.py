@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from app.libraries.cache_backends import LocalLRUCache
+from app.libraries.response_cache import ResponseCache
+
+
+class ResponseCacheMetricsView(APIView):
+    """
+    Hit and miss counters of the response cache of this process, and the usage of its
+    `LocalLRUCache` tiers under "caches".
+
+    Attributes:
+        permission_classes (tuple): Staff users only.
+
+    Example:
+        GET /api/v1/system/cache/metrics/
+
+        HTTP 200 OK
+        {"local_hits": 120, "shared_hits": 4, "misses": 9, "requests": 133, "hit_ratio": 0.9323,
+         "local_entries": 9, "local_max_entries": 512, "shared_alias": null,
+         "caches": {"local": {"hits": 310, "misses": 42, "evictions": 0, "entries": 40, "bytes": 5120,
+                              "max_entries": 10000, "max_bytes": 33554432}}}
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        local_caches = {alias: caches[alias].stats() for alias, config in settings.CACHES.items()
+                        if config['BACKEND'] == '%s.%s' % (LocalLRUCache.__module__, LocalLRUCache.__name__)}
+        return Response(dict(ResponseCache.metrics(), caches=local_caches))
@@ -0,0 +1,26 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from app.libraries import pooled_postgresql
+
+
+class DatabasePoolMetricsView(APIView):
+    """
+    Counters of the database connection pools of this process, empty unless
+    DB_POOL_ENABLED is set.
+
+    Attributes:
+        permission_classes (tuple): Staff users only.
+
+    Example:
+        GET /api/v1/system/database/metrics/
+
+        HTTP 200 OK
+        {"pools": [{"alias": "default", "database": "app", "in_use": 3, "idle": 2, "min_size": 2,
+                    "max_size": 10, "created": 7, "reused": 1843, "checkouts": 1850, "waits": 4,
+                    "wait_seconds": 0.012, "timeouts": 0, "closed_idle": 2, "closed_broken": 0}]}
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response({'pools': pooled_postgresql.metrics()})
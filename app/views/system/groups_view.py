@@ -1,14 +1,21 @@
 from rest_framework import generics, status
 from rest_framework.views import APIView
-from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 from app.models.system.group import GroupExtended
 from django_filters.rest_framework import DjangoFilterBackend
-from app.serializers.system.group_serializer import GroupSerializer
+from app.serializers.system.group_serializer import GroupSerializer, GroupPermissionsSerializer
 from app.libraries.custom_pagination import CustomPagination
+from app.libraries.conditional import ConditionalGetMixin
+from app.libraries.response_cache import CachedResponseMixin
+import app.config.constants as constants
+from app.libraries.dynamic_fields import DynamicFieldsViewMixin
+from app.libraries.streaming import StreamingListMixin
+from app.libraries.search_filter import RankedSearchFilter
 from rest_framework.response import Response
 
 
-class GroupPagination(generics.ListAPIView):
+class GroupPagination(CachedResponseMixin, ConditionalGetMixin, DynamicFieldsViewMixin, generics.ListAPIView):
     """
     API view for listing and creating groups.
 
@@ -20,6 +27,11 @@ class GroupPagination(generics.ListAPIView):
 
     Query Parameters:
     - name: Filter groups by name.
+    - q: Free text search over name and description, ordered by relevance.
+    - mode: Set to `cursor` to use keyset pagination ordered by (created_at, id).
+    - cursor: The opaque cursor returned in `next`/`previous` when using keyset pagination.
+    - fields: Comma separated fields to return, e.g. `id,name`. Only those columns are selected.
+    - expand: Set to `permissions` to nest each group's permissions (one extra query per page).
 
     Response format:
     The response is serialized using the GroupSerializer class.
@@ -33,15 +45,20 @@ class GroupPagination(generics.ListAPIView):
     Example usage:
     GET /groups/ - Retrieve a list of all groups.
     GET /groups/?name=admin - Retrieve a list of groups with the name 'admin'.
+    GET /groups/?q=admin - Search groups whose name or description contains 'admin'.
     """
     queryset = GroupExtended.objects.all()
     serializer_class = GroupSerializer
+    cache_revisions = (constants.GROUP_REVISION, constants.PERMISSION_REVISION)
+    last_modified_fields = ('updated_at', 'created_at')
     pagination_class = CustomPagination
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter]
     filterset_fields = ['name']
-    search_fields = ['name']
+    search_fields = ['name', 'description']
+    cursor_ordering = ('created_at', 'pk')
+    fast_serialization = True
 
-class GroupList(generics.ListAPIView):
+class GroupList(CachedResponseMixin, ConditionalGetMixin, DynamicFieldsViewMixin, StreamingListMixin, generics.ListAPIView):
     """
     API endpoint for listing and creating groups.
 
@@ -52,17 +69,25 @@ class GroupList(generics.ListAPIView):
         queryset (QuerySet): The queryset of `Group` objects to be used for listing.
         serializer_class (Serializer): The serializer class to be used for
             serializing and deserializing `Group` objects.
+        cursor_ordering (tuple): The ordering used for streaming and for the `Link` cursor.
 
     Example:
         To list all groups, make a GET request to the endpoint.
         To create a new group, make a POST request to the endpoint with the
         required data.
+        To export every group, make a GET request with `?stream=json` or `?stream=ndjson`.
+        To nest each group's permissions, add `?expand=permissions`.
+        To return only some fields, add `?fields=id,name`.
 
     """
     queryset = GroupExtended.objects.all()
     serializer_class = GroupSerializer
+    cache_revisions = (constants.GROUP_REVISION, constants.PERMISSION_REVISION)
+    last_modified_fields = ('updated_at', 'created_at')
+    cursor_ordering = ('created_at', 'pk')
+    fast_serialization = True
 
-class GroupDetail(generics.RetrieveAPIView):
+class GroupDetail(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     API endpoint for retrieving, updating, and deleting a specific user group.
 
@@ -75,6 +100,7 @@ class GroupDetail(generics.RetrieveAPIView):
     """
     queryset = GroupExtended.objects.all()
     serializer_class = GroupSerializer
+    last_modified_fields = ('updated_at', 'created_at')
 
 class GroupCreate(generics.CreateAPIView):
     """
@@ -133,20 +159,60 @@ class GroupDelete(generics.DestroyAPIView):
     serializer_class = GroupSerializer
 
 class GroupPermissionsView(APIView):
+    """
+    API view for reading and changing the permissions of a group.
 
-    def post(self, request, group_id):
-        try:
-            group = GroupExtended.objects.get(pk=group_id)
-        except GroupExtended.DoesNotExist:
-            return Response({"error": "Group not found"}, status=status.HTTP_404_NOT_FOUND)
+    The requested permissions are resolved with one query (see `GroupPermissionsSerializer`), diffed
+    against the group's current permissions and applied inside one transaction with the related
+    manager's `add()`/`remove()`, which write all rows at once and send the `m2m_changed` signals that
+    invalidate the cached permissions of the group's members. Nothing is applied when any id or
+    codename is invalid.
+
+    Modes:
+        add: adds the given permissions (default).
+        remove: removes the given permissions.
+        replace: the group ends up with exactly the given permissions.
+
+    Example:
+        POST /api/v1/groups/1/permissions/
+        {"permissions": [1, 2], "codenames": ["auth.view_user"], "mode": "add"}
+
+        HTTP 200 OK
+        {"added": [1, 2, 28], "removed": [], "permissions": [1, 2, 5, 28]}
+    """
 
-        permissions = request.data.get('permissions', [])
+    def get_group(self, group_id):
+        return get_object_or_404(GroupExtended.objects.only('pk'), pk=group_id)
 
-        for permission_id in permissions:
-            try:
-                permission = Permission.objects.get(pk=permission_id)
-                group.permissions.add(permission)
-            except Permission.DoesNotExist:
-                return Response({"error": f"Permission with id {permission_id} does not exist"}, status=status.HTTP_400_BAD_REQUEST)
+    def get(self, request, group_id):
+        group = self.get_group(group_id)
+        return Response({'permissions': sorted(group.permissions.values_list('pk', flat=True))}, status=status.HTTP_200_OK)
 
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    def post(self, request, group_id):
+        group = self.get_group(group_id)
+
+        serializer = GroupPermissionsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        mode = serializer.validated_data['mode']
+        wanted = serializer.validated_data['permission_ids']
+
+        with transaction.atomic():
+            current = set(group.permissions.values_list('pk', flat=True))
+
+            if mode == 'add':
+                added, removed = wanted - current, set()
+            elif mode == 'remove':
+                added, removed = set(), wanted & current
+            else:
+                added, removed = wanted - current, current - wanted
+
+            if removed:
+                group.permissions.remove(*removed)
+            if added:
+                group.permissions.add(*added)
+
+        return Response({
+            'added': sorted(added),
+            'removed': sorted(removed),
+            'permissions': sorted((current | added) - removed),
+        }, status=status.HTTP_200_OK)
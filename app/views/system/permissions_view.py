@@ -3,8 +3,13 @@ from django.contrib.auth.models import Permission
 from django_filters.rest_framework import DjangoFilterBackend
 from app.serializers.system.permission_serializer import PermissionSerializer
 from app.libraries.custom_pagination import CustomPagination
+from app.libraries.conditional import ConditionalGetMixin
+from app.libraries.response_cache import CachedResponseMixin
+from app.libraries.dynamic_fields import DynamicFieldsViewMixin
+from app.libraries.streaming import StreamingListMixin
+import app.config.constants as constants
 
-class PermissionPagination(generics.ListAPIView):
+class PermissionPagination(CachedResponseMixin, ConditionalGetMixin, DynamicFieldsViewMixin, generics.ListAPIView):
     """
     Endpoint for listing and creating permissions.
 
@@ -14,6 +19,7 @@ class PermissionPagination(generics.ListAPIView):
         pagination_class (Pagination): The pagination class for the endpoint.
         filter_backends (list): The list of filter backends for the endpoint.
         filterset_fields (list): The list of fields to filter permissions.
+        cursor_ordering (tuple): The keyset used when paginating with `?mode=cursor`.
 
     HTTP Methods:
         GET: Retrieve a list of permissions.
@@ -21,20 +27,38 @@ class PermissionPagination(generics.ListAPIView):
     Examples:
         GET /permissions/
         GET /permissions/?name=admin  # Filter permissions by name
+        GET /permissions/?mode=cursor  # Keyset pagination, follow `next` for the following page
+        GET /permissions/?fields=id,codename  # Only return (and select) these fields
 
     """
 
     queryset = Permission.objects.all()
     serializer_class = PermissionSerializer
+    cache_revisions = (constants.PERMISSION_REVISION,)
+    revision = constants.PERMISSION_REVISION
     pagination_class = CustomPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['name']
     search_fields = ['name']
+    cursor_ordering = ('id',)
+    fast_serialization = True
 
-class PermissionList(generics.ListAPIView):
+class PermissionList(CachedResponseMixin, ConditionalGetMixin, DynamicFieldsViewMixin, StreamingListMixin, generics.ListAPIView):
+    """
+    Endpoint for listing every permission.
+
+    The response is capped to `max_list_size` rows with a `Link` cursor to the rest,
+    `?stream=json` or `?stream=ndjson` streams the whole table instead. `?fields=`
+    narrows the fields like on the paginated endpoint.
+    """
     queryset = Permission.objects.all()
     serializer_class = PermissionSerializer
+    cache_revisions = (constants.PERMISSION_REVISION,)
+    revision = constants.PERMISSION_REVISION
+    cursor_ordering = ('id',)
+    fast_serialization = True
 
-class PermissionDetail(generics.RetrieveUpdateDestroyAPIView):
+class PermissionDetail(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Permission.objects.all()
-    serializer_class = PermissionSerializer
\ No newline at end of file
+    serializer_class = PermissionSerializer
+    revision = constants.PERMISSION_REVISION
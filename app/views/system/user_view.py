@@ -1,16 +1,27 @@
 from rest_framework import generics, status, pagination
+from rest_framework.exceptions import ValidationError
 from django.contrib.auth.models import User
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
-from app.serializers.system.user_serializer import UserSerializer
+from app.serializers.system.user_serializer import UserSerializer, UserBulkCreateSerializer, UserBulkStatusSerializer, UserGroupsItemSerializer
 from rest_framework.response import Response
+from app.libraries.authentication import TokenRevocation
+from app.libraries.permission_cache import PermissionCache
+from app.models.system.user_version import UserVersion
 from app.helpers.log_helper import log_helper
 from app.libraries.custom_pagination import CustomPagination
+from app.libraries.conditional import ConditionalGetMixin
+from app.libraries.dynamic_fields import DynamicFieldsViewMixin
+from app.libraries.streaming import StreamingListMixin
+from app.libraries.search_filter import RankedSearchFilter
+import app.config.constants as constants
 
-class UserPagination(generics.ListAPIView):
+class UserPagination(ConditionalGetMixin, DynamicFieldsViewMixin, generics.ListAPIView):
     """
     A view for paginating and filtering User objects.
 
-    This view provides pagination support and allows filtering of User objects based on the following fields:
+    This view provides pagination support, free text search through `?q=` over first_name, last_name,
+    username and email (ordered by relevance), and allows filtering of User objects based on the following fields:
     - first_name
     - last_name
     - username
@@ -28,6 +39,7 @@ class UserPagination(generics.ListAPIView):
         To paginate and filter User objects, make a GET request to this endpoint with the desired filters:
 
         GET /users/?first_name=John&is_active=true&page=2&page_size=10
+        GET /users/?q=john doe
 
     Pagination:
         This view supports pagination. The default pagination class is used, but you can customize it by setting the `pagination_class` attribute.
@@ -35,17 +47,28 @@ class UserPagination(generics.ListAPIView):
         Available query parameters for pagination:
         - page: The page number to retrieve (default: 1).
         - page_size: The number of items per page (default: 10).
+        - mode: Set to `cursor` to use keyset pagination ordered by (date_joined, id).
+        - cursor: The opaque cursor returned in `next`/`previous` when using keyset pagination.
+        - count: How `count` is computed: `exact`, `estimate` or `cached` (default: cached).
+        - fields: Comma separated fields to return, e.g. `id,username,is_active`. Only those columns are
+          selected. The password hash is never selected.
+        - expand: Comma separated relations to nest in each user: `groups`, `permissions`. Each one costs
+          one extra query per page, whatever the page size.
 
     """
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    revision = constants.USER_REVISION
     pagination_class = CustomPagination
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter]
     filterset_fields = ['first_name', 'last_name', 'username', 'email', 'is_active']
     search_fields = ['first_name', 'last_name', 'username', 'email']
+    cursor_ordering = ('date_joined', 'id')
+    fast_serialization = True
+    count_strategy = 'cached'
 
-class UserList(generics.ListAPIView):
+class UserList(ConditionalGetMixin, DynamicFieldsViewMixin, StreamingListMixin, generics.ListAPIView):
     """
     API endpoint that allows users to be listed and created.
 
@@ -55,19 +78,28 @@ class UserList(generics.ListAPIView):
     Attributes:
         queryset (QuerySet): The queryset of User objects to be listed.
         serializer_class (Serializer): The serializer class used for User objects.
+        cursor_ordering (tuple): The ordering used for streaming and for the `Link` cursor.
 
     Example:
         To list all users, make a GET request to this endpoint.
         To create a new user, make a POST request to this endpoint with the required data.
+        To export every user, make a GET request with `?stream=json` or `?stream=ndjson`.
+        To nest each user's groups and direct permissions, add `?expand=groups,permissions`.
+        To return only some fields, add `?fields=id,username,is_active`.
 
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    revision = constants.USER_REVISION
+    cursor_ordering = ('date_joined', 'id')
+    fast_serialization = True
 
-class UserDetail(generics.RetrieveAPIView):
+class UserDetail(ConditionalGetMixin, DynamicFieldsViewMixin, generics.RetrieveAPIView):
     """
     Retrieve a single user instance.
 
+    Supports `?fields=` and `?expand=` like the user list. The password hash is never selected.
+
     Attributes:
         queryset (QuerySet): The queryset of User objects.
         serializer_class (Serializer): The serializer class for User objects.
@@ -78,6 +110,8 @@ class UserDetail(generics.RetrieveAPIView):
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    last_modified_fields = ('version__updated_at', 'last_login', 'date_joined')
+    version_field = 'version__version'
 
 class UserCreate(generics.CreateAPIView):
     """
@@ -186,9 +220,8 @@ class UserEnabled(generics.UpdateAPIView):
 
     def put(self, request, *args, **kwargs):
         user = self.get_object()
-        # Your implementation here
         user.is_active = True
-        user.save()
+        user.save(update_fields=['is_active'])
         return Response(status=status.HTTP_200_OK)
 
 class UserDisabled(generics.UpdateAPIView):
@@ -226,7 +259,7 @@ class UserDisabled(generics.UpdateAPIView):
     def put(self, request, *args, **kwargs):
         user = self.get_object()
         user.is_active = False
-        user.save()
+        user.save(update_fields=['is_active'])
         return Response(status=status.HTTP_200_OK)
 
 class UserGroups(generics.UpdateAPIView):
@@ -266,3 +299,133 @@ class UserGroups(generics.UpdateAPIView):
         group_ids = request.data.get('groups', [])
         user.groups.set(group_ids)
         return Response({"detail": "Groups associated with user successfully."}, status=status.HTTP_200_OK)
+
+class UserBulkCreate(generics.CreateAPIView):
+    """
+    API endpoint for creating many users in one request.
+
+    The items are validated together (usernames and emails must be unique within the batch and
+    against existing users), the passwords are hashed in parallel on the hashing pool and the users
+    are inserted with one `bulk_create` inside a transaction. When any item is invalid nothing is
+    created and the response lists the errors of each item, in request order.
+
+    Attributes:
+        serializer_class (Serializer): The serializer of one item, validated with `many=True`.
+
+    Examples:
+        POST /api/v1/users/bulk/create/
+        [
+            {"username": "john", "email": "john@example.com", "first_name": "John", "password": "..."},
+            {"username": "jane", "email": "jane@example.com", "first_name": "Jane", "password": "..."}
+        ]
+
+        HTTP 400 Bad Request
+        [{}, {"username": ["A user with that username already exists."]}]
+    """
+    serializer_class = UserBulkCreateSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            users = serializer.save()
+            # bulk_create sends no post_save.
+            UserVersion.created([user.pk for user in users])
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class UserBulkEnabled(generics.GenericAPIView):
+    """
+    API endpoint that enables many users with one UPDATE.
+
+    Attributes:
+        serializer_class (Serializer): Validates the list of user ids.
+        is_active (bool): The value written to `is_active`.
+
+    Examples:
+        PUT /api/v1/users/bulk/enabled/
+        {"ids": [1, 2, 3]}
+
+        HTTP 200 OK
+        {"updated": 3}
+    """
+    serializer_class = UserBulkStatusSerializer
+    is_active = True
+
+    def put(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids = serializer.validated_data['ids']
+
+        updated = User.objects.filter(pk__in=user_ids).update(is_active=self.is_active)
+        # update() sends no post_save: bump the row versions and, like UserDisabled, revoke or restore the tokens.
+        UserVersion.touch(user_ids)
+        if not self.is_active:
+            TokenRevocation.revoke(user_ids)
+        else:
+            TokenRevocation.restore(user_ids)
+
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
+
+class UserBulkDisabled(UserBulkEnabled):
+    """
+    API endpoint that disables many users with one UPDATE and revokes their access tokens.
+
+    Examples:
+        PUT /api/v1/users/bulk/disabled/
+        {"ids": [1, 2, 3]}
+    """
+    is_active = False
+
+class UserBulkGroups(generics.GenericAPIView):
+    """
+    API endpoint for assigning groups to many users at once.
+
+    Users and groups are checked to exist with one query each. The rows of the `auth_user_groups`
+    through table are inserted with one `bulk_create` (and, with `?mode=set`, the groups that are not
+    listed are removed with one DELETE) inside a transaction. The cached permissions of every
+    affected user are invalidated.
+
+    Attributes:
+        serializer_class (Serializer): The serializer of one item, validated with `many=True`.
+
+    Examples:
+        PUT /api/v1/users/bulk/groups/?mode=add
+        [{"user": 1, "groups": [1, 2]}, {"user": 2, "groups": [3]}]
+
+        HTTP 200 OK
+        {"added": 3, "removed": 0}
+    """
+    serializer_class = UserGroupsItemSerializer
+    modes = ('add', 'set')
+
+    def put(self, request, *args, **kwargs):
+        mode = request.query_params.get('mode', 'add')
+        if mode not in self.modes:
+            raise ValidationError({'mode': ['Expected one of: %s.' % ', '.join(self.modes)]})
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        wanted = {}
+        for item in serializer.validated_data:
+            wanted.setdefault(item['user'], set()).update(item['groups'])
+
+        through = User.groups.through
+        with transaction.atomic():
+            current = {(user_id, group_id): pk for pk, user_id, group_id in
+                       through.objects.filter(user_id__in=wanted).values_list('pk', 'user_id', 'group_id')}
+            rows = {(user_id, group_id) for user_id, group_ids in wanted.items() for group_id in group_ids}
+
+            removed = 0
+            if mode == 'set':
+                stale = [pk for row, pk in current.items() if row not in rows]
+                if stale:
+                    removed = through.objects.filter(pk__in=stale).delete()[0]
+
+            added = through.objects.bulk_create(
+                [through(user_id=user_id, group_id=group_id) for user_id, group_id in sorted(rows - current.keys())],
+                ignore_conflicts=True)
+
+            PermissionCache.invalidate(wanted)
+
+        return Response({'added': len(added), 'removed': removed}, status=status.HTTP_200_OK)
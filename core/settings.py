@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'app'
 ]
 
@@ -53,6 +54,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app.libraries.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,18 +82,167 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+#
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 closes them at the end of
+# every request) and checked before reuse when DB_CONN_HEALTH_CHECKS is set.
+# DB_POOL_ENABLED instead checks them out of a per-process psycopg2 pool of at most
+# DB_POOL_MAX_SIZE connections (DB_POOL_MIN_SIZE of them kept open while idle) and
+# returns them after every request, see app.libraries.pooled_postgresql. Compare
+# the modes with `python manage.py bench_db_connections`.
+
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'False') == 'True'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'app.libraries.pooled_postgresql' if DB_POOL_ENABLED else 'django.db.backends.postgresql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                'idle_timeout': int(os.getenv('DB_POOL_IDLE_TIMEOUT', 300)),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+            },
+        } if DB_POOL_ENABLED else {},
     }
 }
 
+# Read replicas
+# DB_REPLICAS adds one alias per comma separated "host[:port][/name]" ("replica_1",
+# ...) with the credentials of the primary. Reads of safe requests go to a replica,
+# writes, unsafe requests and transactions to the primary, see
+# app.libraries.db_router. A client that wrote reads from the primary for the next
+# REPLICA_PIN_SECONDS: browsers through the REPLICA_PIN_COOKIE cookie, API clients
+# through a per-user key in REPLICA_PIN_CACHE_ALIAS.
+
+for index, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1):
+    location, _, name = replica.strip().partition('/')
+    host, _, port = location.partition(':')
+    DATABASES['replica_%d' % index] = dict(DATABASES['default'], HOST=host, PORT=port or DATABASES['default']['PORT'],
+                                           NAME=name or DATABASES['default']['NAME'], TEST={'MIRROR': 'default'})
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica_')]
+DATABASE_ROUTERS = ['app.libraries.db_router.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+REPLICA_PIN_COOKIE = os.getenv('REPLICA_PIN_COOKIE', 'db_primary')
+REPLICA_PIN_CACHE_ALIAS = os.getenv('REPLICA_PIN_CACHE_ALIAS', 'default')
+
+
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+#
+# local: per-process LRU bounded by the pickled size of its values.
+# shared (and default): shared by every process, CACHE_SHARED_BACKEND picks "redis"
+#   (CACHE_REDIS_URL), "file" (CACHE_FILE_PATH) or "locmem", a per-process stand-in
+#   for development and tests. Several caches below default to "default": with
+#   "locmem" the replica pins and the throttles are only seen by the process that
+#   wrote them, so set "redis" when running more than one process. JWT revocations
+#   and the refresh token blacklist then fall back to reading the database.
+# two_level: reads through local, then shared. Values may be CACHE_LOCAL_TIMEOUT
+#   seconds stale in other processes, so only use it for data that tolerates it.
+
+CACHE_SHARED_BACKEND = os.getenv('CACHE_SHARED_BACKEND', 'locmem')
+CACHE_SHARED_BACKENDS = {
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_REDIS_URL', 'redis://127.0.0.1:6379/0'),
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_FILE_PATH', str(BASE_DIR / 'cache')),
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+    },
+}
+CACHE_SHARED = dict(CACHE_SHARED_BACKENDS[CACHE_SHARED_BACKEND], KEY_PREFIX=os.getenv('CACHE_KEY_PREFIX', ''),
+                    TIMEOUT=int(os.getenv('CACHE_TIMEOUT', 300)))
+
+CACHES = {
+    'default': CACHE_SHARED,
+    'shared': CACHE_SHARED,
+    'local': {
+        'BACKEND': 'app.libraries.cache_backends.LocalLRUCache',
+        'LOCATION': 'local',
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_BYTES': int(os.getenv('CACHE_LOCAL_MAX_BYTES', 32 * 1024 * 1024)),
+            'MAX_ENTRIES': int(os.getenv('CACHE_LOCAL_MAX_ENTRIES', 10000)),
+        },
+    },
+    'two_level': {
+        'BACKEND': 'app.libraries.cache_backends.TwoLevelCache',
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'LOCAL': 'local',
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': int(os.getenv('CACHE_LOCAL_TIMEOUT', 5)),
+        },
+    },
+}
+
+# Cached pagination counts (count_strategy=cached) are read through `stampede.fetch`.
+PAGINATION_COUNT_CACHE_ALIAS = os.getenv('PAGINATION_COUNT_CACHE_ALIAS', 'two_level')
+
+
+# Email outbox
+# Emails are queued in app_email_outbox and delivered by `manage.py send_queued_emails`.
+
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 100))
+EMAIL_OUTBOX_LEASE = int(os.getenv('EMAIL_OUTBOX_LEASE', 300))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', 60))
+EMAIL_OUTBOX_MAX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_MAX_RETRY_DELAY', 3600))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+#
+# PASSWORD_HASHER_POLICY picks the hasher new passwords are stored with. The other
+# hashers stay enabled so existing hashes still verify, and `check_password` upgrades
+# them to the policy (and to changed cost parameters) on the next successful login.
+# Tune the costs with `python manage.py bench_password_hashing` so a hash takes about
+# PASSWORD_HASHER_TARGET_MS on the production hardware.
+
+PASSWORD_HASHER_POLICIES = {
+    'pbkdf2': 'app.libraries.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'app.libraries.hashers.TunedScryptPasswordHasher',
+    'argon2': 'app.libraries.hashers.TunedArgon2PasswordHasher',
+}
+PASSWORD_HASHER_POLICY = os.getenv('PASSWORD_HASHER_POLICY', 'pbkdf2')
+PASSWORD_HASHER_TARGET_MS = float(os.getenv('PASSWORD_HASHER_TARGET_MS', 250))
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 600000))
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv('PASSWORD_SCRYPT_BLOCK_SIZE', 8))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv('PASSWORD_SCRYPT_PARALLELISM', 1))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', 102400))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv('PASSWORD_ARGON2_PARALLELISM', 8))
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_POLICIES[PASSWORD_HASHER_POLICY]] + [
+    hasher for policy, hasher in PASSWORD_HASHER_POLICIES.items() if policy != PASSWORD_HASHER_POLICY
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+
+# Password checks and hashes run on a bounded pool (app.libraries.hashing_pool), callers
+# get a 503 with Retry-After once the workers and the queue are full.
+PASSWORD_HASHING_POOL = os.getenv('PASSWORD_HASHING_POOL', 'thread')
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', 0)) or os.cpu_count()
+PASSWORD_HASHING_QUEUE_SIZE = int(os.getenv('PASSWORD_HASHING_QUEUE_SIZE', 16))
+PASSWORD_HASHING_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASHING_QUEUE_TIMEOUT', 0.5))
+PASSWORD_HASHING_RETRY_AFTER = int(os.getenv('PASSWORD_HASHING_RETRY_AFTER', 1))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -112,6 +263,15 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+AUTHENTICATION_BACKENDS = [
+    'app.libraries.permission_cache.CachedModelBackend',
+]
+
+# Cache used for each user's resolved permissions, invalidated by signals on change.
+PERMISSION_CACHE_ALIAS = os.getenv('PERMISSION_CACHE_ALIAS', 'default')
+PERMISSION_CACHE_TTL = int(os.getenv('PERMISSION_CACHE_TTL', 300))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -134,13 +294,76 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# JSON is rendered and parsed with orjson when it is installed, falling back to
+# DRF's standard library renderer and parser otherwise.
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'app.libraries.authentication.StatelessJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'app.libraries.fast_json.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'app.libraries.fast_json.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
+    # login_email counts the attempts on one email from one client IP, so failures
+    # from other clients never lock the owner of the address out.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('THROTTLE_LOGIN_IP_RATE', '30/min'),
+        'login_email': os.getenv('THROTTLE_LOGIN_EMAIL_RATE', '10/min'),
+        'password_reset_ip': os.getenv('THROTTLE_PASSWORD_RESET_IP_RATE', '10/hour'),
+        'password_reset_email': os.getenv('THROTTLE_PASSWORD_RESET_EMAIL_RATE', '3/hour'),
+    },
+    # Number of trusted proxies in front of the app. The per-IP throttles key on the
+    # address the last of them saw in X-Forwarded-For, with 0 (the default) on
+    # REMOTE_ADDR alone, so clients can not pick their bucket through the header.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
+# Sliding window counters of the login and password reset throttles: "cache" shares
+# them between processes through THROTTLE_CACHE_ALIAS, "local" keeps them per process.
+THROTTLE_STORAGE = os.getenv('THROTTLE_STORAGE', 'cache')
+THROTTLE_CACHE_ALIAS = os.getenv('THROTTLE_CACHE_ALIAS', 'default')
+
+# Response cache of the group and permission catalogs: RESPONSE_CACHE_MAX_ENTRIES
+# responses per process, plus the RESPONSE_CACHE_ALIAS cache shared by every process
+# when it is set. Entries are keyed by table generation, so they are never stale.
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512))
+RESPONSE_CACHE_ALIAS = os.getenv('RESPONSE_CACHE_ALIAS', '')
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 3600))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
+
+# Embed a compact digest of the user's permissions in access tokens so permission
+# checks under StatelessJWTAuthentication need neither the database nor the cache.
+JWT_PERMISSION_DIGEST = os.getenv('JWT_PERMISSION_DIGEST', 'False') == 'True'
+
+# Disabled users are revoked in this cache, each process re-checks a user at most
+# every JWT_REVOCATION_CHECK_INTERVAL seconds. A process-local cache (locmem) can not
+# tell the other processes, so authentication then reads is_active from the primary
+# on every request instead.
+JWT_REVOCATION_CACHE_ALIAS = os.getenv('JWT_REVOCATION_CACHE_ALIAS', 'default')
+JWT_REVOCATION_CHECK_INTERVAL = int(os.getenv('JWT_REVOCATION_CHECK_INTERVAL', 5))
+
+# Refresh token blacklist lookups: shared cache per JTI, then a bloom filter that
+# `manage.py rebuild_token_blacklist` publishes in that cache (schedule it every
+# TOKEN_BLACKLIST_BLOOM_REFRESH seconds), then the database. Without a published
+# filter, or with a process-local cache, every lookup reads the database.
+TOKEN_BLACKLIST_CACHE_ALIAS = os.getenv('TOKEN_BLACKLIST_CACHE_ALIAS', 'default')
+TOKEN_BLACKLIST_BLOOM_REFRESH = int(os.getenv('TOKEN_BLACKLIST_BLOOM_REFRESH', 60))
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = float(os.getenv('TOKEN_BLACKLIST_BLOOM_ERROR_RATE', 0.001))
+
+# "immediate" inserts the OutstandingToken row of every issued refresh token during
+# login, "deferred" buffers the rows per process and inserts them in batches. The
+# batch size and flush interval are checked on each login, so an idle process keeps
+# its last rows buffered until the next login or until it exits.
+JWT_OUTSTANDING_TOKEN_MODE = os.getenv('JWT_OUTSTANDING_TOKEN_MODE', 'immediate')
+JWT_OUTSTANDING_TOKEN_BATCH_SIZE = int(os.getenv('JWT_OUTSTANDING_TOKEN_BATCH_SIZE', 100))
+JWT_OUTSTANDING_TOKEN_FLUSH_INTERVAL = int(os.getenv('JWT_OUTSTANDING_TOKEN_FLUSH_INTERVAL', 5))
@@ -17,20 +17,22 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt import views as jwt_views
-from app.views.system.auth_view import LoginView, RegisterUserView
-from app.views.system.user_view import UserPagination, UserList, UserDetail,UserCreate, UserUpdate, UserEnabled, UserDisabled
-from app.views.system.groups_view import GroupPagination, GroupList, GroupCreate, GroupDetail
+from app.views.system.auth_view import LoginView, LogoutView, RegisterUserView, RefreshTokenView, ForgotPasswordView, ResetPasswordView
+from app.views.system.user_view import UserPagination, UserList, UserDetail,UserCreate, UserUpdate, UserEnabled, UserDisabled, UserBulkCreate, UserBulkEnabled, UserBulkDisabled, UserBulkGroups
+from app.views.system.groups_view import GroupPagination, GroupList, GroupCreate, GroupDetail, GroupPermissionsView
 from app.views.system.permissions_view import PermissionPagination, PermissionList, PermissionDetail
+from app.views.system.cache_view import ResponseCacheMetricsView
+from app.views.system.database_view import DatabasePoolMetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
 
     path('api/v1/auth/login/', LoginView.as_view(), name='login_token'),
-    path('api/v1/auth/refresh-token/', jwt_views.TokenRefreshView.as_view(), name='refresh_token'),
+    path('api/v1/auth/refresh-token/', RefreshTokenView.as_view(), name='refresh_token'),
+    path('api/v1/auth/logout/', LogoutView.as_view(), name='logout'),
     path('api/v1/auth/register/', RegisterUserView.as_view(), name='register_user'),
-    path('api/v1/auth/forgot-password/', RegisterUserView.as_view(), name='forgot_password'),
-    path('api/v1/auth/reset-password/', RegisterUserView.as_view(), name='reset_password'),
+    path('api/v1/auth/forgot-password/', ForgotPasswordView.as_view(), name='forgot_password'),
+    path('api/v1/auth/reset-password/', ResetPasswordView.as_view(), name='reset_password'),
     path('api/v1/auth/verify-email/', RegisterUserView.as_view(), name='verify_email'),
 
     path('api/v1/users/', UserList.as_view(), name='user-list'),
@@ -40,6 +42,10 @@ urlpatterns = [
     path('api/v1/users/<int:pk>/update/', UserPagination.as_view(), name='user-update'),
     path('api/v1/users/<int:pk>/enabled/', UserEnabled.as_view(), name='user-enabled'),
     path('api/v1/users/<int:pk>/disabled/', UserDisabled.as_view(), name='user-disabled'),
+    path('api/v1/users/bulk/create/', UserBulkCreate.as_view(), name='user-bulk-create'),
+    path('api/v1/users/bulk/enabled/', UserBulkEnabled.as_view(), name='user-bulk-enabled'),
+    path('api/v1/users/bulk/disabled/', UserBulkDisabled.as_view(), name='user-bulk-disabled'),
+    path('api/v1/users/bulk/groups/', UserBulkGroups.as_view(), name='user-bulk-groups'),
 
     path('api/v1/groups/pagination/', GroupPagination.as_view(), name='group-pagination'),
     path('api/v1/groups/', GroupList.as_view(), name='group-list'),
@@ -47,8 +53,12 @@ urlpatterns = [
     path('api/v1/groups/create', GroupCreate.as_view(), name='group-create'),
     path('api/v1/groups/<int:pk>/update/', GroupDetail.as_view(), name='group-update'),
     path('api/v1/groups/<int:pk>/delete/', GroupDetail.as_view(), name='group-delete'),
+    path('api/v1/groups/<int:group_id>/permissions/', GroupPermissionsView.as_view(), name='group-permissions'),
 
-    path('api/v1/permissions/', PermissionList.as_view(), name='group-list'),
-    path('api/v1/permissions/pagination/', PermissionPagination.as_view(), name='group-pagination'),
-    path('api/v1/permissions/<int:pk>/', PermissionDetail.as_view(), name='group-detail'),
+    path('api/v1/permissions/', PermissionList.as_view(), name='permission-list'),
+    path('api/v1/permissions/pagination/', PermissionPagination.as_view(), name='permission-pagination'),
+    path('api/v1/permissions/<int:pk>/', PermissionDetail.as_view(), name='permission-detail'),
+
+    path('api/v1/system/cache/metrics/', ResponseCacheMetricsView.as_view(), name='response-cache-metrics'),
+    path('api/v1/system/database/metrics/', DatabasePoolMetricsView.as_view(), name='database-pool-metrics'),
 ]